@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Record scraper HTTP traffic once, then benchmark the scrapers offline.
+
+`record` runs each scraper against the live sites with its caches disabled
+and writes every request/response to <archive-dir>/<source>.json.gz together
+with the arguments used. `run` replays those archives through
+http_archive (no network, request pacing off) and times each scraper's full
+run, which is then its parse and transform work plus output writing. Any
+request missing from the archive is reported, so a clean run is
+deterministic.
+
+  python benchmark_scrapers.py record --date 2026-03-14 --days 7
+  python benchmark_scrapers.py run --repeat 5 --profile 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import cProfile
+import datetime as dt
+import importlib
+import io
+import os
+import pstats
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from http_archive import HttpArchive, new_meta, use_archive
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ARCHIVE_DIR = os.path.join(SCRIPT_DIR, ".scrape_cache", "http_archive")
+DEFAULT_REPEAT = 3
+
+
+def _livesporttv_args(start: dt.date, days: int) -> List[str]:
+    return ["--date", start.isoformat(), "--days", str(days), "--no-match-cache"]
+
+
+def _fanzo_args(start: dt.date, days: int) -> List[str]:
+    return ["--date", start.isoformat(), "--days", str(days), "--include-soccer"]
+
+
+def _witm_args(start: dt.date, days: int) -> List[str]:
+    return ["--date", start.isoformat(), "--days", str(days), "--no-cache"]
+
+
+def _flashscore_args(start: dt.date, days: int) -> List[str]:
+    # Flashscore addresses days relative to today; the offset is frozen at record time.
+    day_start = (start - dt.datetime.now(dt.timezone.utc).date()).days
+    return ["--day-start", str(day_start), "--days", str(days), "--no-config-cache"]
+
+
+def _huhsports_args(start: dt.date, days: int) -> List[str]:
+    return ["--start-date", start.isoformat(), "--days", str(days)]
+
+
+# source -> (module, recorded args, output args for a directory, replay-only args)
+SOURCES: Dict[str, Tuple[str, Callable[[dt.date, int], List[str]], Callable[[str], List[str]], List[str]]] = {
+    "livesporttv": (
+        "scrape_schedule_livesporttv",
+        _livesporttv_args,
+        lambda out: ["--output", os.path.join(out, "livesporttv.json")],
+        ["--min-request-interval", "0"],
+    ),
+    "fanzo": (
+        "scrape_schedule_fanzo",
+        _fanzo_args,
+        lambda out: ["--output", os.path.join(out, "fanzo.json")],
+        [],
+    ),
+    "witm": (
+        "scrape_schedule_witm",
+        _witm_args,
+        lambda out: ["--output", os.path.join(out, "witm.json")],
+        [],
+    ),
+    "flashscore": (
+        "scrape_schedule_flashscore",
+        _flashscore_args,
+        lambda out: [
+            "--output-json",
+            os.path.join(out, "flashscore.json"),
+            "--output-csv",
+            os.path.join(out, "flashscore.csv"),
+        ],
+        [],
+    ),
+    "huhsports": (
+        "scrape_schedule_huhsports",
+        _huhsports_args,
+        lambda out: ["--output", os.path.join(out, "huhsports.json")],
+        ["--min-request-interval-seconds", "0"],
+    ),
+}
+
+
+def archive_path(archive_dir: str, source: str) -> str:
+    return os.path.join(archive_dir, f"{source}.json.gz")
+
+
+def run_scraper(module_name: str, argv: List[str], quiet: bool = True) -> int:
+    """Run a scraper's main() in-process with `argv`; its log output is discarded when quiet."""
+    module = importlib.import_module(module_name)
+    saved_argv = sys.argv
+    sys.argv = [f"{module_name}.py", *argv]
+    sink = io.StringIO()
+    try:
+        with contextlib.ExitStack() as stack:
+            if quiet:
+                stack.enter_context(contextlib.redirect_stdout(sink))
+                stack.enter_context(contextlib.redirect_stderr(sink))
+            try:
+                return int(module.main() or 0)
+            except SystemExit as exc:
+                return exc.code if isinstance(exc.code, int) else 1
+    finally:
+        sys.argv = saved_argv
+
+
+def record(archive_dir: str, sources: List[str], start: dt.date, days: int, quiet: bool = False) -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix="scraper_record_") as out_dir:
+        for source in sources:
+            module_name, build_args, output_args, _ = SOURCES[source]
+            args = build_args(start, days)
+            archive = HttpArchive(meta=new_meta(source, args))
+            started = time.perf_counter()
+            with use_archive(archive, "record"):
+                code = run_scraper(module_name, args + output_args(out_dir), quiet=quiet)
+            path = archive_path(archive_dir, source)
+            archive.save(path)
+            failures += int(code != 0)
+            print(
+                f"[RECORD] {source}: exit={code} requests={len(archive.entries)} "
+                f"elapsed={time.perf_counter() - started:.2f}s -> {path}",
+                flush=True,
+            )
+    return 1 if failures else 0
+
+
+def benchmark(
+    archive_dir: str,
+    sources: List[str],
+    repeat: int,
+    profile_top: int = 0,
+    quiet: bool = True,
+) -> Dict[str, Dict[str, object]]:
+    results: Dict[str, Dict[str, object]] = {}
+    with tempfile.TemporaryDirectory(prefix="scraper_bench_") as out_dir:
+        for source in sources:
+            path = archive_path(archive_dir, source)
+            if not os.path.exists(path):
+                print(f"[BENCH] {source}: no archive at {path}, skipped.", flush=True)
+                continue
+            module_name, _, output_args, replay_args = SOURCES[source]
+            archive = HttpArchive.load(path)
+            argv = list(archive.meta.get("args") or []) + output_args(out_dir) + replay_args
+            timings: List[float] = []
+            profiler: Optional[cProfile.Profile] = cProfile.Profile() if profile_top else None
+            code = 0
+            for _ in range(max(1, repeat)):
+                archive.rewind()
+                with use_archive(archive, "replay"):
+                    if profiler is not None:
+                        profiler.enable()
+                    started = time.perf_counter()
+                    code = run_scraper(module_name, argv, quiet=quiet)
+                    timings.append(time.perf_counter() - started)
+                    if profiler is not None:
+                        profiler.disable()
+            results[source] = {
+                "exit": code,
+                "requests": len(archive.entries),
+                "misses": len(archive.misses),
+                "min_s": min(timings),
+                "median_s": statistics.median(timings),
+                "runs": len(timings),
+            }
+            print(
+                f"[BENCH] {source}: exit={code} requests={len(archive.entries)} misses={len(archive.misses)} "
+                f"min={min(timings):.3f}s median={statistics.median(timings):.3f}s runs={len(timings)} "
+                f"(recorded {archive.meta.get('recorded_at', '?')})",
+                flush=True,
+            )
+            for key in sorted(set(archive.misses))[:5]:
+                print(f"[BENCH]   not in archive: {key}", flush=True)
+            if profiler is not None:
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(profile_top)
+                print(stream.getvalue(), flush=True)
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Record scraper HTTP archives and benchmark scrapers offline.")
+    parser.add_argument("mode", choices=["record", "run"], help="record live traffic, or run the offline benchmark.")
+    parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR, help="Directory holding <source>.json.gz archives.")
+    parser.add_argument(
+        "--sources",
+        default=",".join(SOURCES),
+        help=f"Comma-separated scrapers (default: {','.join(SOURCES)}).",
+    )
+    parser.add_argument("--date", default=None, help="record: start date (YYYY-MM-DD). Default: today UTC.")
+    parser.add_argument("--days", type=int, default=7, help="record: number of days (default: 7).")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"run: timed runs per scraper (default: {DEFAULT_REPEAT}).")
+    parser.add_argument("--profile", type=int, default=0, help="run: print the top N cProfile entries per scraper.")
+    parser.add_argument("--verbose", action="store_true", help="Show scraper log output.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    sources = [source.strip().lower() for source in args.sources.split(",") if source.strip()]
+    unknown = [source for source in sources if source not in SOURCES]
+    if unknown:
+        print(f"Unknown source(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    if args.mode == "record":
+        try:
+            start = dt.datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else dt.datetime.now(dt.timezone.utc).date()
+        except ValueError:
+            print(f"Invalid --date '{args.date}'. Expected YYYY-MM-DD.", file=sys.stderr)
+            return 2
+        return record(args.archive_dir, sources, start, max(1, args.days), quiet=not args.verbose)
+
+    results = benchmark(args.archive_dir, sources, args.repeat, profile_top=max(0, args.profile), quiet=not args.verbose)
+    return 1 if any(result["misses"] or result["exit"] for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
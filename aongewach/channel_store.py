@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed channel DB with a channels.json exporter.
+
+Tools read and update only the rows they touch (a channel header, its
+quality URLs, its primary/backups/reserve/candidates selections or a
+metadata key) inside one transaction, then export the published
+channels.json in the exact shape and formatting they used to write
+themselves (indent=2, ensure_ascii=False).
+
+The store remembers the sha256 of the JSON it last imported or exported;
+when channels.json changed behind its back (git pull, a tool that still
+writes JSON directly) it is re-imported on open.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from publish_artifacts import publish_json, republish_shards
+
+SCHEMA_VERSION = 1
+SELECTION_ROLES = ("primary", "backups", "reserve", "candidates")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS store_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    id INTEGER,
+    logo TEXT,
+    fields TEXT NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS channels_position ON channels(position);
+CREATE TABLE IF NOT EXISTS qualities (
+    channel TEXT NOT NULL,
+    quality TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (channel, quality)
+);
+CREATE TABLE IF NOT EXISTS quality_urls (
+    channel TEXT NOT NULL,
+    quality TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (channel, quality, position)
+);
+CREATE INDEX IF NOT EXISTS quality_urls_url ON quality_urls(url);
+CREATE TABLE IF NOT EXISTS selections (
+    channel TEXT NOT NULL,
+    role TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (channel, role, position)
+);
+"""
+
+
+def default_store_path(json_path: str) -> str:
+    """channels.json -> channels.sqlite next to it."""
+    root, _ = os.path.splitext(json_path)
+    return root + ".sqlite"
+
+
+def render_json(payload) -> str:
+    return json.dumps(payload, indent=2, ensure_ascii=False)
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as handle:
+            return hashlib.sha256(handle.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _is_quality_map(value) -> bool:
+    return isinstance(value, dict) and all(
+        isinstance(urls, list) and all(isinstance(url, str) for url in urls) for urls in value.values()
+    )
+
+
+def _is_tabular(key: str, value) -> bool:
+    if key == "id":
+        return value is None or (isinstance(value, int) and not isinstance(value, bool))
+    if key == "logo":
+        return value is None or isinstance(value, str)
+    if key == "qualities":
+        return _is_quality_map(value)
+    if key == "primary":
+        return value is None or isinstance(value, dict)
+    if key in SELECTION_ROLES:
+        return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+    return False
+
+
+class ChannelStore:
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode; transaction() issues BEGIN IMMEDIATE/COMMIT itself.
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._depth = 0
+        if self._state("schema_version") is None:
+            self._set_state("schema_version", SCHEMA_VERSION)
+
+    @classmethod
+    def open_synced(cls, json_path: str, store_path: Optional[str] = None) -> "ChannelStore":
+        """Open the store for `json_path`, importing the JSON if it changed since the last import/export."""
+        store = cls(store_path or default_store_path(json_path))
+        digest = _file_digest(json_path)
+        if digest is not None and digest != store._state("json_digest"):
+            try:
+                with open(json_path, "r", encoding="utf-8") as handle:
+                    payload = json.load(handle)
+            except ValueError:
+                payload = {}
+            store.import_payload(payload if isinstance(payload, dict) else {})
+            store._set_state("json_digest", digest)
+        return store
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ChannelStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Nestable; only the outermost block commits (or rolls back on error)."""
+        if self._depth == 0:
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._depth += 1
+        try:
+            yield self.conn
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self.conn.execute("ROLLBACK")
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self.conn.execute("COMMIT")
+
+    # -- internal state ------------------------------------------------------
+
+    def _state(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM store_state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_state(self, key: str, value) -> None:
+        self.conn.execute(
+            "INSERT INTO store_state(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, _dumps(value)),
+        )
+
+    # -- channels ------------------------------------------------------------
+
+    def channel_names(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT name FROM channels ORDER BY position")]
+
+    def channel_ids(self) -> Dict[str, Optional[int]]:
+        """Name -> id for every channel (None when the channel has no integer id)."""
+        return {name: cid for name, cid in self.conn.execute("SELECT name, id FROM channels ORDER BY position")}
+
+    def channel_fields(self) -> Dict[str, List[str]]:
+        """Name -> top-level keys present in the channel entry (None for non-dict entries)."""
+        return {
+            name: json.loads(fields)
+            for name, fields in self.conn.execute("SELECT name, fields FROM channels ORDER BY position")
+        }
+
+    def has_channel(self, name: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM channels WHERE name = ?", (name,)).fetchone() is not None
+
+    def get_channel(self, name: str):
+        return self.get_channels([name]).get(name)
+
+    def get_channels(self, names: Optional[Iterable[str]] = None) -> Dict[str, object]:
+        """Rebuild full channel entries (all channels when `names` is None), in store order."""
+        wanted = None if names is None else list(dict.fromkeys(names))
+        headers = sorted(
+            self._scoped(
+                "SELECT name, id, logo, fields, extra, position FROM channels {scope}", wanted, column="name"
+            ),
+            key=lambda row: row[5],
+        )
+        qualities = self._load_qualities(wanted)
+        selections = self._load_selections(wanted)
+
+        out: Dict[str, object] = {}
+        for name, cid, logo, fields_text, extra_text, _ in headers:
+            fields = json.loads(fields_text)
+            extra = json.loads(extra_text)
+            if fields is None:
+                out[name] = extra.get("")
+                continue
+            entry = {}
+            for key in fields:
+                if key in extra:
+                    entry[key] = extra[key]
+                elif key == "id":
+                    entry[key] = cid
+                elif key == "logo":
+                    entry[key] = logo
+                elif key == "qualities":
+                    entry[key] = qualities.get(name, {})
+                elif key == "primary":
+                    items = selections.get(name, {}).get("primary") or []
+                    entry[key] = items[0] if items else None
+                else:
+                    entry[key] = selections.get(name, {}).get(key, [])
+            out[name] = entry
+        return out
+
+    def _scoped(self, sql: str, names: Optional[List[str]], column: str = "channel") -> Iterator[Tuple]:
+        """Run `sql` ({scope} placeholder) for all rows, or chunked over `names`."""
+        if names is None:
+            yield from self.conn.execute(sql.replace("{scope}", ""))
+            return
+        for chunk_start in range(0, len(names), 500):
+            chunk = names[chunk_start:chunk_start + 500]
+            marks = ",".join("?" * len(chunk))
+            yield from self.conn.execute(sql.replace("{scope}", f"WHERE {column} IN ({marks})"), chunk)
+
+    def _load_qualities(self, names: Optional[List[str]]) -> Dict[str, Dict[str, List[str]]]:
+        out: Dict[str, Dict[str, List[str]]] = {}
+        for channel, quality in self._scoped(
+            "SELECT channel, quality FROM qualities {scope} ORDER BY channel, position", names
+        ):
+            out.setdefault(channel, {})[quality] = []
+        for channel, quality, url in self._scoped(
+            "SELECT channel, quality, url FROM quality_urls {scope} ORDER BY channel, quality, position", names
+        ):
+            out.setdefault(channel, {}).setdefault(quality, []).append(url)
+        return out
+
+    def _load_selections(self, names: Optional[List[str]]) -> Dict[str, Dict[str, List[Dict]]]:
+        out: Dict[str, Dict[str, List[Dict]]] = {}
+        for channel, role, payload in self._scoped(
+            "SELECT channel, role, payload FROM selections {scope} ORDER BY channel, role, position", names
+        ):
+            out.setdefault(channel, {}).setdefault(role, []).append(json.loads(payload))
+        return out
+
+    def get_qualities(self, names: Optional[Iterable[str]] = None) -> Dict[str, object]:
+        """Name -> qualities value for channels that have one, reading only headers and quality rows."""
+        wanted = None if names is None else list(dict.fromkeys(names))
+        tabulated = self._load_qualities(wanted)
+        out: Dict[str, object] = {}
+        for name, fields_text, extra_text in self._scoped(
+            "SELECT name, fields, extra FROM channels {scope} ORDER BY position", wanted, column="name"
+        ):
+            fields = json.loads(fields_text)
+            if not fields or "qualities" not in fields:
+                continue
+            extra = json.loads(extra_text)
+            out[name] = extra["qualities"] if "qualities" in extra else tabulated.get(name, {})
+        return out
+
+    def iter_quality_urls(self) -> Iterator[Tuple[str, str, str]]:
+        """(channel, quality, url) rows in store order."""
+        yield from self.conn.execute(
+            "SELECT q.channel, q.quality, q.url FROM quality_urls q "
+            "JOIN channels c ON c.name = q.channel "
+            "JOIN qualities k ON k.channel = q.channel AND k.quality = q.quality "
+            "ORDER BY c.position, k.position, q.position"
+        )
+
+    def put_channel(self, name: str, entry) -> None:
+        """Insert or fully replace one channel, keeping its position when it already exists."""
+        with self.transaction():
+            row = self.conn.execute("SELECT position FROM channels WHERE name = ?", (name,)).fetchone()
+            position = row[0] if row else self._next_position("channels")
+            self._delete_rows(name)
+            self.conn.execute("DELETE FROM channels WHERE name = ?", (name,))
+            if not isinstance(entry, dict):
+                self.conn.execute(
+                    "INSERT INTO channels(name, position, id, logo, fields, extra) VALUES (?, ?, NULL, NULL, 'null', ?)",
+                    (name, position, _dumps({"": entry})),
+                )
+                return
+            self.conn.execute(
+                "INSERT INTO channels(name, position, id, logo, fields, extra) VALUES (?, ?, NULL, NULL, ?, '{}')",
+                (name, position, _dumps(list(entry.keys()))),
+            )
+            self._write_fields(name, entry, list(entry.keys()), {})
+
+    def update_channel(self, name: str, **fields) -> None:
+        """Set only the given top-level fields of an existing dict channel (others are untouched)."""
+        if not fields:
+            return
+        with self.transaction():
+            row = self.conn.execute("SELECT fields, extra FROM channels WHERE name = ?", (name,)).fetchone()
+            if row is None or json.loads(row[0]) is None:
+                current = self.get_channel(name) if row else None
+                entry = dict(current) if isinstance(current, dict) else {}
+                entry.update(fields)
+                self.put_channel(name, entry)
+                return
+            order = json.loads(row[0])
+            extra = json.loads(row[1])
+            for key in fields:
+                if key not in order:
+                    order.append(key)
+            self._write_fields(name, fields, order, extra)
+
+    def delete_channel(self, name: str) -> None:
+        with self.transaction():
+            self._delete_rows(name)
+            self.conn.execute("DELETE FROM channels WHERE name = ?", (name,))
+
+    def _next_position(self, table: str) -> int:
+        row = self.conn.execute(f"SELECT COALESCE(MAX(position), -1) + 1 FROM {table}").fetchone()
+        return int(row[0])
+
+    def _delete_rows(self, name: str, keys: Optional[Iterable[str]] = None) -> None:
+        keys = set(keys) if keys is not None else {"qualities", *SELECTION_ROLES}
+        if "qualities" in keys:
+            self.conn.execute("DELETE FROM qualities WHERE channel = ?", (name,))
+            self.conn.execute("DELETE FROM quality_urls WHERE channel = ?", (name,))
+        roles = [role for role in SELECTION_ROLES if role in keys]
+        if roles:
+            marks = ",".join("?" * len(roles))
+            self.conn.execute(f"DELETE FROM selections WHERE channel = ? AND role IN ({marks})", (name, *roles))
+
+    def _write_fields(self, name: str, values: Dict, order: List[str], extra: Dict) -> None:
+        self._delete_rows(name, values.keys())
+        columns: Dict[str, object] = {}
+        for key, value in values.items():
+            if not _is_tabular(key, value):
+                extra[key] = value
+                continue
+            extra.pop(key, None)
+            if key in ("id", "logo"):
+                columns[key] = value
+            elif key == "qualities":
+                self.conn.executemany(
+                    "INSERT INTO qualities(channel, quality, position) VALUES (?, ?, ?)",
+                    [(name, quality, index) for index, quality in enumerate(value)],
+                )
+                self.conn.executemany(
+                    "INSERT INTO quality_urls(channel, quality, position, url) VALUES (?, ?, ?, ?)",
+                    [
+                        (name, quality, index, url)
+                        for quality, urls in value.items()
+                        for index, url in enumerate(urls)
+                    ],
+                )
+            else:
+                items = [value] if key == "primary" and value is not None else ([] if value is None else value)
+                self.conn.executemany(
+                    "INSERT INTO selections(channel, role, position, url, payload) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (name, key, index, item.get("url") if isinstance(item.get("url"), str) else None, _dumps(item))
+                        for index, item in enumerate(items)
+                    ],
+                )
+        assignments = ["fields = ?", "extra = ?"]
+        params: List[object] = [_dumps(order), _dumps(extra)]
+        for column, value in columns.items():
+            assignments.append(f"{column} = ?")
+            params.append(value)
+        params.append(name)
+        self.conn.execute(f"UPDATE channels SET {', '.join(assignments)} WHERE name = ?", params)
+
+    # -- metadata ------------------------------------------------------------
+
+    def get_metadata(self) -> Dict:
+        return {key: json.loads(value) for key, value in self.conn.execute("SELECT key, value FROM metadata ORDER BY position")}
+
+    def set_metadata(self, updates: Dict, replace: bool = False) -> None:
+        """Upsert metadata keys (new keys go last); `replace=True` drops every other key first."""
+        with self.transaction():
+            if replace:
+                self.conn.execute("DELETE FROM metadata")
+            for key, value in updates.items():
+                row = self.conn.execute("SELECT position FROM metadata WHERE key = ?", (key,)).fetchone()
+                position = row[0] if row else self._next_position("metadata")
+                self.conn.execute(
+                    "INSERT INTO metadata(key, position, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (key, position, _dumps(value)),
+                )
+            self._set_state("has_metadata", True)
+
+    # -- import / export -----------------------------------------------------
+
+    def import_payload(self, payload: Dict) -> None:
+        """Replace the whole store with a channels.json payload."""
+        with self.transaction():
+            for table in ("metadata", "channels", "qualities", "quality_urls", "selections"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self._set_state("top_level", {key: None for key in payload})
+            self._set_state("top_level_extra", {k: v for k, v in payload.items() if k not in ("metadata", "channels")})
+            metadata = payload.get("metadata")
+            self._set_state("metadata_raw", None if isinstance(metadata, dict) else metadata)
+            self._set_state("has_metadata", "metadata" in payload)
+            if isinstance(metadata, dict):
+                self.set_metadata(metadata)
+            channels = payload.get("channels")
+            self._set_state("channels_raw", None if isinstance(channels, dict) else channels)
+            if isinstance(channels, dict):
+                for name, entry in channels.items():
+                    self.put_channel(name, entry)
+
+    def export_payload(self) -> Dict:
+        top_level = list(self._state("top_level", {}) or {})
+        for key in ("metadata", "channels"):
+            if key not in top_level and (key == "channels" or self._state("has_metadata")):
+                top_level.append(key)
+        extra = self._state("top_level_extra", {}) or {}
+        payload: Dict = {}
+        for key in top_level:
+            if key == "metadata":
+                raw = self._state("metadata_raw")
+                payload[key] = raw if raw is not None else self.get_metadata()
+            elif key == "channels":
+                raw = self._state("channels_raw")
+                payload[key] = raw if raw is not None else self.get_channels()
+            elif key in extra:
+                payload[key] = extra[key]
+        return payload
+
+    def export_json(self, json_path: str, publish: bool = True) -> None:
+        """
+        Write channels.json atomically and remember its digest so the next open
+        skips re-import. With `publish`, also refresh the minified client
+        copies (publish_artifacts) and any sharded export built from them.
+        """
+        payload = self.export_payload()
+        text = render_json(payload)
+        directory = os.path.dirname(json_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = json_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_path, json_path)
+        with self.transaction():
+            self._set_state("json_digest", hashlib.sha256(text.encode("utf-8")).hexdigest())
+        if publish:
+            publish_json(json_path, payload)
+            republish_shards(json_path, payload)
@@ -21,6 +21,7 @@ import os
 import re
 import sys
 import unicodedata
+from collections import defaultdict
 from difflib import SequenceMatcher
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
@@ -65,6 +66,8 @@ TEAM_ABBREVIATION_MAP = {
     "utd": "united",
     "st": "saint",
 }
+# Kickoffs further apart than this get time_score 0 and can never be merged.
+MATCH_TIME_WINDOW_MINUTES = 60
 WITM_FOOTBALL_COMPETITION_LOGO_URL = "https://www.wheresthematch.com/images/sports/football.gif"
 DEFAULT_LIVESPORTTV_PATH = "weekly_schedule_livesporttv.json"
 DEFAULT_FLASHSCORE_SPORT_ASSETS_PATH = "flashscore_sport_assets.json"
@@ -769,22 +772,86 @@ def is_acceptable_match(features: Dict[str, float], fanzo_event: Dict) -> bool:
     return features["confidence"] >= 0.85 and features["time_score"] >= 0.82
 
 
+def kickoff_bucket(kickoff: dt.datetime) -> int:
+    return int(kickoff.timestamp() // (MATCH_TIME_WINDOW_MINUTES * 60))
+
+
+def team_blocking_keys(event: Dict) -> Set[str]:
+    """Team alias variants, their tokens and acronyms; the event name stands in for placeholder teams."""
+    variants = list(event.get("_home_team_aliases") or [canonical_team_name(event.get("home_team"))])
+    variants.extend(event.get("_away_team_aliases") or [canonical_team_name(event.get("away_team"))])
+    if not has_valid_teams(event):
+        variants.append(canonical_event_name(event.get("name")))
+
+    keys: Set[str] = set()
+    for variant in variants:
+        key = normalize_text(variant)
+        if not key:
+            continue
+        keys.add(key)
+        tokens = [token for token in tokenize_name(key) if len(token) >= 2]
+        keys.update(tokens)
+        if len(tokens) >= 2:
+            keys.add(acronym_from_tokens(tokens))
+    return keys
+
+
+def build_huh_match_index(day_date: str, huh_events: List[Dict]) -> Dict:
+    """Index a day's football secondary events by kickoff bucket and team blocking key."""
+    by_bucket: Dict[int, List[int]] = defaultdict(list)
+    by_key: Dict[str, List[int]] = defaultdict(list)
+    for index, candidate in enumerate(huh_events):
+        if event_date(day_date, candidate) != day_date:
+            continue
+        if not is_football_sport(candidate.get("sport")):
+            continue
+        kickoff = event_datetime_utc(day_date, candidate)
+        if kickoff is not None:
+            by_bucket[kickoff_bucket(kickoff)].append(index)
+        for key in team_blocking_keys(candidate):
+            by_key[key].append(index)
+    return {"day_date": day_date, "buckets": by_bucket, "keys": by_key}
+
+
+def huh_match_candidates(match_index: Dict, day_date: str, fanzo_event: Dict) -> List[int]:
+    """
+    Secondary events worth full feature scoring, in list order.
+
+    A match needs time_score >= 0.65 (kickoffs at most an hour apart), so the
+    neighbouring kickoff buckets hold every acceptable pair. Events sharing a
+    team key are scored too, whatever their kickoff: they can outscore the
+    in-window candidates, and then no match is accepted, as before.
+    """
+    kickoff = event_datetime_utc(day_date, fanzo_event)
+    if kickoff is None:
+        # time_score is 0 against every candidate, so nothing can be accepted.
+        return []
+    found: Set[int] = set()
+    bucket = kickoff_bucket(kickoff)
+    for neighbour in (bucket - 1, bucket, bucket + 1):
+        found.update(match_index["buckets"].get(neighbour, ()))
+    for key in team_blocking_keys(fanzo_event):
+        found.update(match_index["keys"].get(key, ()))
+    return sorted(found)
+
+
 def find_best_huh_match(
     day_date: str,
     fanzo_event: Dict,
     huh_events: List[Dict],
     used_indices: Set[int],
+    match_index: Optional[Dict] = None,
 ) -> Tuple[Optional[int], Optional[Dict[str, float]]]:
+    """`match_index` (build_huh_match_index over the same huh_events) can be reused across a day's calls."""
+    if match_index is None or match_index.get("day_date") != day_date:
+        match_index = build_huh_match_index(day_date, huh_events)
     best_index: Optional[int] = None
     best_features: Optional[Dict[str, float]] = None
 
-    for index, candidate in enumerate(huh_events):
+    for index in huh_match_candidates(match_index, day_date, fanzo_event):
         if index in used_indices:
             continue
-        if event_date(day_date, candidate) != day_date:
-            continue
-        if not is_football_sport(candidate.get("sport")):
-            continue
+        candidate = huh_events[index]
 
         features = event_match_features(day_date, fanzo_event, candidate)
         if best_features is None or features["confidence"] > best_features["confidence"]:
@@ -1529,6 +1596,7 @@ def compose_payload(
 
         used_secondary_indices: Set[int] = set()
         used_livesporttv_indices: Set[int] = set()
+        secondary_match_index = build_huh_match_index(date_iso, secondary_events)
         day_events: List[Dict] = []
 
         for fanzo_event in fanzo_events:
@@ -1543,6 +1611,7 @@ def compose_payload(
                 fanzo_event=fanzo_event,
                 huh_events=secondary_events,
                 used_indices=used_secondary_indices,
+                match_index=secondary_match_index,
             )
 
             if match_index is not None:
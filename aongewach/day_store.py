@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Per-day source payloads kept between scraper runs.
+
+Incremental scrapes reuse a stored day while it is younger than
+stale_after_seconds() for its distance from today, and only fetch the rest.
+Today and tomorrow are always fetched; days 2-3 are reused for 20h and later
+days for 47h, so with one run a day far days are refreshed every other run.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import datetime as dt
+import gzip
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DAY_STORE_DIR = os.path.join(SCRIPT_DIR, ".scrape_cache", "days")
+DAY_STORE_VERSION = 1
+
+# (max days ahead, seconds a stored day stays fresh); past days are always stale.
+STALE_AFTER_STEPS = (
+    (1, 0),
+    (3, 20 * 3600),
+)
+FAR_STALE_AFTER_SECONDS = 47 * 3600
+# Stored days this far before today are dropped on save.
+KEEP_PAST_DAYS = 1
+
+
+def stale_after_seconds(target_date: dt.date, today: dt.date) -> int:
+    days_ahead = (target_date - today).days
+    for max_days, seconds in STALE_AFTER_STEPS:
+        if days_ahead <= max_days:
+            return seconds
+    return FAR_STALE_AFTER_SECONDS
+
+
+def _iso_z(timestamp: float) -> str:
+    return (
+        dt.datetime.fromtimestamp(timestamp, tz=dt.timezone.utc)
+        .replace(microsecond=0)
+        .isoformat()
+        .replace("+00:00", "Z")
+    )
+
+
+def _parse_iso_z(value: object) -> Optional[float]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    return parsed.timestamp()
+
+
+class DayStore:
+    """
+    One gzip JSON file per source: {date: {"fetched_at", "payload"}}.
+
+    `variant` describes the request settings a payload depends on (locale,
+    timezone, feed config); entries stored under another variant are ignored.
+    """
+
+    def __init__(self, path: str, variant: str = ""):
+        self.path = path
+        self.variant = variant
+        self.days: Dict[str, Dict[str, object]] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError, EOFError):
+            return
+        if not isinstance(data, dict) or data.get("version") != DAY_STORE_VERSION:
+            return
+        days = data.get("days")
+        if isinstance(days, dict):
+            self.days = {key: value for key, value in days.items() if isinstance(value, dict)}
+
+    def get(self, date_key: str) -> Optional[Dict[str, object]]:
+        entry = self.days.get(date_key)
+        if not entry or entry.get("variant", "") != self.variant or "payload" not in entry:
+            return None
+        return entry
+
+    def age_seconds(self, date_key: str, now: Optional[float] = None) -> Optional[float]:
+        entry = self.get(date_key)
+        fetched_at = _parse_iso_z(entry.get("fetched_at")) if entry else None
+        if fetched_at is None:
+            return None
+        return max(0.0, (time.time() if now is None else now) - fetched_at)
+
+    def put(self, date_key: str, payload: object, now: Optional[float] = None) -> None:
+        self.days[date_key] = {
+            "fetched_at": _iso_z(time.time() if now is None else now),
+            "variant": self.variant,
+            "payload": payload,
+        }
+        self.dirty = True
+
+    def prune(self, today: dt.date) -> None:
+        cutoff = (today - dt.timedelta(days=KEEP_PAST_DAYS)).isoformat()
+        for date_key in [key for key in self.days if key < cutoff]:
+            del self.days[date_key]
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+            json.dump({"version": DAY_STORE_VERSION, "days": self.days}, handle, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def day_store_path(source: str, directory: str = DAY_STORE_DIR) -> str:
+    return os.path.join(directory, f"{source}.json.gz")
+
+
+def plan_days(
+    store: DayStore,
+    dates: List[dt.date],
+    today: dt.date,
+    now: Optional[float] = None,
+) -> Tuple[Dict[dt.date, object], List[dt.date], Dict[dt.date, Dict[str, object]]]:
+    """Split `dates` into (fresh stored payloads, dates to fetch, per-day stats)."""
+    fresh: Dict[dt.date, object] = {}
+    stale: List[dt.date] = []
+    stats: Dict[dt.date, Dict[str, object]] = {}
+    for target_date in dates:
+        date_key = target_date.isoformat()
+        age = store.age_seconds(date_key, now)
+        limit = stale_after_seconds(target_date, today)
+        stats[target_date] = {
+            "date": date_key,
+            "stale_after_seconds": limit,
+            "age_seconds": int(age) if age is not None else None,
+        }
+        if age is not None and age < limit:
+            fresh[target_date] = store.get(date_key)["payload"]
+            stats[target_date]["source"] = "stored"
+        else:
+            stale.append(target_date)
+    return fresh, stale, stats
+
+
+def refresh_days(
+    store: DayStore,
+    dates: List[dt.date],
+    fetch: Callable[[dt.date], object],
+    today: dt.date,
+    workers: int = 1,
+    now: Optional[float] = None,
+) -> Tuple[List[Optional[object]], List[Dict[str, object]]]:
+    """
+    Return (payloads, stats) in `dates` order. Fresh stored days are reused;
+    the others are fetched `workers` at a time and stored. A failed fetch
+    falls back to the stored payload of any age, or None when there is none.
+    """
+    fresh, stale, stats = plan_days(store, dates, today, now)
+
+    def _fetch(target_date: dt.date) -> Tuple[Optional[object], Optional[Exception]]:
+        try:
+            return fetch(target_date), None
+        except Exception as exc:  # noqa: BLE001 - reported per day
+            return None, exc
+
+    workers = max(1, min(int(workers or 1), len(stale) or 1))
+    if workers == 1:
+        results = [_fetch(target_date) for target_date in stale]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_fetch, stale))
+
+    for target_date, (payload, error) in zip(stale, results):
+        date_key = target_date.isoformat()
+        if error is None:
+            store.put(date_key, payload, now)
+            fresh[target_date] = payload
+            stats[target_date]["source"] = "fetched"
+            continue
+        stats[target_date]["error"] = str(error)
+        previous = store.get(date_key)
+        if previous is not None:
+            fresh[target_date] = previous["payload"]
+            stats[target_date]["source"] = "stored-fallback"
+        else:
+            stats[target_date]["source"] = "failed"
+
+    store.prune(today)
+    return [fresh.get(target_date) for target_date in dates], [stats[target_date] for target_date in dates]
@@ -21,7 +21,7 @@ from pathlib import Path
 from typing import Dict, List
 from urllib.parse import quote, urljoin
 
-import requests
+from http_client import PooledHttpClient
 
 
 DEFAULT_BASE_PAGE = "https://www.flashscore.com/"
@@ -129,7 +129,7 @@ def parse_menu_sports(html: str, base_page: str) -> List[Dict[str, str]]:
     return parser.items
 
 
-def fetch_symbol_sprite(session: requests.Session, sprite_url: str, timeout: int) -> Dict[str, ET.Element]:
+def fetch_symbol_sprite(session: PooledHttpClient, sprite_url: str, timeout: int) -> Dict[str, ET.Element]:
     response = session.get(sprite_url, timeout=timeout)
     response.raise_for_status()
     root = ET.fromstring(response.text)
@@ -186,8 +186,7 @@ def main() -> int:
         print(f"Using existing static sport asset payload: {output_path}")
         return 0
 
-    session = requests.Session()
-    session.headers.update({"User-Agent": UA})
+    session = PooledHttpClient(user_agent=UA, timeout=args.timeout)
 
     page_response = session.get(args.base_page, timeout=args.timeout)
     page_response.raise_for_status()
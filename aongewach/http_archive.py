@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Record/replay transport for PooledHttpClient.
+
+While an archive is active (use_archive()), every PooledHttpClient created
+mounts its adapter: a recording archive passes requests through and keeps
+each response, a replay archive answers from the recorded responses without
+touching the network. Archives are one gzip JSON file per scraper run.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import gzip
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+ARCHIVE_VERSION = 1
+# Bodies are stored decoded, so transfer framing headers no longer apply on replay.
+DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def request_key(method: str, url: str) -> str:
+    """Method plus URL with query parameters sorted; request headers (tokens, validators) are ignored."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{(method or 'GET').upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))}"
+
+
+def _encode_body(body: bytes) -> Dict[str, str]:
+    try:
+        return {"text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(entry: Dict) -> bytes:
+    if "text" in entry:
+        return entry["text"].encode("utf-8")
+    return base64.b64decode(entry.get("base64") or "")
+
+
+class HttpArchive:
+    """
+    Recorded responses for one run: {"version", "meta", "entries": [...]}.
+
+    Entries are kept in request order. Replaying a URL requested several times
+    (a 401 before a token refresh, say) serves its responses in recorded order
+    and repeats the last one once they run out.
+    """
+
+    def __init__(self, meta: Optional[Dict[str, object]] = None, entries: Optional[List[Dict]] = None):
+        self.meta: Dict[str, object] = dict(meta or {})
+        self.entries: List[Dict] = list(entries or [])
+        self.lock = threading.Lock()
+        self.misses: List[str] = []
+        self._by_key: Dict[str, List[Dict]] = defaultdict(list)
+        for entry in self.entries:
+            self._by_key[entry["key"]].append(entry)
+        self._cursor: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def load(cls, path: str) -> "HttpArchive":
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            data = json.load(handle)
+        if not isinstance(data, dict) or data.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported HTTP archive: {path}")
+        return cls(meta=data.get("meta"), entries=data.get("entries"))
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with self.lock:
+            data = {"version": ARCHIVE_VERSION, "meta": self.meta, "entries": self.entries}
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+                json.dump(data, handle, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        entry = {
+            "key": request_key(request.method, request.url),
+            "status": response.status_code,
+            "reason": response.reason or "",
+            "headers": {
+                name: value for name, value in response.headers.items() if name.lower() not in DROPPED_RESPONSE_HEADERS
+            },
+        }
+        entry.update(_encode_body(response.content or b""))
+        with self.lock:
+            self.entries.append(entry)
+            self._by_key[entry["key"]].append(entry)
+
+    def lookup(self, method: str, url: str) -> Optional[Dict]:
+        key = request_key(method, url)
+        with self.lock:
+            recorded = self._by_key.get(key)
+            if not recorded:
+                self.misses.append(key)
+                return None
+            index = min(self._cursor[key], len(recorded) - 1)
+            self._cursor[key] += 1
+            return recorded[index]
+
+    def rewind(self) -> None:
+        with self.lock:
+            self._cursor.clear()
+            self.misses.clear()
+
+    def replay_response(self, request: requests.PreparedRequest) -> requests.Response:
+        entry = self.lookup(request.method, request.url)
+        if entry is None:
+            raise requests.ConnectionError(f"Not in HTTP archive: {request.method} {request.url}", request=request)
+        body = _decode_body(entry)
+        response = requests.Response()
+        response.status_code = int(entry["status"])
+        response.reason = entry.get("reason") or ""
+        response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        # Already "read": iter_content() and stream=True callers are served from _content.
+        response._content = body
+        response._content_consumed = True
+        return response
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends through `inner` and records the decoded response."""
+
+    def __init__(self, archive: HttpArchive, inner: BaseAdapter):
+        super().__init__()
+        self.archive = archive
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        self.archive.record(request, response)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers every request from the archive; unrecorded requests raise ConnectionError."""
+
+    def __init__(self, archive: HttpArchive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        return self.archive.replay_response(request)
+
+    def close(self):
+        pass
+
+
+_active: Optional[Tuple[str, HttpArchive]] = None
+_active_lock = threading.Lock()
+
+
+def active_adapter(inner: BaseAdapter) -> BaseAdapter:
+    """Adapter PooledHttpClient should mount: `inner`, or the active archive's wrapper."""
+    with _active_lock:
+        active = _active
+    if active is None:
+        return inner
+    mode, archive = active
+    if mode == "replay":
+        return ReplayAdapter(archive)
+    return RecordingAdapter(archive, inner)
+
+
+@contextmanager
+def use_archive(archive: HttpArchive, mode: str) -> Iterator[HttpArchive]:
+    """Route clients created inside the block through `archive` ("record" or "replay")."""
+    global _active
+    if mode not in ("record", "replay"):
+        raise ValueError(f"Unknown archive mode: {mode}")
+    with _active_lock:
+        previous = _active
+        _active = (mode, archive)
+    try:
+        yield archive
+    finally:
+        with _active_lock:
+            _active = previous
+
+
+def new_meta(source: str, args: List[str]) -> Dict[str, object]:
+    return {
+        "source": source,
+        "args": list(args),
+        "recorded_at": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+    }
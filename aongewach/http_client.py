@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the scrapers and the playlist scanner.
+
+PooledHttpClient bundles keep-alive pooling, a RetryPolicy, an optional
+HostRateLimiter, an optional ResponseCache and per-host timing metrics that
+every caller reports through format_timing_report(). http_archive can swap
+the transport for a recording or replaying one.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from http_archive import active_adapter
+from response_cache import fetch_with_cache
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+DEFAULT_TIMEOUT: Tuple[float, float] = (10.0, 30.0)
+DEFAULT_POOL_CONNECTIONS = 32
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+LATENCY_SAMPLES_PER_HOST = 2048
+
+TimeoutValue = Union[float, Tuple[float, float], None]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How many times a GET/HEAD is retried, and on what. Connection errors, read
+    errors and `status_forcelist` answers are retried with urllib3's
+    exponential `backoff_factor`; Retry-After is honored when present.
+    """
+
+    total: int = DEFAULT_RETRIES
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR
+    status_forcelist: Tuple[int, ...] = RETRY_STATUS_CODES
+    respect_retry_after: bool = True
+
+    def to_urllib3(self) -> Retry:
+        total = max(0, int(self.total))
+        return Retry(
+            total=total,
+            connect=total,
+            read=total,
+            status=total,
+            backoff_factor=max(0.0, float(self.backoff_factor)),
+            status_forcelist=tuple(self.status_forcelist),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=self.respect_retry_after,
+            raise_on_status=False,
+        )
+
+
+# For callers that run their own retry loop (e.g. proxy rotation between attempts).
+NO_RETRIES = RetryPolicy(total=0)
+
+
+class HostRateLimiter:
+    """
+    Per-host request budget shared by every client/thread that holds it:
+    at most `max_concurrent` requests in flight and request starts spaced
+    at least `min_interval` seconds apart. Either limit can be disabled (<= 0).
+    """
+
+    def __init__(self, max_concurrent: int = 0, min_interval: float = 0.0):
+        self.max_concurrent = max(0, int(max_concurrent))
+        self.min_interval = max(0.0, float(min_interval))
+        self.lock = threading.Lock()
+        self.slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.next_start: Dict[str, float] = {}
+        self.stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {"requests": 0, "wait_seconds": 0.0})
+
+    def _slot(self, host: str) -> Optional[threading.BoundedSemaphore]:
+        if self.max_concurrent <= 0:
+            return None
+        with self.lock:
+            slot = self.slots.get(host)
+            if slot is None:
+                slot = self.slots[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return slot
+
+    def _reserve_start(self, host: str) -> float:
+        """Claim the next start time for `host`; returns how long the caller must sleep."""
+        if self.min_interval <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start.get(host, now))
+            self.next_start[host] = start + self.min_interval
+            return start - now
+
+    @contextmanager
+    def acquire(self, url: str) -> Iterator[None]:
+        host = (urlparse(url).hostname or "").lower()
+        started = time.perf_counter()
+        slot = self._slot(host)
+        if slot is not None:
+            slot.acquire()
+        try:
+            delay = self._reserve_start(host)
+            if delay > 0:
+                time.sleep(delay)
+            with self.lock:
+                node = self.stats[host]
+                node["requests"] += 1
+                node["wait_seconds"] += time.perf_counter() - started
+            yield
+        finally:
+            if slot is not None:
+                slot.release()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            return {
+                host: {key: round(value, 4) if isinstance(value, float) else value for key, value in node.items()}
+                for host, node in self.stats.items()
+            }
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second up to `burst`.
+
+    acquire() reserves a token and sleeps outside the lock until it is due,
+    so concurrent callers queue in arrival order. defer() empties the bucket
+    and stops refills until a Retry-After deadline, which every caller then
+    waits out. rate <= 0 disables spacing but still honors defer().
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1.0, float(burst))
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.tokens = self.burst
+        self.updated = clock()
+        self.stats = {"requests": 0, "wait_seconds": 0.0, "deferrals": 0}
+
+    def _reserve(self) -> float:
+        with self.lock:
+            now = self.clock()
+            if self.rate > 0 and now > self.updated:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            elif self.rate <= 0 and now >= self.updated:
+                self.tokens = self.burst
+                self.updated = now
+            self.tokens -= 1.0
+            # Refills start at `updated`, which sits in the future while a deferral is active.
+            wait = max(0.0, self.updated - now)
+            if self.tokens < 0 and self.rate > 0:
+                wait += -self.tokens / self.rate
+            elif self.rate <= 0:
+                self.tokens = max(self.tokens, 0.0)
+            self.stats["requests"] += 1
+            self.stats["wait_seconds"] += wait
+            return wait
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the seconds waited."""
+        wait = self._reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def defer(self, seconds: float) -> None:
+        """Hold every caller back for `seconds` (e.g. a Retry-After value)."""
+        seconds = max(0.0, float(seconds or 0.0))
+        if seconds <= 0:
+            return
+        with self.lock:
+            until = self.clock() + seconds
+            if until > self.updated:
+                # One token becomes due at the deadline; queued reservations keep their debt.
+                self.tokens = min(self.tokens, 1.0)
+                self.updated = until
+            self.stats["deferrals"] += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self.lock:
+            return {key: round(value, 4) if isinstance(value, float) else value for key, value in self.stats.items()}
+
+
+class HostTimings:
+    """Thread-safe per-host counters; handshake time is attributed to the request that opened the socket."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.hosts: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {
+                "requests": 0,
+                "errors": 0,
+                "new_connections": 0,
+                "handshake_seconds": 0.0,
+                "transfer_seconds": 0.0,
+                "bytes": 0,
+            }
+        )
+        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=LATENCY_SAMPLES_PER_HOST))
+
+    def record_connect(self, host: str, seconds: float) -> None:
+        self.local.pending_handshake = getattr(self.local, "pending_handshake", 0.0) + seconds
+        with self.lock:
+            node = self.hosts[(host or "").lower()]
+            node["new_connections"] += 1
+            node["handshake_seconds"] += seconds
+
+    def begin_request(self) -> None:
+        self.local.pending_handshake = 0.0
+
+    def take_handshake(self) -> float:
+        handshake = getattr(self.local, "pending_handshake", 0.0)
+        self.local.pending_handshake = 0.0
+        return handshake
+
+    def end_request(self, host: str, elapsed: float, size: int, handshake: float = 0.0, error: bool = False) -> None:
+        with self.lock:
+            node = self.hosts[(host or "").lower()]
+            node["requests"] += 1
+            node["transfer_seconds"] += max(0.0, elapsed - handshake)
+            node["bytes"] += max(0, int(size or 0))
+            if error:
+                node["errors"] += 1
+            self.latencies[(host or "").lower()].append(elapsed * 1000.0)
+
+    def record_cache(self, host: str, outcome: str) -> None:
+        """Count a response-cache outcome: "fresh" (or "cache"), "not-modified", "unchanged" or "fetched"."""
+        key = "cache_" + ("fresh" if outcome == "cache" else outcome.replace("-", "_"))
+        with self.lock:
+            node = self.hosts[(host or "").lower()]
+            node[key] = node.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            report = {}
+            for host, node in self.hosts.items():
+                entry = {key: round(value, 4) if isinstance(value, float) else value for key, value in node.items()}
+                samples = sorted(self.latencies.get(host) or ())
+                if samples:
+                    entry["p50_ms"] = round(_percentile(samples, 0.50), 1)
+                    entry["p95_ms"] = round(_percentile(samples, 0.95), 1)
+                report[host] = entry
+            return report
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def format_timing_report(
+    report: Dict[str, Dict[str, float]],
+    limiter_report: Optional[Dict[str, Dict[str, float]]] = None,
+) -> List[str]:
+    """One line per host, busiest first, in the format every scraper and the scanner print."""
+    lines = []
+    limiter_report = limiter_report or {}
+    for host, node in sorted(report.items(), key=lambda item: (-item[1].get("transfer_seconds", 0.0), item[0])):
+        parts = [
+            f"requests={node.get('requests', 0)}",
+            f"errors={node.get('errors', 0)}",
+            f"new_conns={node.get('new_connections', 0)}",
+            f"handshake={node.get('handshake_seconds', 0.0):.2f}s",
+            f"transfer={node.get('transfer_seconds', 0.0):.2f}s",
+            f"bytes={node.get('bytes', 0)}",
+        ]
+        if "p50_ms" in node:
+            parts.append(f"p50={node['p50_ms']:.0f}ms p95={node['p95_ms']:.0f}ms")
+        waited = limiter_report.get(host, {}).get("wait_seconds")
+        if waited:
+            parts.append(f"limiter_wait={waited:.2f}s")
+        cache_parts = [
+            f"{key[len('cache_'):]}={value}" for key, value in sorted(node.items()) if key.startswith("cache_")
+        ]
+        if cache_parts:
+            parts.append("cache[" + " ".join(cache_parts) + "]")
+        lines.append(f"{host}: " + " ".join(parts))
+    return lines
+
+
+def _timed_pool_classes(timings: HostTimings) -> Dict[str, type]:
+    class TimedHTTPConnection(HTTPConnection):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                super().connect()
+            finally:
+                timings.record_connect(self.host, time.perf_counter() - started)
+
+    class TimedHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            # Covers TCP connect plus the TLS handshake.
+            started = time.perf_counter()
+            try:
+                super().connect()
+            finally:
+                timings.record_connect(self.host, time.perf_counter() - started)
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    return {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+class _TimedAdapter(HTTPAdapter):
+    def __init__(self, timings: HostTimings, **kwargs):
+        # init_poolmanager runs inside HTTPAdapter.__init__, so set this first.
+        self._timings = timings
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _timed_pool_classes(self._timings)
+
+
+def _instrument_adapter(adapter: HTTPAdapter, timings: HostTimings, pool_connections: int, pool_maxsize: int, retries: Retry) -> None:
+    """
+    Resize, set retries on and time a session factory's own adapter in place.
+
+    The adapter is kept, so anything its init_poolmanager() adds (cloudscraper's
+    cipher-suite ssl_context) still applies to every pooled connection.
+    """
+    adapter.max_retries = retries
+    adapter._pool_connections = pool_connections
+    adapter._pool_maxsize = pool_maxsize
+    adapter.init_poolmanager(pool_connections, pool_maxsize, block=adapter._pool_block)
+    adapter.poolmanager.pool_classes_by_scheme = _timed_pool_classes(timings)
+
+
+class PooledHttpClient:
+    """
+    One shared requests.Session with per-host urllib3 pools.
+
+    urllib3 pools are thread-safe, so a single client can be shared by the
+    playlist fetch path and worker threads; session headers are fixed at
+    construction and never mutated afterwards. Sessions that are not safe to
+    share (cloudscraper) come from `session_factory`; clone() then gives each
+    thread its own session while the limiter, cache and metrics stay shared.
+    """
+
+    def __init__(
+        self,
+        user_agent: Optional[str] = DEFAULT_USER_AGENT,
+        timeout: TimeoutValue = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+        limiter: Optional[HostRateLimiter] = None,
+        cache=None,
+        headers: Optional[Dict[str, str]] = None,
+        session_factory: Optional[Callable[[], requests.Session]] = None,
+        timings: Optional[HostTimings] = None,
+    ):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy(total=retries, backoff_factor=backoff_factor)
+        self.pool_connections = max(1, int(pool_connections))
+        self.pool_maxsize = max(1, int(pool_maxsize))
+        self.limiter = limiter
+        self.cache = cache
+        self.extra_headers = dict(headers or {})
+        self.session_factory = session_factory
+        self.timings = timings or HostTimings()
+
+        if session_factory:
+            self.session = session_factory()
+            # Keep the factory's adapters (cloudscraper's carries its TLS cipher profile).
+            for prefix, adapter in list(self.session.adapters.items()):
+                if isinstance(adapter, HTTPAdapter):
+                    _instrument_adapter(
+                        adapter, self.timings, self.pool_connections, self.pool_maxsize, self.retry_policy.to_urllib3()
+                    )
+                # Inside http_archive.use_archive() the adapter records or replays instead.
+                self.session.mount(prefix, active_adapter(adapter))
+        else:
+            adapter = _TimedAdapter(
+                self.timings,
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                max_retries=self.retry_policy.to_urllib3(),
+            )
+            adapter = active_adapter(adapter)
+            self.session = requests.Session()
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        if user_agent:
+            # None keeps the factory session's own User-Agent (cloudscraper pairs it with its TLS profile).
+            self.session.headers["User-Agent"] = user_agent
+        self.session.headers.update(self.extra_headers)
+
+    def clone(self) -> "PooledHttpClient":
+        """New session with the same settings; limiter, cache and timing metrics are shared."""
+        return PooledHttpClient(
+            user_agent=self.user_agent,
+            timeout=self.timeout,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            retry_policy=self.retry_policy,
+            limiter=self.limiter,
+            cache=self.cache,
+            headers=self.extra_headers,
+            session_factory=self.session_factory,
+            timings=self.timings,
+        )
+
+    def get(
+        self,
+        url: str,
+        timeout: TimeoutValue = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        if self.limiter is None:
+            return self._get(url, timeout, headers, **kwargs)
+        with self.limiter.acquire(url):
+            return self._get(url, timeout, headers, **kwargs)
+
+    def _get(
+        self,
+        url: str,
+        timeout: TimeoutValue,
+        headers: Optional[Dict[str, str]],
+        **kwargs,
+    ) -> requests.Response:
+        host = urlparse(url).hostname or ""
+        self.timings.begin_request()
+        started = time.perf_counter()
+        try:
+            response = self.session.get(
+                url,
+                timeout=timeout if timeout is not None else self.timeout,
+                headers=headers,
+                **kwargs,
+            )
+            handshake = self.timings.take_handshake()
+            if kwargs.get("stream") and response.status_code < 300:
+                self._time_streamed_body(response, host, started, handshake)
+                return response
+            size = 0 if kwargs.get("stream") else len(response.content or b"")
+        except Exception:
+            self.timings.end_request(
+                host, time.perf_counter() - started, 0, handshake=self.timings.take_handshake(), error=True
+            )
+            raise
+        self.timings.end_request(
+            host, time.perf_counter() - started, size, handshake=handshake, error=response.status_code >= 400
+        )
+        return response
+
+    def fetch_cached(
+        self,
+        url: str,
+        parse: Callable[[bytes], object],
+        timeout: TimeoutValue = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream_parse: Optional[Callable[[Iterable[bytes]], object]] = None,
+    ) -> Tuple[object, str]:
+        """
+        GET + parse through the client's ResponseCache (see
+        response_cache.fetch_with_cache); a plain GET + parse when the client
+        has no cache. Returns (parsed, status) and counts the status per host.
+        """
+        parsed, status = fetch_with_cache(
+            url,
+            parse,
+            cache=self.cache,
+            http_get=self.get,
+            timeout=timeout if timeout is not None else self.timeout,
+            headers=headers,
+            stream_parse=stream_parse,
+        )
+        if self.cache is not None:
+            self.timings.record_cache(urlparse(url).hostname or "", status)
+        return parsed, status
+
+    def _time_streamed_body(self, response: requests.Response, host: str, started: float, handshake: float) -> None:
+        """Record transfer time once a streamed body has been fully consumed."""
+        original_iter_content = response.iter_content
+
+        def iter_content(chunk_size=1, decode_unicode=False):
+            size = 0
+            try:
+                for chunk in original_iter_content(chunk_size=chunk_size, decode_unicode=decode_unicode):
+                    size += len(chunk or b"")
+                    yield chunk
+            finally:
+                self.timings.end_request(host, time.perf_counter() - started, size, handshake=handshake)
+
+        response.iter_content = iter_content
+
+    def timing_report(self) -> Dict[str, Dict[str, float]]:
+        return self.timings.snapshot()
+
+    def timing_lines(self) -> List[str]:
+        return format_timing_report(
+            self.timing_report(),
+            self.limiter.snapshot() if self.limiter is not None else None,
+        )
+
+    def log_timing_report(self, prefix: str) -> None:
+        lines = self.timing_lines()
+        if not lines:
+            return
+        print(f"{prefix} HTTP timing per host:", flush=True)
+        for line in lines:
+            print(f"{prefix}   {line}", flush=True)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_shared_client: Optional[PooledHttpClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def shared_client() -> PooledHttpClient:
+    """Process-wide default client for callers that are not handed one."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = PooledHttpClient()
+        return _shared_client
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Structural JSON diff as RFC 6902 patches (add / remove / replace only)."""
+
+from __future__ import annotations
+
+import copy
+from typing import Dict, List
+
+
+def _escape(token: object) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(a, b) -> bool:
+    """
+    Type-strict equality, recursing into containers: bool is an int subclass,
+    so == treats true/1 and 1/1.0 as equal even inside lists and objects.
+    Object key order counts too, since it changes the serialized bytes.
+    """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_same(a[key], b[key]) for key in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(left, right) for left, right in zip(a, b))
+    return a == b
+
+
+def diff(old, new, path: str = "") -> List[Dict[str, object]]:
+    """
+    Operations turning `old` into `new`.
+
+    Objects are diffed key by key. Arrays keep their common prefix and suffix
+    untouched and diff the changed middle position by position, so an event
+    inserted or dropped in a day's list costs one add/remove instead of
+    rewriting every later element.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        if list(new) != [key for key in old if key in new] + [key for key in new if key not in old]:
+            # add appends keys, so a reordered object is replaced to keep its key order.
+            return [{"op": "replace", "path": path, "value": new}]
+        ops: List[Dict[str, object]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        limit = min(len(old), len(new))
+        prefix = 0
+        while prefix < limit and _same(old[prefix], new[prefix]):
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and _same(old[-1 - suffix], new[-1 - suffix]):
+            suffix += 1
+        old_mid = old[prefix:len(old) - suffix]
+        new_mid = new[prefix:len(new) - suffix]
+        shared = min(len(old_mid), len(new_mid))
+
+        ops = []
+        for offset in range(shared):
+            ops.extend(diff(old_mid[offset], new_mid[offset], f"{path}/{prefix + offset}"))
+        for offset in range(len(old_mid) - 1, shared - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{prefix + offset}"})
+        for offset in range(shared, len(new_mid)):
+            ops.append({"op": "add", "path": f"{path}/{prefix + offset}", "value": new_mid[offset]})
+        return ops
+
+    if _same(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply(document, ops: List[Dict[str, object]]):
+    """Apply add/remove/replace operations to a deep copy of `document`. Raises ValueError on bad paths."""
+    document = copy.deepcopy(document)
+    for op in ops:
+        kind = op.get("op")
+        path = str(op.get("path", ""))
+        if path == "":
+            if kind not in ("add", "replace"):
+                raise ValueError(f"cannot {kind} the document root")
+            document = copy.deepcopy(op["value"])
+            continue
+        tokens = [_unescape(token) for token in path.split("/")[1:]]
+        parent = document
+        try:
+            for token in tokens[:-1]:
+                parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+            last = tokens[-1]
+            if isinstance(parent, list):
+                index = len(parent) if last == "-" else int(last)
+                if kind == "add":
+                    if not 0 <= index <= len(parent):
+                        raise IndexError(index)
+                    parent.insert(index, copy.deepcopy(op["value"]))
+                elif kind == "remove":
+                    del parent[index]
+                elif kind == "replace":
+                    parent[index] = copy.deepcopy(op["value"])
+                else:
+                    raise ValueError(f"unsupported op {kind!r}")
+            elif isinstance(parent, dict):
+                if kind in ("add", "replace"):
+                    if kind == "replace" and last not in parent:
+                        raise KeyError(last)
+                    parent[last] = copy.deepcopy(op["value"])
+                elif kind == "remove":
+                    del parent[last]
+                else:
+                    raise ValueError(f"unsupported op {kind!r}")
+            else:
+                raise ValueError(f"path {path!r} does not point into a container")
+        except (KeyError, IndexError, TypeError) as exc:
+            raise ValueError(f"cannot apply {kind} at {path!r}: {exc}") from exc
+    return document
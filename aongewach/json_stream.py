@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Incremental decoding of top-level JSON arrays from a byte-chunk stream."""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    length = len(text)
+    while pos < length and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[object]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Only the element currently being decoded is buffered, so peak memory is
+    bounded by the largest element rather than the whole document. A top-level
+    value that is not an array (e.g. an Xtream error object) yields nothing.
+    Raises ValueError on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    pos = 0
+    state = "start"  # start -> first -> (value <-> sep) -> done
+    not_array_parts = []
+
+    def _pieces() -> Iterator[str]:
+        for chunk in chunks:
+            if chunk:
+                yield text_decoder.decode(chunk)
+        yield text_decoder.decode(b"", final=True)
+
+    for piece in _pieces():
+        if state == "not-array":
+            not_array_parts.append(piece)
+            continue
+        if state == "done":
+            continue
+        buf = buf[pos:] + piece
+        pos = 0
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos >= len(buf):
+                break
+            char = buf[pos]
+            if state == "start":
+                if char == "\ufeff":
+                    pos += 1
+                    continue
+                if char != "[":
+                    state = "not-array"
+                    not_array_parts.append(buf[pos:])
+                    buf, pos = "", 0
+                    break
+                pos += 1
+                state = "first"
+                continue
+            if state == "sep":
+                if char == ",":
+                    pos += 1
+                    state = "value"
+                    continue
+                if char == "]":
+                    state = "done"
+                    break
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            if char == "]" and state == "first":
+                state = "done"
+                break
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # element continues in the next chunk
+            if end >= len(buf) or buf[end] not in _DELIMITERS:
+                # A bare number may be cut at the chunk edge ("2" of "2.5"); wait for more input.
+                break
+            yield value
+            pos = end
+            state = "sep"
+        if state == "done":
+            continue
+
+    if state == "not-array":
+        data = json.loads("".join(not_array_parts) or "null")
+        if isinstance(data, list):
+            yield from data
+        return
+    if state == "done":
+        return
+
+    # End of input: the tail may hold one last complete element.
+    rest = buf[pos:].strip()
+    if state in ("first", "value") and rest:
+        value, end = decoder.raw_decode(rest)
+        yield value
+        tail = rest[end:].strip()
+        if tail == "]":
+            return
+    raise ValueError("Truncated JSON array")
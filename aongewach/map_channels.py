@@ -9,6 +9,8 @@ import time
 from typing import Dict, Optional
 
 from channel_name_placeholders import is_placeholder_channel_name
+from channel_store import ChannelStore, default_store_path
+from publish_artifacts import default_publish_dir, publish_json, publish_shards, schedule_channel_ids
 from channel_selection import (
     split_mapped_channel_entry,
 )
@@ -138,11 +140,52 @@ def parse_args() -> argparse.Namespace:
         help="Fallback schedule file path if primary is missing/empty.",
     )
     parser.add_argument("--channels-file", default=CHANNELS_FILE, help="channels.json file path.")
+    parser.add_argument(
+        "--channel-store",
+        default=None,
+        help="SQLite channel store backing --channels-file (default: next to it, .sqlite).",
+    )
     parser.add_argument("--map-file", default=MAP_FILE, help="channel_map.json file path.")
     parser.add_argument("--output-file", default=OUTPUT_FILE, help="Final mapped output file path.")
+    parser.add_argument(
+        "--publish-dir",
+        default=None,
+        help="Directory for minified copies + manifest (default: published/ next to --output-file).",
+    )
+    parser.add_argument(
+        "--publish-compressed",
+        action="store_true",
+        help="Also write .gz (and .br with brotli) siblings, for hosts that do not compress in transit.",
+    )
+    parser.add_argument(
+        "--sharded",
+        action="store_true",
+        help="Also write schedule/<date>.json + channels/<id>.json shards and index.json under the publish dir.",
+    )
     return parser.parse_args()
 
 
+def export_shards(args: argparse.Namespace, schedule_data: Dict, iptv_channels: Dict, store_path: str) -> None:
+    """Write per-day/per-channel shards for the channels the mapped schedule references."""
+    name_by_id = {}
+    for name, payload in iptv_channels.items():
+        cid = payload.get("id")
+        if isinstance(cid, int) and cid not in name_by_id:
+            name_by_id[cid] = name
+    wanted = [cid for cid in schedule_channel_ids(schedule_data) if cid in name_by_id]
+    with ChannelStore.open_synced(args.channels_file, store_path) as store:
+        entries = store.get_channels(name_by_id[cid] for cid in wanted)
+    channels_by_id = {cid: (name_by_id[cid], entries.get(name_by_id[cid])) for cid in wanted}
+
+    publish_dir = args.publish_dir or default_publish_dir(args.output_file)
+    index = publish_shards(publish_dir, schedule_data, channels_by_id, schedule_path=args.output_file)
+    stats = index["stats"]
+    print(
+        f"Sharded export: {len(index['dates'])} day(s), {len(channels_by_id)} channel(s), "
+        f"{stats['written']} written, {stats['removed']} removed -> {publish_dir}"
+    )
+
+
 def map_channels(args: argparse.Namespace) -> int:
     print("Loading data...")
     schedule_data = load_json(args.schedule_file)
@@ -150,15 +193,19 @@ def map_channels(args: argparse.Namespace) -> int:
     if not schedule_data:
         schedule_data = load_json(args.schedule_fallback)
         schedule_source = args.schedule_fallback
-    channels_db = load_json(args.channels_file)
+    store_path = args.channel_store or default_store_path(args.channels_file)
+    iptv_channels = {}
+    if os.path.exists(args.channels_file) or os.path.exists(store_path):
+        # Only channel names and IDs are needed; read them from the store's channel rows.
+        with ChannelStore.open_synced(args.channels_file, store_path) as store:
+            iptv_channels = {name: {"id": cid} for name, cid in store.channel_ids().items()}
     saved_map = load_json(args.map_file)
 
-    if not schedule_data or not channels_db:
+    if not schedule_data or not iptv_channels:
         print("Missing input files.")
         return 1
     print(f"Using schedule file: {schedule_source}")
 
-    iptv_channels = channels_db.get("channels", {})
     print("Building exact lookup...")
     t0 = time.time()
     name_to_id, name_to_id_lower, id_to_channel = build_exact_lookup(iptv_channels)
@@ -245,12 +292,17 @@ def map_channels(args: argparse.Namespace) -> int:
 
     save_json(args.output_file, schedule_data)
     save_json(args.map_file, saved_map)
+    published = publish_json(args.output_file, schedule_data, args.publish_dir, compress=args.publish_compressed)
+    if args.sharded:
+        export_shards(args, schedule_data, iptv_channels, store_path)
 
     print(f"Done. Resolved {total_resolved} channel entries to stable channel IDs.")
     print(f"Unresolved channel entries (excluded from final): {unresolved_entries}/{total_channel_entries}")
     print(f"Learned {unique_channels_mapped} new ID mappings.")
     print(f"Events with mapped channels: {events_with_mapped_channels}")
     print(f"Mapped channels kept in output: {mapped_channels_kept}")
+    sizes = ", ".join(f"{rep['encoding']}={rep['bytes']}" for rep in published["representations"])
+    print(f"Published {os.path.basename(args.output_file)} sha256={published['sha256'][:12]} ({sizes})")
     return 0
 
 
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Persisted per-playlist snapshots of matched (channel, URL) pairs for incremental scans."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+DECISION_FULL = "full"
+DECISION_TRUST = "trust"
+DECISION_REVALIDATE = "revalidate"
+DECISION_SKIP_DEAD = "skip-dead"
+
+DEFAULT_TRUST_HOURS = 6.0
+DEFAULT_REVALIDATE_HOURS = 48.0
+DEFAULT_DEAD_RETRY_HOURS = 12.0
+
+
+def compact_hash(value: str) -> str:
+    return hashlib.blake2b(str(value or "").encode("utf-8"), digest_size=8).hexdigest()
+
+
+def pair_key(channel_name: str, url: str) -> str:
+    return compact_hash(f"{(channel_name or '').strip().lower()}\n{(url or '').strip()}")
+
+
+class FreshnessPolicy:
+    """Decide how much testing an unchanged snapshot entry needs."""
+
+    def __init__(
+        self,
+        trust_hours: float = DEFAULT_TRUST_HOURS,
+        revalidate_hours: float = DEFAULT_REVALIDATE_HOURS,
+        dead_retry_hours: float = DEFAULT_DEAD_RETRY_HOURS,
+    ):
+        self.trust_seconds = max(0.0, float(trust_hours)) * 3600
+        self.revalidate_seconds = max(self.trust_seconds, float(revalidate_hours) * 3600)
+        self.dead_retry_seconds = max(0.0, float(dead_retry_hours)) * 3600
+
+    def decide(self, previous: Optional[List], name_hash: str, now: Optional[float] = None) -> str:
+        if not previous or len(previous) < 3 or previous[0] != name_hash:
+            return DECISION_FULL
+        age = (now if now is not None else time.time()) - float(previous[2] or 0)
+        if age < 0:
+            return DECISION_FULL
+        if previous[1]:
+            if age <= self.trust_seconds:
+                return DECISION_TRUST
+            if age <= self.revalidate_seconds:
+                return DECISION_REVALIDATE
+            return DECISION_FULL
+        if age <= self.dead_retry_seconds:
+            return DECISION_SKIP_DEAD
+        return DECISION_FULL
+
+
+class PlaylistSnapshotStore:
+    """
+    Snapshot file layout (gzip JSON):
+      {"version": 1, "servers": {server_hash: {"updated_at": epoch,
+                                               "entries": {pair_hash: [name_hash, ok, tested_at]}}}}
+    """
+
+    def __init__(self, path: str, policy: Optional[FreshnessPolicy] = None):
+        self.path = path
+        self.policy = policy or FreshnessPolicy()
+        self.lock = threading.Lock()
+        self.servers: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+                loaded = json.load(handle)
+        except (OSError, EOFError, ValueError):
+            return
+        servers = loaded.get("servers") if isinstance(loaded, dict) else None
+        if isinstance(servers, dict):
+            self.servers = {key: node for key, node in servers.items() if isinstance(node, dict)}
+
+    def previous_entries(self, server_url: str) -> Dict[str, List]:
+        with self.lock:
+            node = self.servers.get(compact_hash(server_url)) or {}
+            entries = node.get("entries")
+            return dict(entries) if isinstance(entries, dict) else {}
+
+    def replace_entries(self, server_url: str, entries: Dict[str, List]) -> None:
+        """Store this run's matched pairs; pairs that vanished from the playlist are dropped."""
+        with self.lock:
+            self.servers[compact_hash(server_url)] = {
+                "updated_at": int(time.time()),
+                "entries": entries,
+            }
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            payload = {"version": 1, "servers": self.servers}
+            tmp_path = self.path + ".tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
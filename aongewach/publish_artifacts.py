@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Client-facing copies of the published JSON files.
+
+Next to each pretty-printed source (e104f869d64e3d41256d5398.json,
+channels.json) the writers drop a minified copy into `published/`.
+`published/manifest.json` lists every artifact with the sha256 of its
+minified bytes and the size of each representation, so a client can fetch
+the manifest alone, skip artifacts whose hash it already holds and pick the
+smallest encoding it can decode.
+
+Gzip and (with the `brotli` package) brotli siblings are only written when
+asked for (`compress=True`, map_channels --publish-compressed), for hosts
+that serve static files uncompressed. The committed copies are served by
+raw.githubusercontent, which already compresses text in transit, and
+compressed bytes change on every run without git being able to delta
+them, so they are not written by default.
+
+Each change also writes an RFC 6902 patch from the previous version to
+`published/deltas/<name>/<version>.patch.json`; the manifest keeps the
+chain (version, from/to sha256) so a client holding version N fetches only
+the patches up to the current one.
+
+map_channels --sharded additionally splits the mapped schedule into
+`published/schedule/<date>.json` and `published/channels/<id>.json`,
+described by `published/index.json`. Day shards embed the channel entries
+they reference, so whenever channels.json is republished the whole shard
+set is rebuilt from the mapped schedule recorded in the index.
+
+Compression is deterministic (gzip mtime 0) and unchanged content is not
+rewritten, so re-running a writer does not churn the committed files.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import json_patch
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore
+
+PUBLISH_DIR_NAME = "published"
+MANIFEST_FILE_NAME = "manifest.json"
+SHARD_INDEX_FILE_NAME = "index.json"
+SHARD_FOLDERS = ("schedule", "channels")
+# Ranker diagnostics left out of the channel copies embedded in day shards (channels/<id>.json keeps them).
+DAY_SHARD_OMITTED_CHANNEL_FIELDS = ("candidates", "stream_selection")
+DELTA_DIR_NAME = "deltas"
+# Patches kept per artifact; clients further behind download the full document.
+MAX_DELTAS = 14
+MANIFEST_VERSION = 1
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def utc_now_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def default_publish_dir(source_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(source_path)), PUBLISH_DIR_NAME)
+
+
+def minify_json(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def gzip_bytes(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def brotli_bytes(body: bytes) -> Optional[bytes]:
+    if brotli is None:
+        return None
+    return brotli.compress(body, quality=BROTLI_QUALITY)
+
+
+def write_bytes_atomic(path: str, body: bytes) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(body)
+    os.replace(tmp_path, path)
+
+
+def _load_json_file(path: str) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            loaded = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return loaded if isinstance(loaded, dict) else {}
+
+
+def load_manifest(publish_dir: str) -> Dict:
+    manifest = _load_json_file(os.path.join(publish_dir, MANIFEST_FILE_NAME))
+    if not isinstance(manifest.get("artifacts"), dict):
+        manifest = {"version": MANIFEST_VERSION, "artifacts": {}}
+    return manifest
+
+
+def save_manifest(publish_dir: str, manifest: Dict) -> None:
+    text = json.dumps(manifest, indent=2, ensure_ascii=False, sort_keys=True) + "\n"
+    write_bytes_atomic(os.path.join(publish_dir, MANIFEST_FILE_NAME), text.encode("utf-8"))
+
+
+def _encodings(compress: bool) -> set:
+    if not compress:
+        return {"identity"}
+    return {"identity", "gzip"} | ({"br"} if brotli is not None else set())
+
+
+def write_representations(publish_dir: str, stem: str, body: bytes, compress: bool = False) -> List[Dict[str, object]]:
+    """Write <stem>.min.json (+ .gz, .br with `compress`) and describe them, smallest first."""
+    encoded = [("identity", f"{stem}.min.json", body)]
+    if compress:
+        encoded.append(("gzip", f"{stem}.min.json.gz", gzip_bytes(body)))
+        compressed = brotli_bytes(body)
+        if compressed is not None:
+            encoded.append(("br", f"{stem}.min.json.br", compressed))
+    written = {rel_path for _, rel_path, _ in encoded}
+    for suffix in (".gz", ".br"):
+        # Siblings left from a compressed publish would no longer match the manifest.
+        rel_path = f"{stem}.min.json{suffix}"
+        if rel_path not in written and os.path.exists(os.path.join(publish_dir, rel_path)):
+            os.remove(os.path.join(publish_dir, rel_path))
+    out = []
+    for encoding, rel_path, data in encoded:
+        write_bytes_atomic(os.path.join(publish_dir, rel_path), data)
+        out.append({"encoding": encoding, "path": rel_path, "bytes": len(data)})
+    out.sort(key=lambda item: item["bytes"])
+    return out
+
+
+def _load_previous(publish_dir: str, stem: str, entry: Optional[Dict]):
+    """The previously published document, if its minified copy still matches the manifest hash."""
+    if not isinstance(entry, dict) or not entry.get("sha256"):
+        return None
+    try:
+        with open(os.path.join(publish_dir, f"{stem}.min.json"), "rb") as handle:
+            body = handle.read()
+    except OSError:
+        return None
+    if content_hash(body) != entry["sha256"]:
+        return None
+    return json.loads(body)
+
+
+def write_delta(
+    publish_dir: str,
+    stem: str,
+    previous_entry: Optional[Dict],
+    payload,
+    digest: str,
+    version: int,
+) -> List[Dict[str, object]]:
+    """
+    Write deltas/<stem>/<version>.patch.json (RFC 6902, previous -> new) and
+    return the updated delta chain, newest last and at most MAX_DELTAS long.
+    The chain restarts when the previous version is unavailable or a patch
+    would not be smaller than the full minified document.
+    """
+    chain = list(previous_entry.get("deltas") or []) if isinstance(previous_entry, dict) else []
+    previous = _load_previous(publish_dir, stem, previous_entry)
+    ops = json_patch.diff(previous, payload) if previous is not None else None
+    patch_body = minify_json(ops) if ops is not None else b""
+    if ops is None or len(patch_body) >= len(minify_json(payload)) or minify_json(json_patch.apply(previous, ops)) != minify_json(payload):
+        chain = []
+    else:
+        rel_path = f"{DELTA_DIR_NAME}/{stem}/{version}.patch.json"
+        write_bytes_atomic(os.path.join(publish_dir, rel_path), patch_body)
+        chain.append(
+            {
+                "version": version,
+                "from_sha256": previous_entry["sha256"],
+                "sha256": digest,
+                "path": rel_path,
+                "ops": len(ops),
+                "bytes": len(patch_body),
+            }
+        )
+        chain = chain[-MAX_DELTAS:]
+
+    keep = {item["path"] for item in chain}
+    delta_dir = os.path.join(publish_dir, DELTA_DIR_NAME, stem)
+    if os.path.isdir(delta_dir):
+        for file_name in os.listdir(delta_dir):
+            if f"{DELTA_DIR_NAME}/{stem}/{file_name}" not in keep:
+                os.remove(os.path.join(delta_dir, file_name))
+    return chain
+
+
+def publish_json(
+    source_path: str,
+    payload,
+    publish_dir: Optional[str] = None,
+    compress: bool = False,
+) -> Dict[str, object]:
+    """
+    Publish `payload` (the content just written to `source_path`) and return
+    its manifest entry. Nothing is rewritten when the minified hash matches
+    the manifest, the entry has the requested encodings and the files are
+    still on disk.
+    """
+    publish_dir = publish_dir or default_publish_dir(source_path)
+    name = os.path.basename(source_path)
+    stem = os.path.splitext(name)[0]
+    body = minify_json(payload)
+    digest = content_hash(body)
+
+    manifest = load_manifest(publish_dir)
+    entry = manifest["artifacts"].get(name)
+    if (
+        isinstance(entry, dict)
+        and entry.get("sha256") == digest
+        and all(os.path.exists(os.path.join(publish_dir, rep.get("path", ""))) for rep in entry.get("representations", []))
+        and {rep.get("encoding") for rep in entry.get("representations", [])} == _encodings(compress)
+    ):
+        return entry
+
+    if isinstance(entry, dict) and entry.get("sha256") == digest:
+        # Same document, only its files or encodings changed: no new version to patch to.
+        version, deltas = int(entry.get("version", 0) or 0), list(entry.get("deltas") or [])
+    else:
+        version = int(entry.get("version", 0) or 0) + 1 if isinstance(entry, dict) else 1
+        deltas = write_delta(publish_dir, stem, entry, payload, digest, version)
+    entry = {
+        "source": name,
+        "sha256": digest,
+        "version": version,
+        "updated_at": utc_now_iso(),
+        "representations": write_representations(publish_dir, stem, body, compress=compress),
+        "deltas": deltas,
+    }
+    manifest["version"] = MANIFEST_VERSION
+    manifest["artifacts"][name] = entry
+    manifest["generated_at"] = entry["updated_at"]
+    save_manifest(publish_dir, manifest)
+    return entry
+
+
+def _event_channel_ids(event: Dict) -> List[int]:
+    ids = []
+    for raw in event.get("channels", []) or []:
+        _, _, tail = str(raw or "").rpartition(",")
+        try:
+            cid = int(tail.strip())
+        except ValueError:
+            continue
+        if cid not in ids:
+            ids.append(cid)
+    return ids
+
+
+def schedule_channel_ids(schedule_data: Dict) -> List[int]:
+    """Channel IDs referenced by mapped events ("Name, 123"), in first-seen order."""
+    ids: List[int] = []
+    seen = set()
+    for day in schedule_data.get("schedule", []) or []:
+        for event in day.get("events", []) or []:
+            for cid in _event_channel_ids(event):
+                if cid not in seen:
+                    seen.add(cid)
+                    ids.append(cid)
+    return ids
+
+
+def _player_channel(entry):
+    if not isinstance(entry, dict):
+        return entry
+    return {key: value for key, value in entry.items() if key not in DAY_SHARD_OMITTED_CHANNEL_FIELDS}
+
+
+def build_shards(schedule_data: Dict, channels_by_id: Dict[int, Tuple[str, object]]) -> Tuple[Dict[str, object], Dict]:
+    """
+    Split a mapped schedule into shard payloads keyed by relative path, plus
+    the index skeleton describing them.
+
+    schedule/<date>.json carries that day's events and every channel entry
+    they reference (minus ranker diagnostics), so a player screen needs only
+    one request;
+    channels/<id>.json holds a single channel for targeted refreshes and
+    schedule/meta.json the remaining top-level fields (sport assets, ...).
+    """
+    shards: Dict[str, object] = {}
+    header = {key: schedule_data[key] for key in ("generated_at", "source", "schema_version") if key in schedule_data}
+    meta = {key: value for key, value in schedule_data.items() if key != "schedule"}
+    shards["schedule/meta.json"] = meta
+    index: Dict = {"version": MANIFEST_VERSION, **header, "meta": "schedule/meta.json", "dates": [], "channels": {}}
+
+    for cid, (name, entry) in channels_by_id.items():
+        path = f"channels/{cid}.json"
+        shards[path] = {"id": cid, "name": name, "channel": entry}
+        index["channels"][str(cid)] = {"name": name, "path": path}
+
+    for day in schedule_data.get("schedule", []) or []:
+        date = str(day.get("date") or "").strip()
+        if not date:
+            continue
+        events = day.get("events", []) or []
+        day_ids: List[int] = []
+        for event in events:
+            for cid in _event_channel_ids(event):
+                if cid not in day_ids:
+                    day_ids.append(cid)
+        path = f"schedule/{date}.json"
+        shards[path] = {
+            **header,
+            "date": date,
+            "day": day.get("day"),
+            "events": events,
+            "channels": {
+                str(cid): {"name": channels_by_id[cid][0], "channel": _player_channel(channels_by_id[cid][1])}
+                for cid in day_ids
+                if cid in channels_by_id
+            },
+        }
+        index["dates"].append(
+            {"date": date, "day": day.get("day"), "path": path, "events": len(events), "channel_ids": day_ids}
+        )
+    return shards, index
+
+
+def shard_channels(schedule_data: Dict, channels: Dict[str, object]) -> Dict[int, Tuple[str, object]]:
+    """(name, entry) for each channel ID the mapped schedule references; the first name wins for a shared ID."""
+    by_id: Dict[int, Tuple[str, object]] = {}
+    for name, entry in (channels or {}).items():
+        cid = entry.get("id") if isinstance(entry, dict) else None
+        if isinstance(cid, int) and cid not in by_id:
+            by_id[cid] = (name, entry)
+    return {cid: by_id[cid] for cid in schedule_channel_ids(schedule_data) if cid in by_id}
+
+
+def publish_shards(
+    publish_dir: str,
+    schedule_data: Dict,
+    channels_by_id: Dict[int, Tuple[str, object]],
+    schedule_path: Optional[str] = None,
+) -> Dict:
+    """
+    Write the sharded export under `publish_dir` and its `index.json` (paths,
+    sha256 and sizes). Shards whose hash is unchanged are left untouched and
+    shards no longer referenced are removed. `schedule_path` (the mapped
+    schedule) is recorded so republish_shards() can rebuild from it.
+    """
+    shards, index = build_shards(schedule_data, channels_by_id)
+    if schedule_path:
+        index["schedule_source"] = os.path.relpath(os.path.abspath(schedule_path), os.path.abspath(publish_dir))
+    else:
+        previous_source = _load_json_file(os.path.join(publish_dir, SHARD_INDEX_FILE_NAME)).get("schedule_source")
+        if previous_source:
+            index["schedule_source"] = previous_source
+    previous = _load_json_file(os.path.join(publish_dir, SHARD_INDEX_FILE_NAME))
+    previous_hashes = {path: info.get("sha256") for path, info in (previous.get("files") or {}).items()}
+
+    files: Dict[str, Dict[str, object]] = {}
+    written = 0
+    for rel_path, payload in shards.items():
+        body = minify_json(payload)
+        files[rel_path] = {"sha256": content_hash(body), "bytes": len(body)}
+        full_path = os.path.join(publish_dir, rel_path)
+        if previous_hashes.get(rel_path) == files[rel_path]["sha256"] and os.path.exists(full_path):
+            continue
+        write_bytes_atomic(full_path, body)
+        written += 1
+
+    removed = 0
+    for folder in SHARD_FOLDERS:
+        directory = os.path.join(publish_dir, folder)
+        if not os.path.isdir(directory):
+            continue
+        for file_name in os.listdir(directory):
+            rel_path = f"{folder}/{file_name}"
+            if file_name.endswith(".json") and rel_path not in files:
+                os.remove(os.path.join(directory, file_name))
+                removed += 1
+
+    index["files"] = files
+    text = json.dumps(index, indent=2, ensure_ascii=False, sort_keys=True) + "\n"
+    write_bytes_atomic(os.path.join(publish_dir, SHARD_INDEX_FILE_NAME), text.encode("utf-8"))
+    index["stats"] = {"shards": len(files), "written": written, "removed": removed}
+    return index
+
+
+def republish_shards(channels_path: str, channels_payload: Dict, publish_dir: Optional[str] = None) -> Optional[Dict]:
+    """
+    Rebuild the sharded export next to a freshly written channels.json, so day
+    and channel shards never keep stream URLs the testers have pruned. Does
+    nothing until map_channels --sharded has published an index there.
+    """
+    publish_dir = publish_dir or default_publish_dir(channels_path)
+    source = _load_json_file(os.path.join(publish_dir, SHARD_INDEX_FILE_NAME)).get("schedule_source")
+    if not source:
+        return None
+    schedule_path = os.path.join(publish_dir, source)
+    schedule_data = _load_json_file(schedule_path)
+    if not isinstance(schedule_data.get("schedule"), list):
+        return None
+    channels = channels_payload.get("channels") if isinstance(channels_payload, dict) else None
+    return publish_shards(
+        publish_dir,
+        schedule_data,
+        shard_channels(schedule_data, channels if isinstance(channels, dict) else {}),
+        schedule_path=schedule_path,
+    )
@@ -20,6 +20,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
+import stream_health_rollup
+from channel_store import ChannelStore
 
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -28,6 +30,8 @@ DEFAULT_USER_AGENT = (
 )
 QUALITY_ORDER = ["4K", "FHD", "HD", "SD"]
 POLICY_VERSION = "best-stream-v1"
+# Channel fields written by a ranking run, in the order they are first assigned.
+RANKER_FIELDS = ("primary", "backups", "reserve", "qualities", "candidates", "stream_selection")
 
 
 def utc_now_iso() -> str:
@@ -45,11 +49,6 @@ def load_json(path: str):
         return json.load(handle)
 
 
-def save_json(path: str, payload) -> None:
-    with open(path, "w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2, ensure_ascii=False)
-
-
 def url_hash(url: str) -> str:
     return hashlib.sha1(url.encode("utf-8")).hexdigest()
 
@@ -184,34 +183,8 @@ def iter_channel_urls(channel_node: Dict) -> List[Tuple[str, str]]:
     return out
 
 
-def load_history(log_file: str, days: int) -> Dict[str, Dict[str, object]]:
-    out: Dict[str, Dict[str, object]] = {}
-    if not log_file or not os.path.exists(log_file):
-        return out
-    cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=max(1, days))
-    with open(log_file, "r", encoding="utf-8") as handle:
-        for raw_line in handle:
-            line = raw_line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-            except Exception:
-                continue
-            if not isinstance(event, dict):
-                continue
-            h = normalize_text(event.get("url_hash"))
-            if not h:
-                continue
-            tested_at = parse_iso_datetime(event.get("tested_at"))
-            if tested_at is None or tested_at < cutoff:
-                continue
-            node = out.setdefault(h, {"tested": 0, "ok": 0, "last_ok_at": None})
-            node["tested"] = int(node.get("tested", 0)) + 1
-            if bool(event.get("ok")):
-                node["ok"] = int(node.get("ok", 0)) + 1
-                node["last_ok_at"] = tested_at.isoformat().replace("+00:00", "Z")
-    return out
+def load_history(log_file: str, days: int, store_path: Optional[str] = None) -> Dict[str, Dict[str, object]]:
+    return stream_health_rollup.load_history(log_file, days, store_path=store_path)
 
 
 def ffprobe_probe(ffprobe_bin: str, url: str, timeout: int, user_agent: str) -> Tuple[bool, Dict, str, int]:
@@ -581,6 +554,16 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--continuity-seconds", type=int, default=10, help="ffmpeg continuity sample seconds")
     parser.add_argument("--disable-continuity", action="store_true", help="disable ffmpeg continuity checks")
     parser.add_argument("--history-days", type=int, default=14, help="history window for availability score")
+    parser.add_argument(
+        "--history-store",
+        default=stream_health_rollup.DEFAULT_STORE_PATH,
+        help="daily rollup store the log is compacted into before ranking (empty: read the raw log only)",
+    )
+    parser.add_argument(
+        "--history-archive-dir",
+        default=stream_health_rollup.DEFAULT_ARCHIVE_DIR,
+        help="gzip archive directory for compacted log lines",
+    )
     parser.add_argument("--max-candidates-per-channel", type=int, default=40, help="candidate cap per channel")
     parser.add_argument("--max-candidates-output", type=int, default=10, help="stored candidate entries per channel")
     parser.add_argument("--max-backups", type=int, default=2, help="backup entries per channel")
@@ -590,14 +573,23 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--ffprobe-bin", default="ffprobe", help="ffprobe binary path")
     parser.add_argument("--ffmpeg-bin", default="ffmpeg", help="ffmpeg binary path")
     parser.add_argument("--user-agent", default=DEFAULT_USER_AGENT, help="User-Agent for ffprobe/ffmpeg")
+    parser.add_argument(
+        "--channel-store",
+        default=None,
+        help="SQLite channel store backing --channels-file (default: next to it, .sqlite).",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    channels_db = load_json(args.channels_file)
-    channels_node = channels_db.get("channels", {}) if isinstance(channels_db, dict) else {}
-    if not isinstance(channels_node, dict) or not channels_node:
+    with ChannelStore.open_synced(args.channels_file, args.channel_store) as store:
+        return rank_channels(args, store)
+
+
+def rank_channels(args: argparse.Namespace, store: ChannelStore) -> int:
+    existing_names = store.channel_names()
+    if not existing_names:
         print(f"No channels found in {args.channels_file}.")
         return 1
 
@@ -610,20 +602,24 @@ def main() -> int:
         print("ffmpeg not found; continuity checks disabled.")
 
     if args.all_channels:
-        target_names = list(channels_node.keys())
+        target_names = list(existing_names)
     else:
         target_names = load_targets_from_schedule(args.schedule_file)
     if not target_names:
         print("No target channels found. Nothing to rank.")
         return 0
 
-    existing_names = list(channels_node.keys())
-    candidates: List[Dict[str, str]] = []
-    by_channel_hints: Dict[str, Dict[str, str]] = {}
+    canonical_names: List[str] = []
     for target_name in target_names:
         canonical = match_channel_name(existing_names, target_name)
-        if not canonical:
-            continue
+        if canonical:
+            canonical_names.append(canonical)
+    # Only the targeted channels are loaded from (and later written back to) the store.
+    channels_node = store.get_channels(canonical_names)
+
+    candidates: List[Dict[str, str]] = []
+    by_channel_hints: Dict[str, Dict[str, str]] = {}
+    for canonical in canonical_names:
         node = channels_node.get(canonical)
         if not isinstance(node, dict):
             continue
@@ -647,7 +643,14 @@ def main() -> int:
         print("No stream candidates found.")
         return 0
 
-    history = load_history(args.log_file, days=max(1, args.history_days))
+    if args.history_store:
+        with stream_health_rollup.HealthRollupStore(args.history_store) as rollups:
+            compacted = rollups.compact_log(args.log_file, args.history_archive_dir)
+        print(
+            f"[RANK] history compacted lines={compacted['events']} rollups={compacted['rollups']} "
+            f"archived={compacted['archived']}"
+        )
+    history = load_history(args.log_file, days=max(1, args.history_days), store_path=args.history_store)
     run_id = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     print(f"[RANK] run={run_id} channels={len(by_channel_hints)} candidates={len(candidates)}")
 
@@ -769,8 +772,7 @@ def main() -> int:
 
     append_jsonl(args.log_file, log_rows)
 
-    metadata = channels_db.setdefault("metadata", {})
-    metadata["best_stream_ranker"] = {
+    ranker_meta = {
         "policy_version": POLICY_VERSION,
         "run_id": run_id,
         "ranked_at": utc_now_iso(),
@@ -783,8 +785,19 @@ def main() -> int:
         "continuity_seconds": max(4, args.continuity_seconds),
         "history_days": max(1, args.history_days),
         "log_file": args.log_file,
+        "history_store": args.history_store or None,
     }
-    save_json(args.channels_file, channels_db)
+    with store.transaction():
+        for channel_name in by_channel_results:
+            node = channels_node.get(channel_name)
+            if not isinstance(node, dict):
+                continue
+            store.update_channel(
+                channel_name,
+                **{key: node[key] for key in RANKER_FIELDS if key in node},
+            )
+        store.set_metadata({"best_stream_ranker": ranker_meta})
+    store.export_json(args.channels_file)
 
     print(
         f"[RANK] done run={run_id} channels={len(by_channel_results)} "
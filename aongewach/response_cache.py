@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""On-disk conditional-GET cache for playlist and Xtream API responses."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+INDEX_FILE_NAME = "index.json"
+BODY_SUFFIX = ".body.gz"
+PARSED_SUFFIX = ".parsed.json.gz"
+STREAM_CHUNK_BYTES = 256 * 1024
+
+
+def url_cache_key(url: str) -> str:
+    # Xtream URLs embed credentials, so only the digest is ever written to disk.
+    return hashlib.sha1(str(url or "").strip().encode("utf-8")).hexdigest()
+
+
+def content_digest(body: bytes) -> str:
+    return hashlib.sha256(body or b"").hexdigest()
+
+
+class ResponseCache:
+    """
+    Compressed response store keyed by URL.
+
+    Each entry keeps the response validators (ETag / Last-Modified), a content
+    hash, the gzip-compressed body and optionally a parsed payload derived from
+    that exact body. Total on-disk size is bounded with LRU eviction.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, int(max_bytes))
+        self.index_path = os.path.join(cache_dir, INDEX_FILE_NAME)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {
+            "hits_not_modified": 0,
+            "hits_unchanged": 0,
+            "misses": 0,
+            "parsed_reused": 0,
+            "evicted": 0,
+        }
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as handle:
+                loaded = json.load(handle)
+        except Exception:
+            # A corrupt index only costs one full refetch.
+            return
+        entries = loaded.get("entries") if isinstance(loaded, dict) else None
+        if isinstance(entries, dict):
+            self.entries = {key: node for key, node in entries.items() if isinstance(node, dict)}
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _entry_size(self, entry: Dict) -> int:
+        return int(entry.get("body_bytes") or 0) + int(entry.get("parsed_bytes") or 0)
+
+    def _remove_files(self, key: str) -> None:
+        for suffix in (BODY_SUFFIX, PARSED_SUFFIX):
+            try:
+                os.remove(self._path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _evict_locked(self) -> None:
+        if self.max_bytes <= 0:
+            return
+        total = sum(self._entry_size(entry) for entry in self.entries.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.entries, key=lambda k: float(self.entries[k].get("last_access") or 0.0)):
+            if total <= self.max_bytes:
+                break
+            total -= self._entry_size(self.entries[key])
+            self._remove_files(key)
+            del self.entries[key]
+            self.stats["evicted"] += 1
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        with self.lock:
+            entry = self.entries.get(url_cache_key(url))
+            return dict(entry) if entry else None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        entry = self.lookup(url)
+        headers: Dict[str, str] = {}
+        if not entry or not os.path.exists(self._path(url_cache_key(url), BODY_SUFFIX)):
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, url: str) -> None:
+        with self.lock:
+            entry = self.entries.get(url_cache_key(url))
+            if entry:
+                entry["last_access"] = time.time()
+
+    def mark_validated(self, url: str) -> None:
+        """Record that the origin just confirmed the cached body (304)."""
+        with self.lock:
+            entry = self.entries.get(url_cache_key(url))
+            if entry:
+                entry["validated_at"] = time.time()
+
+    def age_seconds(self, url: str, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the cached body was last fetched or revalidated, or None if not cached."""
+        entry = self.lookup(url)
+        if not entry:
+            return None
+        checked = max(float(entry.get("fetched_at") or 0.0), float(entry.get("validated_at") or 0.0))
+        return max(0.0, (time.time() if now is None else now) - checked)
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        path = self._path(url_cache_key(url), BODY_SUFFIX)
+        try:
+            with gzip.open(path, "rb") as handle:
+                return handle.read()
+        except (OSError, EOFError):
+            return None
+
+    def store(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> str:
+        """Persist a fresh 200 response and return its content hash."""
+        key = url_cache_key(url)
+        digest = content_digest(body)
+        path = self._path(key, BODY_SUFFIX)
+        with self.lock:
+            previous = self.entries.get(key) or {}
+            if previous.get("content_hash") != digest or not os.path.exists(path):
+                with gzip.open(path, "wb", compresslevel=6) as handle:
+                    handle.write(body)
+            self._commit_entry_locked(key, previous, digest, etag, last_modified)
+        return digest
+
+    def store_stream(
+        self,
+        url: str,
+        chunks: Iterable[bytes],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Tuple[Iterator[bytes], Callable[..., str]]:
+        """
+        Tee a streamed body into the cache while the caller consumes it.
+
+        Returns (chunk_iterator, finish). Call finish() after the iterator is
+        exhausted to commit the entry (it returns the content hash), or
+        finish(commit=False) to discard a partial body.
+        """
+        key = url_cache_key(url)
+        tmp_path = self._path(key, BODY_SUFFIX + ".part")
+        hasher = hashlib.sha256()
+        handle = gzip.open(tmp_path, "wb", compresslevel=6)
+
+        def _tee() -> Iterator[bytes]:
+            try:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    hasher.update(chunk)
+                    handle.write(chunk)
+                    yield chunk
+            finally:
+                handle.close()
+
+        def _finish(commit: bool = True) -> str:
+            handle.close()
+            digest = hasher.hexdigest()
+            if not commit:
+                try:
+                    os.remove(tmp_path)
+                except FileNotFoundError:
+                    pass
+                return digest
+            with self.lock:
+                previous = self.entries.get(key) or {}
+                os.replace(tmp_path, self._path(key, BODY_SUFFIX))
+                self._commit_entry_locked(key, previous, digest, etag, last_modified)
+            return digest
+
+        return _tee(), _finish
+
+    def _commit_entry_locked(
+        self,
+        key: str,
+        previous: Dict,
+        digest: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        path = self._path(key, BODY_SUFFIX)
+        body_bytes = os.path.getsize(path) if os.path.exists(path) else 0
+        entry = {
+            "etag": (etag or "").strip() or None,
+            "last_modified": (last_modified or "").strip() or None,
+            "content_hash": digest,
+            "body_bytes": body_bytes,
+            "fetched_at": time.time(),
+            "validated_at": time.time(),
+            "last_access": time.time(),
+        }
+        if previous.get("parsed_hash") == digest:
+            entry["parsed_hash"] = digest
+            entry["parsed_bytes"] = previous.get("parsed_bytes", 0)
+        else:
+            try:
+                os.remove(self._path(key, PARSED_SUFFIX))
+            except FileNotFoundError:
+                pass
+        self.entries[key] = entry
+        self._evict_locked()
+
+    def load_parsed(self, url: str, content_hash: str):
+        key = url_cache_key(url)
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry or entry.get("parsed_hash") != content_hash:
+                return None
+        try:
+            with gzip.open(self._path(key, PARSED_SUFFIX), "rt", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, EOFError, ValueError):
+            return None
+        with self.lock:
+            self.stats["parsed_reused"] += 1
+        return payload
+
+    def store_parsed(self, url: str, content_hash: str, payload) -> None:
+        key = url_cache_key(url)
+        path = self._path(key, PARSED_SUFFIX)
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry or entry.get("content_hash") != content_hash:
+                return
+            with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as handle:
+                json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+            entry["parsed_hash"] = content_hash
+            entry["parsed_bytes"] = os.path.getsize(path)
+            self._evict_locked()
+
+    def save(self) -> None:
+        with self.lock:
+            payload = {"version": 1, "entries": self.entries}
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+
+
+def fetch_with_cache(
+    url: str,
+    parse: Callable[[bytes], object],
+    cache: Optional[ResponseCache] = None,
+    http_get: Optional[Callable] = None,
+    timeout: float = 30,
+    headers: Optional[Dict[str, str]] = None,
+    stream_parse: Optional[Callable[[Iterable[bytes]], object]] = None,
+) -> Tuple[object, str]:
+    """
+    GET `url` and return (parsed_payload, cache_status).
+
+    cache_status is one of:
+      - "not-modified": server answered 304, cached payload reused
+      - "unchanged":    body hash matched the cached copy, parse skipped
+                        (streamed bodies are parsed while downloading, so only
+                        the cached parse is reused)
+      - "fetched":      new or changed payload, parsed from the fresh body
+    Without a cache this is a plain GET + parse.
+
+    With `stream_parse` the body is never held in memory: chunks are fed to the
+    parser straight off the socket while being hashed and written to the cache.
+    """
+    if stream_parse is not None:
+        return _fetch_streamed(url, stream_parse, cache, http_get, timeout, headers)
+
+    if http_get is None:
+        import requests
+
+        http_get = requests.get
+
+    request_headers = dict(headers or {})
+    entry = cache.lookup(url) if cache else None
+    if cache:
+        request_headers.update(cache.conditional_headers(url))
+
+    response = http_get(url, timeout=timeout, headers=request_headers)
+    if response.status_code == 304 and cache and entry:
+        cached = cache.load_parsed(url, entry.get("content_hash", ""))
+        if cached is None:
+            body = cache.load_body(url)
+            if body is not None:
+                cached = parse(body)
+                cache.store_parsed(url, entry.get("content_hash", ""), cached)
+        if cached is not None:
+            cache.touch(url)
+            cache.mark_validated(url)
+            with cache.lock:
+                cache.stats["hits_not_modified"] += 1
+            return cached, "not-modified"
+        # Cached body vanished; fall back to an unconditional fetch.
+        response = http_get(url, timeout=timeout, headers=dict(headers or {}))
+
+    response.raise_for_status()
+    body = response.content or b""
+    if not cache:
+        return parse(body), "fetched"
+
+    digest = cache.store(
+        url,
+        body,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    if entry and entry.get("content_hash") == digest:
+        cached = cache.load_parsed(url, digest)
+        if cached is not None:
+            with cache.lock:
+                cache.stats["hits_unchanged"] += 1
+            return cached, "unchanged"
+
+    with cache.lock:
+        cache.stats["misses"] += 1
+    parsed = parse(body)
+    cache.store_parsed(url, digest, parsed)
+    return parsed, "fetched"
+
+
+def _fetch_streamed(
+    url: str,
+    stream_parse: Callable[[Iterable[bytes]], object],
+    cache: Optional[ResponseCache],
+    http_get: Optional[Callable],
+    timeout: float,
+    headers: Optional[Dict[str, str]],
+) -> Tuple[object, str]:
+    if http_get is None:
+        import requests
+
+        http_get = requests.get
+
+    request_headers = dict(headers or {})
+    entry = cache.lookup(url) if cache else None
+    if cache:
+        request_headers.update(cache.conditional_headers(url))
+
+    response = http_get(url, timeout=timeout, headers=request_headers, stream=True)
+    try:
+        if response.status_code == 304 and cache and entry:
+            digest = entry.get("content_hash", "")
+            cached = cache.load_parsed(url, digest)
+            if cached is None:
+                body = cache.load_body(url)
+                if body is not None:
+                    cached = stream_parse([body])
+                    cache.store_parsed(url, digest, cached)
+            if cached is not None:
+                cache.touch(url)
+                cache.mark_validated(url)
+                with cache.lock:
+                    cache.stats["hits_not_modified"] += 1
+                return cached, "not-modified"
+            response.close()
+            response = http_get(url, timeout=timeout, headers=dict(headers or {}), stream=True)
+
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=STREAM_CHUNK_BYTES)
+        if not cache:
+            return stream_parse(chunks), "fetched"
+
+        tee, finish = cache.store_stream(
+            url,
+            chunks,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        try:
+            parsed = stream_parse(tee)
+            for _ in tee:
+                pass  # hash and store any trailing bytes the parser did not need
+        except Exception:
+            finish(commit=False)
+            raise
+        digest = finish()
+    finally:
+        response.close()
+
+    status = "fetched"
+    if entry and entry.get("content_hash") == digest:
+        status = "unchanged"
+        with cache.lock:
+            cache.stats["hits_unchanged"] += 1
+    else:
+        with cache.lock:
+            cache.stats["misses"] += 1
+    if not (entry and entry.get("parsed_hash") == digest):
+        cache.store_parsed(url, digest, parsed)
+    return parsed, status
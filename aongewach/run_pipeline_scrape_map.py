@@ -129,6 +129,11 @@ def parse_args() -> argparse.Namespace:
         default=0,
         help="Legacy compatibility option (unused after LiveSportTV retirement).",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse stored FANZO/Flashscore days that are still fresh for their distance from today.",
+    )
     parser.add_argument(
         "--schedule-output",
         default="weekly_schedule.json",
@@ -176,6 +181,9 @@ def main() -> int:
         "--output-csv",
         flashscore_csv_output,
     ]
+    if args.incremental:
+        fanzo_args.append("--incremental")
+        flashscore_args.append("--incremental")
     if args.date:
         try:
             target_date = dt.datetime.strptime(args.date, "%Y-%m-%d").date()
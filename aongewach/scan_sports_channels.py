@@ -11,23 +11,54 @@ import argparse
 import sys
 import shutil
 import subprocess
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 from urllib.parse import urlparse, parse_qs
 from collections import defaultdict
 from difflib import SequenceMatcher
 import concurrent.futures
+import multiprocessing
+import xml.etree.ElementTree as ET
 import time
 import zlib
 import os
 import threading
 
 from channel_name_placeholders import is_placeholder_channel_name
+from http_client import PooledHttpClient, shared_client
+from json_stream import iter_json_array
+from channel_store import ChannelStore
+from playlist_snapshots import (
+    DECISION_FULL,
+    DECISION_REVALIDATE,
+    DECISION_SKIP_DEAD,
+    DECISION_TRUST,
+    DEFAULT_DEAD_RETRY_HOURS,
+    DEFAULT_REVALIDATE_HOURS,
+    DEFAULT_TRUST_HOURS,
+    FreshnessPolicy,
+    PlaylistSnapshotStore,
+    compact_hash,
+    pair_key,
+)
+from response_cache import DEFAULT_MAX_CACHE_BYTES, ResponseCache, fetch_with_cache
+from server_yield import (
+    DEFAULT_FAILED_RETRY_DAYS,
+    DEFAULT_SKIP_AFTER_FAILURES,
+    DEFAULT_ZERO_YIELD_RUNS,
+    ServerYieldStore,
+    YieldPolicy,
+)
+from xmltv_epg import DEFAULT_EPG_HORIZON_HOURS, EpgGuide, Fixture, load_schedule_fixtures
 
 # Configuration
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SCHEDULE_FILE = os.path.join(SCRIPT_DIR, 'weekly_schedule.json')
 LOVESTORY_FILE = os.path.join(SCRIPT_DIR, '..', 'lovestory.json')
 EXTERNAL_PLAYLISTS_FILE = os.path.join(SCRIPT_DIR, '..', 'external_playlists.txt')
+SCAN_CACHE_DIR = os.path.join(SCRIPT_DIR, '.scan_cache')
+HTTP_CACHE_DIR = os.path.join(SCAN_CACHE_DIR, 'http')
+SNAPSHOT_FILE = os.path.join(SCAN_CACHE_DIR, 'playlist_snapshots.json.gz')
+SERVER_YIELD_FILE = os.path.join(SCAN_CACHE_DIR, 'server_yield.json')
 MAX_STREAMS_PER_CHANNEL = 5
 QUALITY_PRIORITY = ['4K', 'FHD', 'HD', 'SD']
 TEST_TIMEOUT_SECONDS = 8
@@ -35,6 +66,13 @@ TEST_RETRY_FAILED = 1
 TEST_RETRY_DELAY_SECONDS = 0.35
 TEST_FFMPEG_FALLBACK = True
 TEST_WORKERS = 20
+# Category-filtered Xtream fetch (--category-filter): only these categories are pulled.
+DEFAULT_CATEGORY_KEYWORDS = ('sport*', 'uk', 'bein*', 'dazn*', 'espn*', 'tnt*')
+DEFAULT_CATEGORY_EXCLUDE_KEYWORDS = ('vod', 'movie*', 'series', 'replay*', 'radio', 'adult*', 'xxx')
+DEFAULT_CATEGORY_WORKERS = 4
+# Playlists at or above this many entries are matched across a process pool (0 disables).
+DEFAULT_PARALLEL_MATCH_THRESHOLD = 150000
+DEFAULT_MATCH_WORKERS = max(1, min(8, os.cpu_count() or 1))
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -332,6 +370,87 @@ def safe_int(value, default: int = 0) -> int:
     except (TypeError, ValueError):
         return default
 
+def parse_m3u_streams(text: str) -> List[Dict]:
+    """Parse live M3U entries into {name, url, logo?, group_title?} dicts."""
+    parsed_streams = []
+    current_info = {}
+
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('#EXTINF:'):
+            current_info = {}
+            # Extract Logo
+            logo_match = re.search(r'tvg-logo="([^"]*)"', line)
+            if logo_match:
+                current_info['logo'] = logo_match.group(1)
+
+            # Extract Name
+            name_match = re.search(r',([^,]*)$', line)
+            if name_match:
+                current_info['name'] = name_match.group(1).strip()
+
+            group_title = ""
+            group_match = GROUP_TITLE_RE.search(line)
+            if group_match:
+                group_title = group_match.group(1).strip()
+                if group_title:
+                    current_info['group_title'] = group_title
+
+            if is_non_live_m3u_entry(
+                group_title=group_title,
+                channel_name=current_info.get('name', ''),
+                url="",
+            ):
+                current_info = {}
+                continue
+
+        elif not line.startswith('#'):
+            # It's a URL
+            if 'name' in current_info:
+                if is_non_live_m3u_entry(
+                    group_title=current_info.get('group_title', ''),
+                    channel_name=current_info.get('name', ''),
+                    url=line,
+                ):
+                    current_info = {}
+                    continue
+                current_info['url'] = line
+                parsed_streams.append(current_info)
+                current_info = {} # Reset
+
+    return parsed_streams
+
+
+def _decode_m3u_body(body: bytes) -> List[Dict]:
+    return parse_m3u_streams(body.decode('utf-8', errors='replace'))
+
+
+def _decode_json_list(body: bytes) -> List:
+    data = json.loads(body.decode('utf-8', errors='replace') or 'null')
+    return data if isinstance(data, list) else []
+
+
+# (name, stream_id, stream_icon, epg_channel_id) - the only get_live_streams fields the scanner reads.
+CompactStream = Tuple[str, object, Optional[str], str]
+
+
+def decode_live_stream_chunks(chunks: Iterable[bytes]) -> List[CompactStream]:
+    """Stream-decode a get_live_streams array into compact rows without materializing the full list."""
+    compact: List[CompactStream] = []
+    for item in iter_json_array(chunks):
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get('name') or '').strip()
+        stream_id = item.get('stream_id')
+        if not name or not stream_id:
+            continue
+        compact.append((name, stream_id, item.get('stream_icon') or None, str(item.get('epg_channel_id') or '').strip()))
+    return compact
+
+
 def load_external_servers(file_path: str) -> List[Dict]:
     """Load direct/API playlist URLs from a plain-text file in repo root.
 
@@ -456,10 +575,71 @@ def load_scan_servers(external_file_path: str, lovestory_file_path: str) -> List
     )
     return servers
 
+class CategoryFilter:
+    """
+    Keyword rules for Xtream category selection.
+
+    Keywords match whole words of the category name, case-insensitively;
+    a trailing `*` turns a keyword into a word-prefix match (`sport*` also
+    matches "Sports" and "SportsNet"). Exclusions win over inclusions.
+    """
+
+    def __init__(
+        self,
+        include: Iterable[str] = DEFAULT_CATEGORY_KEYWORDS,
+        exclude: Iterable[str] = DEFAULT_CATEGORY_EXCLUDE_KEYWORDS,
+    ):
+        self.include = self._compile(include)
+        self.exclude = self._compile(exclude)
+
+    @staticmethod
+    def _compile(keywords: Iterable[str]) -> Optional[re.Pattern]:
+        parts = []
+        for keyword in keywords:
+            keyword = (keyword or '').strip().lower()
+            if not keyword:
+                continue
+            if keyword.endswith('*'):
+                parts.append(re.escape(keyword.rstrip('*')))
+            else:
+                parts.append(re.escape(keyword) + r"(?![a-z0-9])")
+        if not parts:
+            return None
+        return re.compile(r"(?<![a-z0-9])(?:" + "|".join(parts) + ")", re.IGNORECASE)
+
+    def matches(self, category_name: str) -> bool:
+        name = (category_name or '').strip()
+        if not name or not self.include or not self.include.search(name):
+            return False
+        return not (self.exclude and self.exclude.search(name))
+
+    def select(self, categories: List[Dict]) -> List[str]:
+        """Return ids of matching categories in panel order."""
+        selected = []
+        seen = set()
+        for category in categories:
+            category_id = str(category.get('category_id') or '').strip()
+            if not category_id or category_id in seen:
+                continue
+            if self.matches(str(category.get('category_name') or '')):
+                seen.add(category_id)
+                selected.append(category_id)
+        return selected
+
+
+def parse_keyword_list(value: str) -> List[str]:
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+
 class XtreamAPI:
     """Xtream Codes API client."""
     
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        response_cache: Optional[ResponseCache] = None,
+        http_client: Optional[PooledHttpClient] = None,
+    ):
         """Parse credentials from M3U URL."""
         parsed = urlparse(url)
         
@@ -485,36 +665,85 @@ class XtreamAPI:
         scheme = parsed.scheme if parsed.scheme else "http"
         self.base_url = f"{scheme}://{parsed.netloc}"
         self.timeout = 30
+        self.response_cache = response_cache
+        self.http_get = (http_client or shared_client()).get
+        self.last_cache_status = None
+        self._live_categories: Optional[List[Dict]] = None
     
-    def _api_call(self, action: str, **params) -> Optional[List[Dict]]:
-        """Make API call."""
+    def _api_call(self, action: str, stream_parse=None, **params) -> Optional[List]:
+        """Make API call; `stream_parse` decodes the body incrementally off the socket."""
+        data, self.last_cache_status = self._api_call_with_status(action, stream_parse=stream_parse, **params)
+        return data
+
+    def _api_call_with_status(self, action: str, stream_parse=None, **params) -> Tuple[Optional[List], Optional[str]]:
+        """Thread-safe variant of `_api_call` returning (data, cache_status)."""
         if not self.username or not self.password:
-            return None
+            return None, None
 
         url = f"{self.base_url}/player_api.php?username={self.username}&password={self.password}&action={action}"
         for key, value in params.items():
             url += f"&{key}={value}"
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            return data if isinstance(data, list) else []
+            return fetch_with_cache(
+                url,
+                parse=_decode_json_list,
+                cache=self.response_cache,
+                http_get=self.http_get,
+                timeout=self.timeout,
+                stream_parse=stream_parse,
+            )
         except Exception as e:
             # print(f"API Call Failed ({action}): {e}")
-            return None
+            return None, None
     
     def get_live_categories(self) -> List[Dict]:
-        """Get all live categories."""
-        result = self._api_call('get_live_categories')
-        return result if result is not None else []
+        """Get all live categories (fetched once per client; the response cache covers later runs)."""
+        if self._live_categories is None:
+            result = self._api_call('get_live_categories')
+            self._live_categories = [row for row in (result or []) if isinstance(row, dict)]
+        return self._live_categories
     
-    def get_live_streams(self, category_id: Optional[int] = None) -> List[Dict]:
-        """Get live streams, optionally filtered by category."""
+    def get_live_streams(self, category_id: Optional[int] = None) -> List[CompactStream]:
+        """Get live streams as compact (name, stream_id, stream_icon, epg_channel_id) rows, optionally filtered by category."""
         params = {'category_id': category_id} if category_id else {}
-        result = self._api_call('get_live_streams', **params)
+        result = self._api_call('get_live_streams', stream_parse=decode_live_stream_chunks, **params)
         return result if result is not None else []
     
+    def get_live_streams_for_categories(
+        self,
+        category_ids: List[str],
+        workers: int = DEFAULT_CATEGORY_WORKERS,
+    ) -> Tuple[List[CompactStream], List[Optional[str]]]:
+        """Fetch several categories concurrently; rows keep category order and are de-duplicated by stream_id."""
+        if not category_ids:
+            return [], []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(int(workers), len(category_ids)))) as executor:
+            results = list(
+                executor.map(
+                    lambda category_id: self._api_call_with_status(
+                        'get_live_streams', stream_parse=decode_live_stream_chunks, category_id=category_id
+                    ),
+                    category_ids,
+                )
+            )
+        rows: List[CompactStream] = []
+        seen_ids = set()
+        statuses: List[Optional[str]] = []
+        for data, status in results:
+            statuses.append(status)
+            for row in data or []:
+                if row[1] in seen_ids:
+                    continue
+                seen_ids.add(row[1])
+                rows.append(row)
+        return rows, statuses
+
+    def get_xmltv_url(self) -> str:
+        if not self.username or not self.password:
+            return ""
+        return f"{self.base_url}/xmltv.php?username={self.username}&password={self.password}"
+
     def get_stream_url(self, stream_id: int) -> str:
         """Build stream URL."""
         # Xtream codes usually exposes live streams at /live/username/password/stream_id.ts
@@ -611,35 +840,11 @@ class ChannelNormalizer:
         return best_match if best_score >= self.similarity_threshold else None
 
 
-class SportsScanner:
-    """Main scanner class."""
-    
-    def __init__(
-        self,
-        target_channels: List[str],
-        max_streams_per_channel: int = MAX_STREAMS_PER_CHANNEL,
-        test_timeout: int = TEST_TIMEOUT_SECONDS,
-        test_retry_failed: int = TEST_RETRY_FAILED,
-        test_retry_delay: float = TEST_RETRY_DELAY_SECONDS,
-        allow_ffmpeg_fallback: bool = TEST_FFMPEG_FALLBACK,
-        test_workers: int = TEST_WORKERS,
-        test_user_agent: str = DEFAULT_USER_AGENT,
-        preserve_existing_streams: bool = False,
-        existing_channels: Optional[Dict[str, Dict]] = None,
-    ):
-        """Initialize scanner with target channels."""
-        # Normalize targets for matching while preserving stable display names.
-        self.target_display_names = {}
-        for name in target_channels:
-            if not name:
-                continue
-            cleaned = name.strip()
-            if not cleaned:
-                continue
-            key = cleaned.lower()
-            if key not in self.target_display_names:
-                self.target_display_names[key] = cleaned
-        self.targets = list(self.target_display_names.keys())
+class TargetMatcher:
+    """Compiled target-name index (boundary regexes, match tokens, trigram anchors)."""
+
+    def __init__(self, targets: List[str]):
+        self.targets = list(targets)
         self.total_targets = len(self.targets)
         self.use_indexed_target_match = self.total_targets > 128
 
@@ -661,62 +866,9 @@ class SportsScanner:
         self.short_target_indices = tuple()
         self.anchor_to_target_indices = {}
         if self.use_indexed_target_match:
-            self._build_target_match_index()
-
-        # Channel storage: {original_target_name: {qualities: {quality: set()}, logo: str}}
-        self.channels = defaultdict(lambda: {'qualities': defaultdict(set), 'logo': None})
-        self.channel_urls = defaultdict(set)
-        self.channel_domains = defaultdict(set)
-        self.channel_quality_domains = defaultdict(lambda: defaultdict(set))
-        self.channel_ids = {}
-        self.normalizer = ChannelNormalizer(0)
-        self.max_streams_per_channel = max(1, int(max_streams_per_channel))
-        self.test_timeout = max(1, int(test_timeout))
-        self.test_retry_failed = max(0, int(test_retry_failed))
-        self.test_retry_delay = max(0.0, float(test_retry_delay))
-        self.test_workers = max(1, int(test_workers))
-        self.test_user_agent = test_user_agent
-        self.preserve_existing_streams = bool(preserve_existing_streams)
-        self.lock = threading.Lock()
-        self.url_test_cache: Dict[str, bool] = {}
-        self.completed_targets = set()
-        self.ffprobe_bin = shutil.which('ffprobe')
-        self.ffmpeg_bin = shutil.which('ffmpeg')
-        self.allow_ffmpeg_fallback = bool(allow_ffmpeg_fallback and self.ffmpeg_bin)
-
-        if not self.ffprobe_bin:
-            raise RuntimeError("ffprobe not found in PATH. Install ffmpeg/ffprobe before scanning.")
-        if allow_ffmpeg_fallback and not self.ffmpeg_bin:
-            print("Warning: ffmpeg not found; proceeding with ffprobe-only stream validation.", flush=True)
-        
-        # Stats
-        self.stats = {
-            'servers_total': 0,
-            'servers_success': 0,
-            'servers_failed': 0,
-            'categories_total': 0,
-            'streams_total': 0,
-            'channels_added': 0,
-            'streams_skipped_cap': 0,
-            'channels_trimmed_to_cap': 0,
-            'streams_trimmed_to_cap': 0,
-            'streams_tested': 0,
-            'streams_alive': 0,
-            'streams_dead': 0,
-            'streams_cached': 0,
-            'channels_completed': 0,
-            'channels_refreshed_from_tested_streams': 0,
-            'channels_cleared_no_working_streams': 0,
-            'channels_seeded_from_existing': 0,
-            'streams_seeded_from_existing': 0,
-            'streams_skipped_non_live_url': 0,
-            'channels_pruned_non_target': 0,
-        }
+            self._build_index()
 
-        if self.preserve_existing_streams:
-            self._seed_existing_channels(existing_channels or {})
-
-    def _build_target_match_index(self) -> None:
+    def _build_index(self) -> None:
         """Build a compact substring prefilter index for fast candidate selection."""
         gram_frequency = defaultdict(int)
         target_grams: List[Optional[set]] = []
@@ -747,14 +899,7 @@ class SportsScanner:
             for anchor, indices in anchor_map.items()
         }
 
-    def _get_channel_id(self, name: str) -> int:
-        """Get or create STABLE channel ID (Hash of name)."""
-        if name not in self.channel_ids:
-            val = zlib.adler32(name.encode('utf-8')) & 0xffffffff
-            self.channel_ids[name] = val
-        return self.channel_ids[name]
-
-    def _find_target_match(self, stream_name: str) -> Optional[str]:
+    def match(self, stream_name: str) -> Optional[str]:
         """
         Match using strict channel-name rules:
         - ignore leading geo prefixes in stream labels
@@ -807,6 +952,229 @@ class SportsScanner:
                 return target
         return None
 
+
+# Process-pool matching: each worker compiles the target index once (initializer)
+# and only (index, target, quality) hits travel back to the parent.
+_WORKER_MATCHER: Optional[TargetMatcher] = None
+_WORKER_NORMALIZER: Optional[ChannelNormalizer] = None
+
+
+def _init_match_worker(targets: List[str]) -> None:
+    global _WORKER_MATCHER, _WORKER_NORMALIZER
+    _WORKER_MATCHER = TargetMatcher(targets)
+    _WORKER_NORMALIZER = ChannelNormalizer(0)
+
+
+def _match_shard(shard: Tuple[int, List[str]]) -> List[Tuple[int, str, str]]:
+    start, names = shard
+    hits = []
+    for offset, name in enumerate(names):
+        target = _WORKER_MATCHER.match(name)
+        if target:
+            hits.append((start + offset, target, _WORKER_NORMALIZER.extract_quality(name)))
+    return hits
+
+
+def _stream_fields(stream: Union[Dict, CompactStream], by_stream_id: bool) -> Tuple[str, object, Optional[str], str]:
+    if isinstance(stream, (tuple, list)):
+        # Compact Xtream row from decode_live_stream_chunks (lists after a cache round-trip;
+        # rows cached before epg_channel_id was kept have three fields).
+        stream_name, stream_ref, stream_logo = stream[:3]
+        epg_channel_id = stream[3] if len(stream) > 3 else ''
+    else:
+        stream_name = stream.get('name', '')
+        stream_ref = stream.get('stream_id') if by_stream_id else stream.get('url')
+        stream_logo = stream.get('stream_icon') or stream.get('logo')
+        epg_channel_id = stream.get('epg_channel_id')
+    return (stream_name or '').strip(), stream_ref, stream_logo, str(epg_channel_id or '').strip()
+
+
+class SportsScanner:
+    """Main scanner class."""
+    
+    def __init__(
+        self,
+        target_channels: List[str],
+        max_streams_per_channel: int = MAX_STREAMS_PER_CHANNEL,
+        test_timeout: int = TEST_TIMEOUT_SECONDS,
+        test_retry_failed: int = TEST_RETRY_FAILED,
+        test_retry_delay: float = TEST_RETRY_DELAY_SECONDS,
+        allow_ffmpeg_fallback: bool = TEST_FFMPEG_FALLBACK,
+        test_workers: int = TEST_WORKERS,
+        test_user_agent: str = DEFAULT_USER_AGENT,
+        preserve_existing_streams: bool = False,
+        existing_channels: Optional[Dict[str, Dict]] = None,
+        response_cache: Optional[ResponseCache] = None,
+        snapshot_store: Optional[PlaylistSnapshotStore] = None,
+        http_client: Optional[PooledHttpClient] = None,
+        yield_store: Optional[ServerYieldStore] = None,
+        match_workers: int = DEFAULT_MATCH_WORKERS,
+        parallel_match_threshold: int = DEFAULT_PARALLEL_MATCH_THRESHOLD,
+        category_filter: Optional[CategoryFilter] = None,
+        category_workers: int = DEFAULT_CATEGORY_WORKERS,
+        epg_fixtures: Optional[Dict[str, List[Fixture]]] = None,
+    ):
+        """Initialize scanner with target channels."""
+        # Normalize targets for matching while preserving stable display names.
+        self.target_display_names = {}
+        for name in target_channels:
+            if not name:
+                continue
+            cleaned = name.strip()
+            if not cleaned:
+                continue
+            key = cleaned.lower()
+            if key not in self.target_display_names:
+                self.target_display_names[key] = cleaned
+        self.targets = list(self.target_display_names.keys())
+        self.total_targets = len(self.targets)
+        self.matcher = TargetMatcher(self.targets)
+        self.match_workers = max(1, int(match_workers))
+        self.parallel_match_threshold = max(0, int(parallel_match_threshold))
+        self._match_pool = None
+
+        # Channel storage: {original_target_name: {qualities: {quality: set()}, logo: str}}
+        self.channels = defaultdict(lambda: {'qualities': defaultdict(set), 'logo': None})
+        self.channel_urls = defaultdict(set)
+        self.channel_domains = defaultdict(set)
+        self.channel_quality_domains = defaultdict(lambda: defaultdict(set))
+        self.channel_ids = {}
+        self.normalizer = ChannelNormalizer(0)
+        self.max_streams_per_channel = max(1, int(max_streams_per_channel))
+        self.test_timeout = max(1, int(test_timeout))
+        self.test_retry_failed = max(0, int(test_retry_failed))
+        self.test_retry_delay = max(0.0, float(test_retry_delay))
+        self.test_workers = max(1, int(test_workers))
+        self.test_user_agent = test_user_agent
+        self.preserve_existing_streams = bool(preserve_existing_streams)
+        self.response_cache = response_cache
+        self.snapshot_store = snapshot_store
+        # One keep-alive pool per host, shared by every playlist/API fetch in this run.
+        self.http_client = http_client or PooledHttpClient(user_agent=test_user_agent)
+        self.yield_store = yield_store
+        # None keeps the full get_live_streams pull for Xtream panels.
+        self.category_filter = category_filter
+        self.category_workers = max(1, int(category_workers))
+        # Upcoming fixtures per target channel; when set, Xtream panels' xmltv.php is used to order candidates.
+        self.epg_fixtures = epg_fixtures or {}
+        self.lock = threading.Lock()
+        self.url_test_cache: Dict[str, bool] = {}
+        self.completed_targets = set()
+        self.ffprobe_bin = shutil.which('ffprobe')
+        self.ffmpeg_bin = shutil.which('ffmpeg')
+        self.allow_ffmpeg_fallback = bool(allow_ffmpeg_fallback and self.ffmpeg_bin)
+
+        if not self.ffprobe_bin:
+            raise RuntimeError("ffprobe not found in PATH. Install ffmpeg/ffprobe before scanning.")
+        if allow_ffmpeg_fallback and not self.ffmpeg_bin:
+            print("Warning: ffmpeg not found; proceeding with ffprobe-only stream validation.", flush=True)
+        
+        # Stats
+        self.stats = {
+            'servers_total': 0,
+            'servers_success': 0,
+            'servers_failed': 0,
+            'categories_total': 0,
+            'streams_total': 0,
+            'channels_added': 0,
+            'streams_skipped_cap': 0,
+            'channels_trimmed_to_cap': 0,
+            'streams_trimmed_to_cap': 0,
+            'streams_tested': 0,
+            'streams_alive': 0,
+            'streams_dead': 0,
+            'streams_cached': 0,
+            'channels_completed': 0,
+            'channels_refreshed_from_tested_streams': 0,
+            'channels_cleared_no_working_streams': 0,
+            'channels_seeded_from_existing': 0,
+            'streams_seeded_from_existing': 0,
+            'streams_skipped_non_live_url': 0,
+            'channels_pruned_non_target': 0,
+            'sources_reused_from_http_cache': 0,
+            'snapshot_entries_unchanged': 0,
+            'snapshot_entries_new_or_changed': 0,
+            'snapshot_trusted': 0,
+            'snapshot_revalidated': 0,
+            'snapshot_skipped_dead': 0,
+            'servers_skipped_failing': 0,
+            'servers_category_filtered': 0,
+            'servers_category_fallback_full': 0,
+            'epg_panels_loaded': 0,
+            'epg_candidates_confirmed': 0,
+        }
+
+        if self.preserve_existing_streams:
+            self._seed_existing_channels(existing_channels or {})
+
+    def _get_channel_id(self, name: str) -> int:
+        """Get or create STABLE channel ID (Hash of name)."""
+        if name not in self.channel_ids:
+            val = zlib.adler32(name.encode('utf-8')) & 0xffffffff
+            self.channel_ids[name] = val
+        return self.channel_ids[name]
+
+    def _find_target_match(self, stream_name: str) -> Optional[str]:
+        return self.matcher.match(stream_name)
+
+    def _use_parallel_match(self, stream_count: int) -> bool:
+        return (
+            self.match_workers > 1
+            and self.parallel_match_threshold > 0
+            and stream_count >= self.parallel_match_threshold
+        )
+
+    def _get_match_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self.lock:
+            if self._match_pool is None:
+                # spawn, not fork: the parent already runs HTTP/tester threads.
+                self._match_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.match_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_match_worker,
+                    initargs=(self.targets,),
+                )
+            return self._match_pool
+
+    def close_match_pool(self) -> None:
+        with self.lock:
+            pool, self._match_pool = self._match_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _match_streams_parallel(self, names: List[str]) -> List[Tuple[int, str, str]]:
+        """Match stream names across the process pool; hits come back in stream order."""
+        shard_size = max(1, -(-len(names) // (self.match_workers * 4)))
+        shards = [(start, names[start:start + shard_size]) for start in range(0, len(names), shard_size)]
+        hits: List[Tuple[int, str, str]] = []
+        for shard_hits in self._get_match_pool().map(_match_shard, shards):
+            hits.extend(shard_hits)
+        return hits
+
+    def _iter_matched_streams(self, streams: List[Union[Dict, CompactStream]], by_stream_id: bool):
+        """Yield (stream_name, stream_ref, stream_logo, epg_channel_id, target_lower, quality) for matched streams."""
+        if self._use_parallel_match(len(streams)):
+            names = [_stream_fields(stream, by_stream_id)[0] for stream in streams]
+            try:
+                hits = self._match_streams_parallel(names)
+            except (OSError, RuntimeError, concurrent.futures.process.BrokenProcessPool) as e:
+                print(f"  [WARN] Parallel matcher unavailable ({e}); matching inline.", flush=True)
+                self.close_match_pool()
+                self.match_workers = 1
+            else:
+                for idx, target, quality in hits:
+                    yield (*_stream_fields(streams[idx], by_stream_id), target, quality)
+                return
+
+        for stream in streams:
+            fields = _stream_fields(stream, by_stream_id)
+            stream_name = fields[0]
+            if not stream_name:
+                continue
+            target = self.matcher.match(stream_name)
+            if target:
+                yield (*fields, target, self.normalizer.extract_quality(stream_name))
+
     def _get_display_name(self, target_lower: str) -> str:
         """Recover display name using original schedule casing when available."""
         return self.target_display_names.get(target_lower, target_lower.title())
@@ -993,7 +1361,15 @@ class SportsScanner:
             return False
         return result.returncode == 0
 
-    def _validate_stream_url(self, channel_name: str, stream_name: str, url: str, source_label: str) -> bool:
+    def _validate_stream_url(
+        self,
+        channel_name: str,
+        stream_name: str,
+        url: str,
+        source_label: str,
+        quick: bool = False,
+    ) -> bool:
+        """Probe a stream URL; quick mode is a single ffprobe without retries or ffmpeg fallback."""
         with self.lock:
             cached = self.url_test_cache.get(url)
         if cached is not None:
@@ -1006,18 +1382,18 @@ class SportsScanner:
             )
             return cached
 
-        attempts = self.test_retry_failed + 1
+        attempts = 1 if quick else self.test_retry_failed + 1
         ok = False
-        method = "ffprobe"
+        method = "ffprobe-revalidate" if quick else "ffprobe"
         for attempt in range(1, attempts + 1):
             ok = self._run_ffprobe(url)
             if ok:
-                method = f"ffprobe(attempt={attempt})"
+                method = "ffprobe-revalidate" if quick else f"ffprobe(attempt={attempt})"
                 break
             if attempt < attempts and self.test_retry_delay > 0:
                 time.sleep(self.test_retry_delay)
 
-        if not ok and self.allow_ffmpeg_fallback:
+        if not ok and self.allow_ffmpeg_fallback and not quick:
             ffmpeg_ok = self._run_ffmpeg(url)
             if ffmpeg_ok:
                 ok = True
@@ -1087,39 +1463,44 @@ class SportsScanner:
 
     def process_streams(
         self,
-        streams: List[Dict],
+        streams: List[Union[Dict, CompactStream]],
         api_instance: Optional[XtreamAPI] = None,
         source_label: str = "Unknown",
+        snapshot_key: Optional[str] = None,
+        epg_loader: Optional[Callable[[Set[str]], Optional[EpgGuide]]] = None,
     ):
-        """Process one playlist batch: collect candidates, test in parallel, keep only alive."""
+        """Process one playlist batch: collect candidates, test in parallel, keep only alive.
+
+        When a snapshot store is configured and `snapshot_key` (the playlist URL) is given,
+        matched pairs are diffed against the previous run: only new or changed entries get
+        a full test, unchanged ones follow the store's freshness policy.
+        With an `epg_loader`, the panel EPG is loaded once candidates are known (given
+        their epg_channel_id values), and candidates whose EPG shows a scheduled fixture
+        at kickoff are tested (and so fill the per-channel cap) first.
+        """
         found_in_batch = 0
         candidates = []
         seen_pairs = set()
-
-        for stream in streams:
+        use_snapshot = bool(self.snapshot_store and snapshot_key)
+        previous_snapshot = self.snapshot_store.previous_entries(snapshot_key) if use_snapshot else {}
+        snapshot_entries: Dict[str, List] = {}
+        snapshot_complete = True
+        now = time.time()
+
+        matched_streams = self._iter_matched_streams(streams, by_stream_id=bool(api_instance))
+        for stream_name, stream_ref, stream_logo, epg_channel_id, matched_target_lower, quality in matched_streams:
             if self._all_targets_complete():
                 print("  [INFO] All target channels reached the working-stream cap. Skipping remaining streams.", flush=True)
+                snapshot_complete = False
                 break
 
-            stream_name = stream.get('name', '').strip()
-            if not stream_name:
-                continue
-
-            matched_target_lower = self._find_target_match(stream_name)
-            if not matched_target_lower:
-                continue
-
             final_name = self._get_display_name(matched_target_lower)
 
-            if api_instance:
-                stream_id = stream.get('stream_id')
-                if not stream_id:
-                    continue
-                url = api_instance.get_stream_url(stream_id)
-            else:
-                url = stream.get('url')
-                if not url:
-                    continue
+            if not stream_ref:
+                continue
+            url = api_instance.get_stream_url(stream_ref) if api_instance else stream_ref
+            if not url:
+                continue
 
             url = url.strip()
             if not url:
@@ -1129,7 +1510,19 @@ class SportsScanner:
                     self.stats['streams_skipped_non_live_url'] += 1
                 continue
 
-            quality = self.normalizer.extract_quality(stream_name)
+            decision = DECISION_FULL
+            entry_key = None
+            if use_snapshot:
+                entry_key = pair_key(final_name, url)
+                name_hash = compact_hash(stream_name)
+                previous = previous_snapshot.get(entry_key)
+                if previous and previous[0] == name_hash:
+                    snapshot_entries[entry_key] = list(previous)
+                    decision = self.snapshot_store.policy.decide(previous, name_hash, now=now)
+                else:
+                    # Never tested under this label yet (tested_at=0 forces a full test next time).
+                    snapshot_entries[entry_key] = [name_hash, 0, 0]
+
             domain = self._domain_key(url)
 
             with self.lock:
@@ -1146,20 +1539,46 @@ class SportsScanner:
                 continue
             seen_pairs.add(key)
 
+            if use_snapshot:
+                stat_key = 'snapshot_entries_new_or_changed' if decision == DECISION_FULL else 'snapshot_entries_unchanged'
+                with self.lock:
+                    self.stats[stat_key] += 1
+
             candidates.append(
                 {
                     'channel': final_name,
                     'stream_name': stream_name,
                     'quality': quality,
                     'domain': domain,
-                    'logo': stream.get('stream_icon') or stream.get('logo'),
+                    'logo': stream_logo,
                     'url': url,
+                    'decision': decision,
+                    'snapshot_entry': entry_key,
+                    'target_lower': matched_target_lower,
+                    'epg_channel_id': epg_channel_id,
+                    'epg_confirmed': False,
                 }
             )
 
         if not candidates:
+            if use_snapshot:
+                self._commit_snapshot(snapshot_key, previous_snapshot, snapshot_entries, snapshot_complete)
             return 0
 
+        epg_guide = epg_loader({candidate['epg_channel_id'] for candidate in candidates}) if epg_loader else None
+        if epg_guide:
+            for candidate in candidates:
+                candidate['epg_confirmed'] = epg_guide.confirms(
+                    candidate['stream_name'], candidate['target_lower'], candidate['epg_channel_id']
+                )
+            confirmed = sum(1 for candidate in candidates if candidate['epg_confirmed'])
+            if confirmed:
+                # Stable sort: EPG-confirmed first, otherwise playlist order.
+                candidates.sort(key=lambda candidate: not candidate['epg_confirmed'])
+                with self.lock:
+                    self.stats['epg_candidates_confirmed'] += confirmed
+                print(f"    - EPG shows a scheduled fixture on {confirmed} candidates; testing those first.", flush=True)
+
         print(
             f"    - Testing {len(candidates)} candidate streams with {self.test_workers} workers for source '{source_label}'...",
             flush=True,
@@ -1172,12 +1591,34 @@ class SportsScanner:
                 with self.lock:
                     self.stats['streams_skipped_cap'] += 1
                 return None
+
+            decision = candidate.get('decision', DECISION_FULL)
+            if decision == DECISION_TRUST:
+                with self.lock:
+                    self.stats['snapshot_trusted'] += 1
+                print(
+                    f"[TEST][SNAPSHOT] ALIVE | channel={channel_name} | source={source_label} | stream={candidate['stream_name']} | url={candidate['url']}",
+                    flush=True,
+                )
+                return candidate
+            if decision == DECISION_SKIP_DEAD:
+                with self.lock:
+                    self.stats['snapshot_skipped_dead'] += 1
+                return None
+
             is_alive = self._validate_stream_url(
                 channel_name=channel_name,
                 stream_name=candidate['stream_name'],
                 url=candidate['url'],
                 source_label=source_label,
+                quick=decision == DECISION_REVALIDATE,
             )
+            entry_key = candidate.get('snapshot_entry')
+            with self.lock:
+                if decision == DECISION_REVALIDATE:
+                    self.stats['snapshot_revalidated'] += 1
+                if entry_key and entry_key in snapshot_entries:
+                    snapshot_entries[entry_key] = [snapshot_entries[entry_key][0], int(is_alive), int(time.time())]
             return candidate if is_alive else None
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.test_workers) as executor:
@@ -1227,7 +1668,22 @@ class SportsScanner:
 
                 self._get_channel_id(channel_name)
 
+        if use_snapshot:
+            self._commit_snapshot(snapshot_key, previous_snapshot, snapshot_entries, snapshot_complete)
         return found_in_batch
+
+    def _commit_snapshot(
+        self,
+        snapshot_key: str,
+        previous_snapshot: Dict[str, List],
+        snapshot_entries: Dict[str, List],
+        complete: bool,
+    ) -> None:
+        """Persist this playlist's matched pairs; keep unseen old pairs if matching stopped early."""
+        if not complete:
+            for entry_key, previous in previous_snapshot.items():
+                snapshot_entries.setdefault(entry_key, previous)
+        self.snapshot_store.replace_entries(snapshot_key, snapshot_entries)
     
     def scan_direct_m3u(self, url: str) -> Dict:
         """Scan a direct M3U file URL."""
@@ -1235,63 +1691,25 @@ class SportsScanner:
         result = {
             'success': False,
             'channels_added': 0,
+            'streams': 0,
+            'fetch_seconds': None,
             'error': None
         }
         
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            lines = response.text.splitlines()
-            
-            parsed_streams = []
-            current_info = {}
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                if line.startswith('#EXTINF:'):
-                    current_info = {}
-                    # Extract Logo
-                    logo_match = re.search(r'tvg-logo="([^"]*)"', line)
-                    if logo_match:
-                        current_info['logo'] = logo_match.group(1)
-                    
-                    # Extract Name
-                    name_match = re.search(r',([^,]*)$', line)
-                    if name_match:
-                        current_info['name'] = name_match.group(1).strip()
-
-                    group_title = ""
-                    group_match = GROUP_TITLE_RE.search(line)
-                    if group_match:
-                        group_title = group_match.group(1).strip()
-                        if group_title:
-                            current_info['group_title'] = group_title
-
-                    if is_non_live_m3u_entry(
-                        group_title=group_title,
-                        channel_name=current_info.get('name', ''),
-                        url="",
-                    ):
-                        current_info = {}
-                        continue
-                
-                elif not line.startswith('#'):
-                    # It's a URL
-                    if 'name' in current_info:
-                        if is_non_live_m3u_entry(
-                            group_title=current_info.get('group_title', ''),
-                            channel_name=current_info.get('name', ''),
-                            url=line,
-                        ):
-                            current_info = {}
-                            continue
-                        current_info['url'] = line
-                        parsed_streams.append(current_info)
-                        current_info = {} # Reset
-                        
+            fetch_started = time.perf_counter()
+            parsed_streams, cache_status = fetch_with_cache(
+                url,
+                parse=_decode_m3u_body,
+                cache=self.response_cache,
+                http_get=self.http_client.get,
+                timeout=30,
+            )
+            if cache_status != "fetched":
+                self.stats['sources_reused_from_http_cache'] += 1
+                print(f"    - Playlist {cache_status} since last scan; reusing cached parse.", flush=True)
+            result['fetch_seconds'] = time.perf_counter() - fetch_started
+            result['streams'] = len(parsed_streams)
             print(f"    - Parsed {len(parsed_streams)} streams from M3U. Matching...", flush=True)
             self.stats['streams_total'] += len(parsed_streams)
             
@@ -1299,6 +1717,7 @@ class SportsScanner:
                 parsed_streams,
                 api_instance=None,
                 source_label=f"Direct M3U: {url}",
+                snapshot_key=url,
             )
             
             result['success'] = True
@@ -1311,6 +1730,47 @@ class SportsScanner:
             
         return result
 
+    def _fetch_filtered_categories(self, api: XtreamAPI) -> Tuple[List[CompactStream], List[Optional[str]]]:
+        """Pull only the live categories selected by `category_filter`; empty result means "use the full list"."""
+        categories = api.get_live_categories()
+        category_ids = self.category_filter.select(categories)
+        print(
+            f"    - Category filter selected {len(category_ids)}/{len(categories)} live categories.",
+            flush=True,
+        )
+        if not category_ids:
+            return [], []
+        self.stats['categories_total'] += len(category_ids)
+        return api.get_live_streams_for_categories(category_ids, workers=self.category_workers)
+
+    def _load_panel_epg(self, api: XtreamAPI, channel_ids: Set[str]) -> Optional[EpgGuide]:
+        """Stream the panel's xmltv.php into an EpgGuide restricted to candidate channels and fixture times."""
+        url = api.get_xmltv_url()
+        if not self.epg_fixtures or not url:
+            return None
+        started = time.perf_counter()
+        try:
+            response = self.http_client.get(url, stream=True, timeout=(10, 60))
+            try:
+                response.raise_for_status()
+                guide = EpgGuide(self.epg_fixtures).ingest_chunks(
+                    response.iter_content(chunk_size=256 * 1024),
+                    is_relevant_channel=lambda name: self.matcher.match(name) is not None,
+                    channel_ids=channel_ids,
+                )
+            finally:
+                response.close()
+        except (requests.RequestException, ET.ParseError, OSError) as e:
+            print(f"    - EPG unavailable ({e}); testing candidates in playlist order.", flush=True)
+            return None
+        self.stats['epg_panels_loaded'] += 1
+        print(
+            f"    - EPG: kept {guide.stats['programmes_kept']}/{guide.stats['programmes']} programmes on "
+            f"{guide.stats['channels_kept']} target channels in {time.perf_counter() - started:.1f}s.",
+            flush=True,
+        )
+        return guide
+
     def scan_server(self, server: Dict) -> Dict:
         """Scan a single server."""
         if server.get('type') == 'direct':
@@ -1321,29 +1781,45 @@ class SportsScanner:
             'name': server.get('name', 'Unknown'),
             'success': False,
             'channels_added': 0,
+            'streams': 0,
+            'fetch_seconds': None,
             'error': None
         }
         
         try:
             # Connect to API
-            api = XtreamAPI(server['url'])
-            
-            # STRATEGY: fetch full live stream list only.
-            # Category iteration fallback is intentionally disabled for speed.
+            api = XtreamAPI(server['url'], response_cache=self.response_cache, http_client=self.http_client)
             
             all_streams = []
-            
-            # Method A: Get All Streams
-            print(f"    - Attempting to fetch full stream list...", flush=True)
-            all_streams = api.get_live_streams(category_id=None)
+            fetch_started = time.perf_counter()
+            if self.category_filter:
+                all_streams, cache_statuses = self._fetch_filtered_categories(api)
+                if all_streams:
+                    self.stats['servers_category_filtered'] += 1
+                    reused = all(status not in (None, "fetched") for status in cache_statuses)
+                    api.last_cache_status = "not-modified" if reused else "fetched"
+                else:
+                    self.stats['servers_category_fallback_full'] += 1
+                    print("    - Category filter yielded no streams; falling back to full list.", flush=True)
+
+            if not all_streams:
+                print(f"    - Attempting to fetch full stream list...", flush=True)
+                all_streams = api.get_live_streams(category_id=None)
+            result['fetch_seconds'] = time.perf_counter() - fetch_started
+            result['streams'] = len(all_streams)
             
             if all_streams:
+                if api.last_cache_status not in (None, "fetched"):
+                    self.stats['sources_reused_from_http_cache'] += 1
+                    print(f"    - Stream list {api.last_cache_status} since last scan; reusing cached parse.", flush=True)
                 print(f"    - Success. Got {len(all_streams)} streams. Matching...", flush=True)
                 self.stats['streams_total'] += len(all_streams)
                 added = self.process_streams(
                     all_streams,
                     api_instance=api,
                     source_label=server.get('name', 'Unknown'),
+                    snapshot_key=server['url'],
+                    epg_loader=lambda channel_ids: self._load_panel_epg(api, channel_ids),
                 )
                 
                 result['success'] = True
@@ -1352,7 +1828,7 @@ class SportsScanner:
                 return result
 
             print(
-                "    - Full list fetch returned empty. Category fallback disabled; skipping server.",
+                "    - Full list fetch returned empty; skipping server.",
                 flush=True,
             )
             result['success'] = True
@@ -1368,11 +1844,23 @@ class SportsScanner:
     def scan_all(self, servers: List[Dict]) -> None:
         """Scan all provided servers."""
         servers_ordered = list(servers)
+        skipped_servers: List[Dict] = []
+        if self.yield_store:
+            servers_ordered, skipped_servers = self.yield_store.rank(servers_ordered)
         self.stats['servers_total'] = len(servers_ordered)
+        self.stats['servers_skipped_failing'] = len(skipped_servers)
         
         print(f"\\n{'='*70}")
         print(f"Scanning {len(servers_ordered)} configured servers")
-        print("Priority: configured order (external playlists first, then lovestory)")
+        if self.yield_store:
+            print("Priority: historic useful-stream yield per probe (zero-yield panels last)")
+            if skipped_servers:
+                print(
+                    f"Skipping {len(skipped_servers)} servers that failed "
+                    f"{self.yield_store.policy.skip_after_failures}+ runs in a row"
+                )
+        else:
+            print("Priority: configured order (external playlists first, then lovestory)")
         print(
             f"Flow: one playlist at a time, batch-test URLs with {self.test_workers} workers, then move on"
         )
@@ -1385,6 +1873,8 @@ class SportsScanner:
 
             server_name = server.get('name', 'Unknown')
             print(f"Playlist {idx}/{len(servers_ordered)}: {server_name}", flush=True)
+            probes_before = self.stats['streams_tested']
+            result = None
             try:
                 result = self.scan_server(server)
                 if result['success']:
@@ -1394,31 +1884,29 @@ class SportsScanner:
             except Exception as e:
                 print(f"Exception scanning {server_name}: {e}")
                 self.stats['servers_failed'] += 1
+
+            if self.yield_store:
+                result = result or {}
+                self.yield_store.record(
+                    server.get('url', ''),
+                    fetched=bool(result.get('success')) and int(result.get('streams') or 0) > 0,
+                    streams=int(result.get('streams') or 0),
+                    accepted=int(result.get('channels_added') or 0),
+                    probes=self.stats['streams_tested'] - probes_before,
+                    fetch_seconds=result.get('fetch_seconds'),
+                )
                     
         print(f"--- Scan complete. ---", flush=True)
 
-    def save(self, output_path: str, prune_non_target_channels: bool = False) -> None:
-        """Save results to JSON (Merge with existing)."""
-        
-        # 1. Load Existing Data to preserve Manual/Previous entries
-        existing_data = {}
-        if os.path.exists(output_path):
-            try:
-                with open(output_path, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load existing {output_path}: {e}")
-        
-        # Prepare Output Structure
-        output = {
-            'metadata': {
-                'scan_date': time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
-                'stats': self.stats,
-                # Unique channels is sum of existing + new (deduplicated)
-            },
-            'channels': existing_data.get('channels', {})
-        }
-        existing_name_by_lower = {name.lower(): name for name in output['channels'].keys()}
+    def _save_to_store(self, store: ChannelStore, prune_non_target_channels: bool) -> Tuple[int, int]:
+        """Replace target-channel URLs with this run's results; returns (placeholders_added, total_channels)."""
+        # 1. Existing channel names; only target channels' rows are loaded and rewritten.
+        existing_names = store.channel_names()
+        existing_name_by_lower = {name.lower(): name for name in existing_names}
+        nodes = store.get_channels(
+            existing_name_by_lower[target_lower] for target_lower in self.targets if target_lower in existing_name_by_lower
+        )
+        touched = set()
         
         # 2. Replace target-channel URLs with this run's tested-alive URLs only.
         scanned_name_by_lower = {name.lower(): name for name in self.channels.keys()}
@@ -1431,19 +1919,20 @@ class SportsScanner:
             scanned_name = scanned_name_by_lower.get(target_lower)
             scanned_data = self.channels.get(scanned_name) if scanned_name else None
 
-            has_existing = canonical_name in output['channels']
+            has_existing = canonical_name in nodes
             if not has_existing and not scanned_data:
                 continue
 
-            if canonical_name not in output['channels']:
-                output['channels'][canonical_name] = {
+            if canonical_name not in nodes:
+                nodes[canonical_name] = {
                     'id': None,
                     'logo': None,
                     'qualities': {}
                 }
                 existing_name_by_lower[canonical_name.lower()] = canonical_name
 
-            node = output['channels'][canonical_name]
+            node = nodes[canonical_name]
+            touched.add(canonical_name)
 
             if scanned_data and scanned_data.get('qualities'):
                 fresh_qualities = {}
@@ -1470,7 +1959,7 @@ class SportsScanner:
             channel_name = existing_name_by_lower.get(target_lower)
             if not channel_name:
                 continue
-            channel_data = output['channels'].get(channel_name)
+            channel_data = nodes.get(channel_name)
             if not isinstance(channel_data, dict):
                 continue
             qualities = channel_data.get('qualities')
@@ -1480,6 +1969,7 @@ class SportsScanner:
             if dropped > 0:
                 trimmed_channels += 1
                 trimmed_urls += dropped
+                touched.add(channel_name)
             channel_data['qualities'] = limited_qualities if limited_qualities else {}
 
         self.stats['channels_trimmed_to_cap'] = trimmed_channels
@@ -1487,51 +1977,88 @@ class SportsScanner:
         self.stats['channels_refreshed_from_tested_streams'] = refreshed_channels
         self.stats['channels_cleared_no_working_streams'] = emptied_channels
 
-        pruned_non_target = 0
-        if prune_non_target_channels:
-            target_set = set(self.targets)
-            to_remove = [
-                channel_name
-                for channel_name in list(output['channels'].keys())
-                if channel_name.lower() not in target_set
-            ]
-            for channel_name in to_remove:
-                del output['channels'][channel_name]
-            pruned_non_target = len(to_remove)
-            existing_name_by_lower = {name.lower(): name for name in output['channels'].keys()}
-        self.stats['channels_pruned_non_target'] = pruned_non_target
-
-        # 3. Add missing channels from the current schedule as placeholders.
-        found_names_lower = set(existing_name_by_lower.keys())
-        
-        missing_count = 0
-        for target_lower in self.targets:
-            if target_lower not in found_names_lower:
-                # Truly new/missing
-                display_name = self._get_display_name(target_lower)
-                output['channels'][display_name] = {
-                    'id': None,
-                    'logo': None,
-                    'qualities': None 
-                }
-                existing_name_by_lower[target_lower] = display_name
-                missing_count += 1
-
-        output['metadata']['unique_channels'] = len(output['channels'])
+        with store.transaction():
+            for channel_name in touched:
+                store.put_channel(channel_name, nodes[channel_name])
+
+            pruned_non_target = 0
+            if prune_non_target_channels:
+                target_set = set(self.targets)
+                to_remove = [
+                    channel_name
+                    for channel_name in store.channel_names()
+                    if channel_name.lower() not in target_set
+                ]
+                for channel_name in to_remove:
+                    store.delete_channel(channel_name)
+                pruned_non_target = len(to_remove)
+                existing_name_by_lower = {name.lower(): name for name in store.channel_names()}
+            self.stats['channels_pruned_non_target'] = pruned_non_target
+
+            # 3. Add missing channels from the current schedule as placeholders.
+            found_names_lower = set(existing_name_by_lower.keys())
+            
+            missing_count = 0
+            for target_lower in self.targets:
+                if target_lower not in found_names_lower:
+                    # Truly new/missing
+                    display_name = self._get_display_name(target_lower)
+                    store.put_channel(display_name, {
+                        'id': None,
+                        'logo': None,
+                        'qualities': None 
+                    })
+                    existing_name_by_lower[target_lower] = display_name
+                    missing_count += 1
+
+            total_channels = len(store.channel_names())
+            # A scan run owns the whole metadata block, as before.
+            store.set_metadata(
+                {
+                    'scan_date': time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
+                    'stats': self.stats,
+                    'unique_channels': total_channels,
+                },
+                replace=True,
+            )
+        return missing_count, total_channels
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+    def save(
+        self,
+        output_path: str,
+        prune_non_target_channels: bool = False,
+        store_path: Optional[str] = None,
+    ) -> None:
+        """Merge results into the channel store (target channels only) and export the JSON."""
+        with ChannelStore.open_synced(output_path, store_path) as store:
+            missing_count, total_channels = self._save_to_store(store, prune_non_target_channels)
+            store.export_json(output_path)
         
         # Console Reporting
         print(f"\\n{'='*70}", flush=True)
         print(f"[OK] Saved merged results to {output_path}", flush=True)
-        print(f"  Total Channels in DB: {len(output['channels'])}", flush=True)
+        print(f"  Total Channels in DB: {total_channels}", flush=True)
         print(f"  New/Updated in this scan: {len(self.channels)}", flush=True)
         print(f"  Missing (Added as null): {missing_count}", flush=True)
         print(f"  Max source domains/channel cap: {self.max_streams_per_channel}", flush=True)
         if self.preserve_existing_streams:
             print(f"  Seeded channels from existing DB: {self.stats['channels_seeded_from_existing']}", flush=True)
             print(f"  Seeded streams from existing DB: {self.stats['streams_seeded_from_existing']}", flush=True)
+        if self.yield_store:
+            print(f"  Servers skipped as repeatedly failing: {self.stats['servers_skipped_failing']}", flush=True)
+        if self.epg_fixtures:
+            print(
+                f"  EPG-guided panels: {self.stats['epg_panels_loaded']} "
+                f"({self.stats['epg_candidates_confirmed']} candidates confirmed by EPG)",
+                flush=True,
+            )
+        if self.category_filter:
+            print(
+                f"  Category-filtered servers: {self.stats['servers_category_filtered']} "
+                f"({self.stats['categories_total']} categories, "
+                f"{self.stats['servers_category_fallback_full']} fell back to the full list)",
+                flush=True,
+            )
         print(f"  Streams tested: {self.stats['streams_tested']}", flush=True)
         print(f"  Streams alive: {self.stats['streams_alive']}", flush=True)
         print(f"  Streams dead: {self.stats['streams_dead']}", flush=True)
@@ -1541,9 +2068,23 @@ class SportsScanner:
         print(f"  Channels cleared (no working streams): {self.stats['channels_cleared_no_working_streams']}", flush=True)
         print(f"  Streams skipped as non-live URLs: {self.stats['streams_skipped_non_live_url']}", flush=True)
         print(f"  Channels pruned as non-target: {self.stats['channels_pruned_non_target']}", flush=True)
+        print(f"  Playlists reused from HTTP cache: {self.stats['sources_reused_from_http_cache']}", flush=True)
+        timing_lines = self.http_client.timing_lines()
+        if timing_lines:
+            print("  Playlist fetch timing per host:", flush=True)
+            for line in timing_lines:
+                print(f"    - {line}", flush=True)
+        if self.snapshot_store:
+            print(
+                f"  Snapshot diff: {self.stats['snapshot_entries_new_or_changed']} new/changed, "
+                f"{self.stats['snapshot_entries_unchanged']} unchanged "
+                f"(trusted={self.stats['snapshot_trusted']}, revalidated={self.stats['snapshot_revalidated']}, "
+                f"skipped dead={self.stats['snapshot_skipped_dead']})",
+                flush=True,
+            )
         print(f"  Streams skipped during scan due to cap: {self.stats['streams_skipped_cap']}", flush=True)
-        print(f"  Channels trimmed to cap in final output: {trimmed_channels}", flush=True)
-        print(f"  Streams trimmed to cap in final output: {trimmed_urls}", flush=True)
+        print(f"  Channels trimmed to cap in final output: {self.stats['channels_trimmed_to_cap']}", flush=True)
+        print(f"  Streams trimmed to cap in final output: {self.stats['streams_trimmed_to_cap']}", flush=True)
         print(f"{'='*70}\\n", flush=True)
 
 
@@ -1575,6 +2116,11 @@ def load_target_channels(schedule_file):
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('output_file', nargs='?', default='channels.json', help='Output JSON file')
+    parser.add_argument(
+        '--channel-store',
+        default=None,
+        help='SQLite channel store backing output_file (default: next to it, .sqlite)',
+    )
     parser.add_argument('--schedule-file', default=SCHEDULE_FILE, help='Schedule JSON file used to load target channels')
     parser.add_argument('--verify', action='store_true', help='Use only first 3 servers for verification')
     parser.add_argument(
@@ -1599,6 +2145,88 @@ def main():
         action='store_true',
         help='Remove channels from output DB that are not present in current schedule targets.',
     )
+    parser.add_argument('--http-cache-dir', default=HTTP_CACHE_DIR, help='On-disk conditional-GET cache for playlist/API responses')
+    parser.add_argument(
+        '--http-cache-max-mb',
+        type=int,
+        default=DEFAULT_MAX_CACHE_BYTES // (1024 * 1024),
+        help='Size limit for the HTTP response cache (least recently used entries are evicted)',
+    )
+    parser.add_argument('--no-http-cache', action='store_true', help='Always download playlists in full')
+    parser.add_argument('--server-yield-file', default=SERVER_YIELD_FILE, help='Per-server yield history used to order playlists')
+    parser.add_argument('--no-yield-ranking', action='store_true', help='Scan playlists in configured order')
+    parser.add_argument(
+        '--zero-yield-runs',
+        type=int,
+        default=DEFAULT_ZERO_YIELD_RUNS,
+        help='Move servers to the end after this many consecutive runs without an accepted stream (0 disables)',
+    )
+    parser.add_argument(
+        '--skip-after-failures',
+        type=int,
+        default=DEFAULT_SKIP_AFTER_FAILURES,
+        help='Skip servers whose fetch failed this many runs in a row (0 disables)',
+    )
+    parser.add_argument(
+        '--failed-server-retry-days',
+        type=float,
+        default=DEFAULT_FAILED_RETRY_DAYS,
+        help='Retry a skipped failing server once this many days passed since its last attempt',
+    )
+    parser.add_argument(
+        '--category-filter',
+        action='store_true',
+        help='Fetch only Xtream live categories matching --category-keywords (full list if none match)',
+    )
+    parser.add_argument(
+        '--category-keywords',
+        default=','.join(DEFAULT_CATEGORY_KEYWORDS),
+        help='Comma-separated category keywords; a trailing * is a word-prefix match',
+    )
+    parser.add_argument(
+        '--category-exclude-keywords',
+        default=','.join(DEFAULT_CATEGORY_EXCLUDE_KEYWORDS),
+        help='Comma-separated keywords that drop a category even if it matched',
+    )
+    parser.add_argument('--category-workers', type=int, default=DEFAULT_CATEGORY_WORKERS, help='Concurrent category fetches per panel')
+    parser.add_argument(
+        '--epg-guided',
+        action='store_true',
+        help="Read each Xtream panel's xmltv.php and test channels whose EPG shows a scheduled fixture first",
+    )
+    parser.add_argument(
+        '--epg-horizon-hours',
+        type=float,
+        default=DEFAULT_EPG_HORIZON_HOURS,
+        help='Only fixtures kicking off within this many hours (or 3h ago) are cross-referenced',
+    )
+    parser.add_argument(
+        '--parallel-match-threshold',
+        type=int,
+        default=DEFAULT_PARALLEL_MATCH_THRESHOLD,
+        help='Match playlists with at least this many entries across a process pool (0 disables)',
+    )
+    parser.add_argument('--match-workers', type=int, default=DEFAULT_MATCH_WORKERS, help='Processes used for parallel matching')
+    parser.add_argument('--snapshot-file', default=SNAPSHOT_FILE, help='Per-playlist snapshot of matched entries from the previous scan')
+    parser.add_argument('--no-snapshot-diff', action='store_true', help='Fully test every matched entry regardless of the previous scan')
+    parser.add_argument(
+        '--snapshot-trust-hours',
+        type=float,
+        default=DEFAULT_TRUST_HOURS,
+        help='Unchanged entries that passed within this window are accepted without re-testing',
+    )
+    parser.add_argument(
+        '--snapshot-revalidate-hours',
+        type=float,
+        default=DEFAULT_REVALIDATE_HOURS,
+        help='Unchanged entries that passed within this window get a single quick ffprobe',
+    )
+    parser.add_argument(
+        '--snapshot-dead-retry-hours',
+        type=float,
+        default=DEFAULT_DEAD_RETRY_HOURS,
+        help='Unchanged entries that failed within this window are skipped',
+    )
     args = parser.parse_args()
     
     # 1. Load Targets
@@ -1624,7 +2252,59 @@ def main():
         except Exception as e:
             print(f"Warning: could not pre-load existing channels from {args.output_file}: {e}")
 
+    response_cache = None
+    if not args.no_http_cache:
+        try:
+            response_cache = ResponseCache(args.http_cache_dir, max_bytes=args.http_cache_max_mb * 1024 * 1024)
+        except OSError as e:
+            print(f"Warning: HTTP response cache disabled ({e})")
+
+    snapshot_store = None
+    if not args.no_snapshot_diff:
+        snapshot_store = PlaylistSnapshotStore(
+            args.snapshot_file,
+            policy=FreshnessPolicy(
+                trust_hours=args.snapshot_trust_hours,
+                revalidate_hours=args.snapshot_revalidate_hours,
+                dead_retry_hours=args.snapshot_dead_retry_hours,
+            ),
+        )
+
+    yield_store = None
+    if not args.no_yield_ranking:
+        yield_store = ServerYieldStore(
+            args.server_yield_file,
+            policy=YieldPolicy(
+                zero_yield_runs=args.zero_yield_runs,
+                skip_after_failures=args.skip_after_failures,
+                failed_retry_days=args.failed_server_retry_days,
+            ),
+        )
+
     # 3. Init Scanner (hard cap enforced per channel)
+    category_filter = None
+    if args.category_filter:
+        category_filter = CategoryFilter(
+            include=parse_keyword_list(args.category_keywords),
+            exclude=parse_keyword_list(args.category_exclude_keywords),
+        )
+
+    epg_fixtures = None
+    if args.epg_guided:
+        try:
+            with open(args.schedule_file, 'r', encoding='utf-8') as f:
+                schedule_payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: EPG guidance disabled, could not read schedule: {e}")
+        else:
+            now = time.time()
+            epg_fixtures = load_schedule_fixtures(
+                schedule_payload,
+                window_start=now - 3 * 3600,
+                window_end=now + args.epg_horizon_hours * 3600,
+            )
+            print(f"EPG guidance: {sum(len(v) for v in epg_fixtures.values())} fixture slots on {len(epg_fixtures)} channels.")
+
     scanner = SportsScanner(
         target_channels=targets,
         max_streams_per_channel=args.max_working_streams_per_channel,
@@ -1636,13 +2316,44 @@ def main():
         test_user_agent=args.test_user_agent,
         preserve_existing_streams=args.preserve_existing_streams,
         existing_channels=existing_channels,
+        response_cache=response_cache,
+        snapshot_store=snapshot_store,
+        yield_store=yield_store,
+        match_workers=args.match_workers,
+        parallel_match_threshold=args.parallel_match_threshold,
+        category_filter=category_filter,
+        category_workers=args.category_workers,
+        epg_fixtures=epg_fixtures,
     )
     
     # 4. Run Scan
-    scanner.scan_all(servers)
+    try:
+        scanner.scan_all(servers)
+    finally:
+        scanner.close_match_pool()
+    if response_cache:
+        try:
+            response_cache.save()
+            print(f"HTTP cache stats: {response_cache.stats}")
+        except OSError as e:
+            print(f"Warning: could not persist HTTP response cache index: {e}")
+    if snapshot_store:
+        try:
+            snapshot_store.save()
+        except OSError as e:
+            print(f"Warning: could not persist playlist snapshots: {e}")
+    if yield_store:
+        try:
+            yield_store.save()
+        except OSError as e:
+            print(f"Warning: could not persist server yield history: {e}")
     
     # 5. Save
-    scanner.save(args.output_file, prune_non_target_channels=args.prune_non_target_channels)
+    scanner.save(
+        args.output_file,
+        prune_non_target_channels=args.prune_non_target_channels,
+        store_path=args.channel_store,
+    )
 
 
 if __name__ == '__main__':
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import argparse
 import base64
+import concurrent.futures
 import datetime as dt
 import hashlib
 import hmac
@@ -16,6 +17,7 @@ import json
 import os
 import re
 import sys
+import threading
 import time
 import uuid
 from typing import Dict, List, Optional, Tuple
@@ -26,6 +28,8 @@ from channel_filters import (
     normalize_channel_name,
 )
 from channel_name_placeholders import is_placeholder_channel_name
+from day_store import DAY_STORE_DIR, DayStore, day_store_path, refresh_days
+from http_client import PooledHttpClient
 
 try:
     from zoneinfo import ZoneInfo
@@ -38,6 +42,9 @@ JWT_SECRET = os.getenv("FANZO_JWT_SECRET", "eahjhettffd_aea335232__gsdfds21")
 JWT_DID = os.getenv("FANZO_DEVICE_ID", "7ec16ce4-21f8-42f0-9fef-21cd6cff51eb")
 DEFAULT_UID = int(os.getenv("FANZO_UID", "2"))
 PAGE_LIMIT = 100
+MAX_PAGES_PER_DAY = 50
+DEFAULT_PAGE_WORKERS = 3
+DEFAULT_DAY_WORKERS = 3
 
 MATCH_SPLIT_RE = re.compile(r"\s+(?:v|vs|-)\s+", re.IGNORECASE)
 NON_BROADCAST_WORD_RE = re.compile(
@@ -155,25 +162,48 @@ def build_jwt(uid: int = DEFAULT_UID) -> Tuple[str, int]:
 
 
 class FanzoClient:
-    def __init__(self, locale: str = "en", uid: int = DEFAULT_UID):
+    """
+    FANZO fixtures API client. One instance is safe to share across threads:
+    requests go through a pooled session and all workers use the same JWT,
+    which is rebuilt at most once per expiry or 401.
+    """
+
+    def __init__(
+        self,
+        locale: str = "en",
+        uid: int = DEFAULT_UID,
+        page_workers: int = 1,
+        http_client: Optional[PooledHttpClient] = None,
+    ):
         self.locale = locale
         self.uid = uid
-        self.session = requests.Session()
+        self.page_workers = max(1, int(page_workers))
+        self.session = http_client or PooledHttpClient(retries=2, timeout=30)
         self.jwt_token: Optional[str] = None
         self.jwt_expiry_ms = 0
-
-    def _get_token(self, force_refresh: bool = False) -> str:
-        now_ms = int(time.time() * 1000)
-        if (
-            force_refresh
-            or self.jwt_token is None
-            or now_ms >= (self.jwt_expiry_ms - 30_000)
-        ):
-            self.jwt_token, self.jwt_expiry_ms = build_jwt(self.uid)
-        return self.jwt_token
-
-    def _headers(self, force_refresh: bool = False) -> Dict[str, str]:
-        token = self._get_token(force_refresh=force_refresh)
+        self.token_lock = threading.Lock()
+        self.token_refreshes = 0
+
+    def _get_token(self, force_refresh: bool = False, rejected_token: Optional[str] = None) -> str:
+        """
+        Current JWT, rebuilt when missing or about to expire. `force_refresh`
+        after a 401 passes the rejected token: if another worker already
+        replaced it, that replacement is reused instead of minting another.
+        """
+        with self.token_lock:
+            now_ms = int(time.time() * 1000)
+            if force_refresh and rejected_token is not None and self.jwt_token != rejected_token:
+                force_refresh = False
+            if (
+                force_refresh
+                or self.jwt_token is None
+                or now_ms >= (self.jwt_expiry_ms - 30_000)
+            ):
+                self.jwt_token, self.jwt_expiry_ms = build_jwt(self.uid)
+                self.token_refreshes += 1
+            return self.jwt_token
+
+    def _headers(self, token: str) -> Dict[str, str]:
         return {
             "accept": "application/json",
             "content-type": "application/json",
@@ -185,17 +215,19 @@ class FanzoClient:
         }
 
     def _fetch_page(self, params: Dict[str, object], retry: bool = True) -> Dict:
+        token = self._get_token()
         response = self.session.get(
             API_ENDPOINT,
             params=params,
-            headers=self._headers(force_refresh=False),
+            headers=self._headers(token),
             timeout=30,
         )
         if response.status_code == 401 and retry:
+            token = self._get_token(force_refresh=True, rejected_token=token)
             response = self.session.get(
                 API_ENDPOINT,
                 params=params,
-                headers=self._headers(force_refresh=True),
+                headers=self._headers(token),
                 timeout=30,
             )
         response.raise_for_status()
@@ -205,32 +237,49 @@ class FanzoClient:
         local_midnight = dt.datetime.combine(target_date, dt.time.min, tzinfo=tz)
         local_date_utc = local_midnight.isoformat(timespec="seconds")
 
-        events: List[Dict] = []
-        offset = 0
-        page = 1
-
-        while True:
-            params = {
+        def _params(page_index: int) -> Dict[str, object]:
+            return {
                 "limit": limit,
-                "offset": offset,
+                "offset": page_index * limit,
                 "otherSports": 0,
                 "localDateUtc": local_date_utc,
             }
-            payload = self._fetch_page(params)
-            batch = payload.get("result") or []
-            if not isinstance(batch, list):
-                break
-
-            events.extend(batch)
-            if len(batch) < limit:
-                break
-            offset += limit
-            page += 1
-            if page > 50:
-                break
 
+        events: List[Dict] = []
+        if self.page_workers <= 1:
+            for page_index in range(MAX_PAGES_PER_DAY):
+                batch = self._fetch_page(_params(page_index)).get("result") or []
+                if not isinstance(batch, list):
+                    break
+                events.extend(batch)
+                if len(batch) < limit:
+                    break
+            return events
+
+        # Keep `page_workers` pages in flight ahead of the one being consumed and
+        # stop at the first short page; speculative pages past it are discarded.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.page_workers) as pool:
+            pending: Dict[int, concurrent.futures.Future] = {}
+            next_page = 0
+            try:
+                for page_index in range(MAX_PAGES_PER_DAY):
+                    while next_page < MAX_PAGES_PER_DAY and next_page < page_index + self.page_workers:
+                        pending[next_page] = pool.submit(self._fetch_page, _params(next_page))
+                        next_page += 1
+                    batch = pending.pop(page_index).result().get("result") or []
+                    if not isinstance(batch, list):
+                        break
+                    events.extend(batch)
+                    if len(batch) < limit:
+                        break
+            finally:
+                for future in pending.values():
+                    future.cancel()
         return events
 
+    def close(self) -> None:
+        self.session.close()
+
 
 def pick_team_logo(team: Dict) -> Optional[str]:
     for key in ("logo", "image", "secondaryLogo"):
@@ -367,27 +416,84 @@ def scrape_date(
         print(f"    x FANZO error {formatted_date}: {exc}", flush=True)
         return []
 
+    transformed = transform_events(raw_events, non_soccer_only=non_soccer_only)
+    print(f"    v FANZO kept {len(transformed)} events.", flush=True)
+    return transformed
+
+
+def transform_events(raw_events: List[Dict], non_soccer_only: bool = True) -> List[Dict]:
     transformed = []
     for raw_event in raw_events:
         event = transform_event(raw_event, non_soccer_only=non_soccer_only)
         if event:
             transformed.append(event)
-
-    print(f"    v FANZO kept {len(transformed)} events.", flush=True)
     return transformed
 
 
+def fetch_days_incremental(
+    client: FanzoClient,
+    dates: List[dt.date],
+    tz: dt.tzinfo,
+    day_store: DayStore,
+    non_soccer_only: bool = True,
+    day_workers: int = 1,
+    today: Optional[dt.date] = None,
+) -> Tuple[List[List[Dict]], List[Dict[str, object]]]:
+    """Raw fixture lists are kept per day in `day_store`; only stale days are fetched again."""
+    today = today or dt.datetime.now(dt.timezone.utc).date()
+
+    def fetch(target_date: dt.date) -> List[Dict]:
+        print(f"  > FANZO scraping {target_date.isoformat()}...", flush=True)
+        return client.fetch_day(target_date, tz)
+
+    raw_by_day, day_stats = refresh_days(day_store, dates, fetch, today, workers=day_workers)
+    day_events = []
+    for raw_events, stats in zip(raw_by_day, day_stats):
+        events = transform_events(raw_events or [], non_soccer_only=non_soccer_only)
+        stats["events"] = len(events)
+        if stats.get("error"):
+            print(f"    x FANZO error {stats['date']}: {stats['error']}", flush=True)
+        print(f"    v FANZO kept {len(events)} events ({stats['date']}, {stats['source']}).", flush=True)
+        day_events.append(events)
+    return day_events, day_stats
+
+
 def scrape_range(
     client: FanzoClient,
     start_date: dt.date,
     days: int,
     tz: dt.tzinfo,
     non_soccer_only: bool = True,
+    day_workers: int = 1,
+    day_store: Optional[DayStore] = None,
+    today: Optional[dt.date] = None,
 ) -> Dict:
+    dates = [start_date + dt.timedelta(days=offset) for offset in range(days)]
+    day_stats: Optional[List[Dict[str, object]]] = None
+    if day_store is not None:
+        day_events, day_stats = fetch_days_incremental(
+            client,
+            dates,
+            tz,
+            day_store,
+            non_soccer_only=non_soccer_only,
+            day_workers=day_workers,
+            today=today,
+        )
+    elif day_workers <= 1 or len(dates) <= 1:
+        day_events = [scrape_date(client, current_date, tz, non_soccer_only=non_soccer_only) for current_date in dates]
+    else:
+        # The client (token + pooled session) is shared; output stays in date order.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(day_workers, len(dates))) as pool:
+            day_events = list(
+                pool.map(
+                    lambda current_date: scrape_date(client, current_date, tz, non_soccer_only=non_soccer_only),
+                    dates,
+                )
+            )
+
     schedule = []
-    for offset in range(days):
-        current_date = start_date + dt.timedelta(days=offset)
-        events = scrape_date(client, current_date, tz, non_soccer_only=non_soccer_only)
+    for current_date, events in zip(dates, day_events):
         schedule.append(
             {
                 "date": current_date.strftime("%Y-%m-%d"),
@@ -396,11 +502,14 @@ def scrape_range(
             }
         )
 
-    return {
+    payload = {
         "generated_at": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
         "source": "fanzo.com",
         "schedule": schedule,
     }
+    if day_stats is not None:
+        payload["extraction"] = {"day_stats": day_stats}
+    return payload
 
 
 def parse_cli_args() -> argparse.Namespace:
@@ -410,11 +519,29 @@ def parse_cli_args() -> argparse.Namespace:
     parser.add_argument("--timezone", type=str, default="Europe/London", help="IANA timezone for FANZO localDateUtc.")
     parser.add_argument("--locale", type=str, default="en", help="FANZO locale header.")
     parser.add_argument("--output", type=str, default="weekly_schedule_fanzo.json", help="Output JSON path.")
+    parser.add_argument(
+        "--page-workers",
+        type=int,
+        default=DEFAULT_PAGE_WORKERS,
+        help=f"Fixture pages fetched ahead in parallel per day (default: {DEFAULT_PAGE_WORKERS}).",
+    )
+    parser.add_argument(
+        "--day-workers",
+        type=int,
+        default=DEFAULT_DAY_WORKERS,
+        help=f"Days fetched concurrently (default: {DEFAULT_DAY_WORKERS}).",
+    )
     parser.add_argument(
         "--include-soccer",
         action="store_true",
         help="Include soccer/football events (default: excluded).",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse stored per-day fixtures that are still fresh for their distance from today.",
+    )
+    parser.add_argument("--day-store-dir", type=str, default=DAY_STORE_DIR, help="Per-day payload store directory.")
     return parser.parse_args()
 
 
@@ -431,14 +558,34 @@ def main() -> int:
         return 2
 
     tz = get_timezone(args.timezone)
-    client = FanzoClient(locale=args.locale, uid=DEFAULT_UID)
-    payload = scrape_range(
-        client=client,
-        start_date=start_date,
-        days=args.days,
-        tz=tz,
-        non_soccer_only=not args.include_soccer,
-    )
+    page_workers = max(1, args.page_workers)
+    day_workers = max(1, args.day_workers)
+    http_client = PooledHttpClient(retries=2, timeout=30, pool_maxsize=max(10, page_workers * day_workers))
+    client = FanzoClient(locale=args.locale, uid=DEFAULT_UID, page_workers=page_workers, http_client=http_client)
+    day_store = None
+    if args.incremental:
+        day_store = DayStore(
+            day_store_path("fanzo", args.day_store_dir),
+            variant=f"locale={args.locale};tz={args.timezone};uid={DEFAULT_UID}",
+        )
+    try:
+        payload = scrape_range(
+            client=client,
+            start_date=start_date,
+            days=args.days,
+            tz=tz,
+            non_soccer_only=not args.include_soccer,
+            day_workers=day_workers,
+            day_store=day_store,
+        )
+    finally:
+        http_client.log_timing_report("[FANZO]")
+        client.close()
+    if day_store is not None:
+        try:
+            day_store.save()
+        except OSError as exc:
+            print(f"[FANZO] Failed to save day store: {exc}", file=sys.stderr)
 
     with open(args.output, "w", encoding="utf-8") as handle:
         json.dump(payload, handle, indent=2, ensure_ascii=False)
@@ -9,21 +9,25 @@ It exports schedule data to JSON and CSV.
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import csv
 import datetime as dt
 import json
+import os
 import re
+import time
 import unicodedata
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
-import requests
 from channel_filters import (
     is_usable_channel_name,
     normalize_channel_name,
     select_regional_channel_dicts,
 )
+from day_store import DAY_STORE_DIR, DayStore, day_store_path, plan_days
+from http_client import PooledHttpClient
 
 
 DEFAULT_BASE_PAGE = "https://www.flashscore.com/"
@@ -40,6 +44,13 @@ UA = (
 )
 
 MAX_CHANNELS_PER_EVENT = 4
+DEFAULT_FEED_WORKERS = 4
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_CACHE_PATH = os.path.join(SCRIPT_DIR, ".scrape_cache", "flashscore_config.json")
+CONFIG_CACHE_VERSION = 1
+CONFIG_CACHE_MAX_AGE_SECONDS = 3 * 24 * 3600
+AUTH_FAILURE_STATUS_CODES = (401, 403)
 
 TOP_COMPETITION_EXACT = {
     "england premier league",
@@ -82,6 +93,10 @@ class FlashscoreConfig:
     timezone_hour: int
 
 
+class FeedAuthError(RuntimeError):
+    """The feed rejected the x-fsign signature (401/403 or a non-feed body)."""
+
+
 def iso_z_now() -> str:
     return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
@@ -215,7 +230,7 @@ def extract_feed_sign(core_js: str, config: Dict) -> str:
     return normalize_text(match.group(1))
 
 
-def resolve_flashscore_config(session: requests.Session, base_page: str, timeout: int) -> FlashscoreConfig:
+def resolve_flashscore_config(session: PooledHttpClient, base_page: str, timeout: int) -> FlashscoreConfig:
     page_resp = session.get(base_page, timeout=timeout)
     page_resp.raise_for_status()
     html = page_resp.text
@@ -249,6 +264,80 @@ def resolve_flashscore_config(session: requests.Session, base_page: str, timeout
     )
 
 
+def load_cached_config(
+    path: str,
+    base_page: str,
+    max_age_seconds: int = CONFIG_CACHE_MAX_AGE_SECONDS,
+    now: Optional[float] = None,
+) -> Optional[FlashscoreConfig]:
+    """
+    Return the cached config if it was resolved for `base_page` by this cache
+    version less than `max_age_seconds` ago and every field is present.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("version") != CONFIG_CACHE_VERSION or payload.get("base_page") != base_page:
+        return None
+    resolved_at = payload.get("resolved_at")
+    if not isinstance(resolved_at, (int, float)):
+        return None
+    age = (time.time() if now is None else now) - resolved_at
+    if age < 0 or age >= max_age_seconds:
+        return None
+
+    stored = payload.get("config")
+    if not isinstance(stored, dict):
+        return None
+    values = {}
+    for field in fields(FlashscoreConfig):
+        value = stored.get(field.name)
+        expected = int if field.type in (int, "int") else str
+        if not isinstance(value, expected) or isinstance(value, bool) or value == "":
+            return None
+        values[field.name] = value
+    return FlashscoreConfig(**values)
+
+
+def save_cached_config(path: str, base_page: str, cfg: FlashscoreConfig, now: Optional[float] = None) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = {
+        "version": CONFIG_CACHE_VERSION,
+        "base_page": base_page,
+        "resolved_at": time.time() if now is None else now,
+        "config": asdict(cfg),
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_or_resolve_config(
+    session: PooledHttpClient,
+    base_page: str,
+    timeout: int,
+    cache_path: Optional[str] = CONFIG_CACHE_PATH,
+    force_refresh: bool = False,
+) -> Tuple[FlashscoreConfig, str]:
+    """Return (config, source) where source is "cache" or "resolved"; a resolved config is written back."""
+    if cache_path and not force_refresh:
+        cached = load_cached_config(cache_path, base_page)
+        if cached is not None:
+            return cached, "cache"
+    cfg = resolve_flashscore_config(session, base_page, timeout)
+    if cache_path:
+        try:
+            save_cached_config(cache_path, base_page, cfg)
+        except OSError as exc:
+            print(f"[WARN] Could not write Flashscore config cache {cache_path}: {exc}")
+    return cfg, "resolved"
+
+
 def parse_row_to_map(row: str) -> Dict[str, str]:
     mapped: Dict[str, str] = {}
     for cell in row.split(CELL_DELIMITER):
@@ -428,11 +517,15 @@ def to_slim_events(events: List[Dict[str, object]]) -> List[Dict[str, object]]:
 
 
 def fetch_feed_text(
-    session: requests.Session,
+    session: PooledHttpClient,
     cfg: FlashscoreConfig,
     day_offset: int,
     timeout: int,
 ) -> str:
+    """
+    Fetch one day feed. Raises FeedAuthError when the signature is rejected
+    so the caller can re-resolve the config.
+    """
     feed_name = f"f_1_{day_offset}_{cfg.timezone_hour}_{cfg.lang_web}_{cfg.project_type_id}"
     url = f"{cfg.host}/{cfg.project_id}/x/feed/{feed_name}"
     response = session.get(
@@ -444,8 +537,114 @@ def fetch_feed_text(
         },
         timeout=timeout,
     )
+    if response.status_code in AUTH_FAILURE_STATUS_CODES:
+        raise FeedAuthError(f"Feed {feed_name} rejected the signature (HTTP {response.status_code}).")
     response.raise_for_status()
-    return response.text
+    text = response.text
+    # A stale x-fsign can also be answered with a short non-feed body instead of an error status.
+    if INDEX_DELIMITER not in text:
+        raise FeedAuthError(f"Feed {feed_name} returned a non-feed body ({len(text)} bytes).")
+    return text
+
+
+def fetch_feeds(
+    session: PooledHttpClient,
+    cfg: FlashscoreConfig,
+    day_offsets: List[int],
+    timeout: int,
+    workers: int = DEFAULT_FEED_WORKERS,
+) -> List[Tuple[Optional[str], Optional[Exception]]]:
+    """Fetch day feeds concurrently; returns (text, error) pairs in `day_offsets` order."""
+
+    def fetch(day_offset: int) -> Tuple[Optional[str], Optional[Exception]]:
+        try:
+            return fetch_feed_text(session, cfg, day_offset, timeout), None
+        except Exception as exc:  # noqa: BLE001 - surfaced to the caller per day
+            return None, exc
+
+    workers = max(1, min(int(workers or 1), len(day_offsets) or 1))
+    if workers == 1:
+        return [fetch(day_offset) for day_offset in day_offsets]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fetch, day_offsets))
+
+
+def fetch_feeds_with_config_refresh(
+    session: PooledHttpClient,
+    cfg: FlashscoreConfig,
+    day_offsets: List[int],
+    timeout: int,
+    workers: int = DEFAULT_FEED_WORKERS,
+    refresh_config=None,
+) -> Tuple[FlashscoreConfig, List[str], bool]:
+    """
+    Fetch every day feed. If any day is rejected with FeedAuthError,
+    `refresh_config()` is called once and only the rejected days are
+    fetched again. Returns (config, feed texts in order, refreshed).
+    """
+    results = fetch_feeds(session, cfg, day_offsets, timeout, workers)
+    refreshed = False
+    rejected = [index for index, (_, error) in enumerate(results) if isinstance(error, FeedAuthError)]
+    if rejected and refresh_config is not None:
+        print(f"[INFO] Flashscore rejected {len(rejected)} feed(s); re-resolving config.")
+        cfg = refresh_config()
+        refreshed = True
+        retried = fetch_feeds(session, cfg, [day_offsets[index] for index in rejected], timeout, workers)
+        for index, result in zip(rejected, retried):
+            results[index] = result
+
+    texts: List[str] = []
+    for text, error in results:
+        if error is not None:
+            raise error
+        texts.append(text or "")
+    return cfg, texts, refreshed
+
+
+def feed_variant(cfg: FlashscoreConfig) -> str:
+    """Stored feeds are only reused for the same feed host, project, language and timezone."""
+    return f"{cfg.host}|{cfg.project_id}|{cfg.project_type_id}|{cfg.lang_web}|{cfg.timezone_hour}"
+
+
+def feed_date(cfg: FlashscoreConfig, day_offset: int, now: Optional[float] = None) -> dt.date:
+    """Calendar date a day offset refers to; Flashscore counts days in its own timezone."""
+    utc_now = dt.datetime.fromtimestamp(time.time() if now is None else now, tz=dt.timezone.utc)
+    return (utc_now + dt.timedelta(hours=cfg.timezone_hour)).date() + dt.timedelta(days=day_offset)
+
+
+def fetch_feeds_incremental(
+    session: PooledHttpClient,
+    cfg: FlashscoreConfig,
+    day_offsets: List[int],
+    timeout: int,
+    day_store: DayStore,
+    workers: int = DEFAULT_FEED_WORKERS,
+    refresh_config=None,
+    now: Optional[float] = None,
+) -> Tuple[FlashscoreConfig, List[str], bool, List[Dict[str, object]]]:
+    """
+    Like fetch_feeds_with_config_refresh, but feeds still fresh in `day_store`
+    for their distance from today are reused and only stale days are fetched.
+    Returns (config, feed texts in order, refreshed, per-day store stats).
+    """
+    dates = [feed_date(cfg, day_offset, now) for day_offset in day_offsets]
+    local_today = feed_date(cfg, 0, now)
+    fresh, stale, stats = plan_days(day_store, dates, local_today, now)
+    stale_set = set(stale)
+    stale_offsets = [day_offset for day_offset, date in zip(day_offsets, dates) if date in stale_set]
+
+    refreshed = False
+    if stale_offsets:
+        cfg, texts, refreshed = fetch_feeds_with_config_refresh(
+            session, cfg, stale_offsets, timeout, workers=workers, refresh_config=refresh_config
+        )
+        for day_offset, text in zip(stale_offsets, texts):
+            date = dates[day_offsets.index(day_offset)]
+            day_store.put(date.isoformat(), text, now)
+            fresh[date] = text
+            stats[date]["source"] = "fetched"
+    day_store.prune(local_today)
+    return cfg, [fresh[date] for date in dates], refreshed, [stats[date] for date in dates]
 
 
 def build_csv_rows(events: List[Dict[str, object]]) -> List[Dict[str, object]]:
@@ -492,6 +691,28 @@ def parse_args() -> argparse.Namespace:
         help="Starting day offset. 0=today, 1=tomorrow, -1=yesterday.",
     )
     parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="HTTP timeout in seconds.")
+    parser.add_argument(
+        "--feed-workers",
+        type=int,
+        default=DEFAULT_FEED_WORKERS,
+        help="Day feeds fetched at once over the shared session.",
+    )
+    parser.add_argument(
+        "--config-cache",
+        default=CONFIG_CACHE_PATH,
+        help="Resolved Flashscore config cache file.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse stored day feeds that are still fresh for their distance from today.",
+    )
+    parser.add_argument("--day-store-dir", default=DAY_STORE_DIR, help="Per-day feed store directory.")
+    parser.add_argument(
+        "--no-config-cache",
+        action="store_true",
+        help="Always resolve the config from the base page and core JS.",
+    )
     parser.add_argument(
         "--include-non-top-competitions",
         action="store_true",
@@ -512,17 +733,62 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
-    session = requests.Session()
-    session.headers.update({"user-agent": UA})
+    client = PooledHttpClient(user_agent=UA, timeout=args.timeout, retries=2)
+    cache_path = None if args.no_config_cache else args.config_cache
 
-    cfg = resolve_flashscore_config(session, DEFAULT_BASE_PAGE, args.timeout)
+    cfg, config_source = load_or_resolve_config(client, DEFAULT_BASE_PAGE, args.timeout, cache_path)
+    print(f"[INFO] Flashscore config from {config_source}.")
     top_only = not args.include_non_top_competitions
 
+    def refresh_config() -> FlashscoreConfig:
+        fresh, _ = load_or_resolve_config(client, DEFAULT_BASE_PAGE, args.timeout, cache_path, force_refresh=True)
+        return fresh
+
+    day_offsets = list(range(args.day_start, args.day_start + max(0, args.days)))
+    day_store = None
+    day_stats: List[Dict[str, object]] = []
+    if args.incremental:
+        day_store = DayStore(day_store_path("flashscore", args.day_store_dir), variant=feed_variant(cfg))
+    started = time.perf_counter()
+    try:
+        if day_store is not None:
+            cfg, feed_texts, refreshed, day_stats = fetch_feeds_incremental(
+                client,
+                cfg,
+                day_offsets,
+                args.timeout,
+                day_store,
+                workers=args.feed_workers,
+                refresh_config=refresh_config,
+            )
+        else:
+            cfg, feed_texts, refreshed = fetch_feeds_with_config_refresh(
+                client,
+                cfg,
+                day_offsets,
+                args.timeout,
+                workers=args.feed_workers,
+                refresh_config=refresh_config,
+            )
+    finally:
+        client.log_timing_report("[Flashscore]")
+        client.close()
+    if refreshed:
+        config_source = "refreshed"
+    fetched = sum(1 for stats in day_stats if stats.get("source") == "fetched") if day_store else len(day_offsets)
+    print(
+        f"[INFO] Fetched {fetched}/{len(day_offsets)} day feed(s) in {time.perf_counter() - started:.2f}s."
+    )
+    if day_store is not None:
+        try:
+            day_store.save()
+        except OSError as exc:
+            print(f"[WARN] Could not write Flashscore day store: {exc}")
+
     all_events: List[Dict[str, object]] = []
     day_summaries: List[Dict[str, object]] = []
 
-    for day_offset in range(args.day_start, args.day_start + max(0, args.days)):
-        feed_text = fetch_feed_text(session, cfg, day_offset, args.timeout)
+    for index, (day_offset, feed_text) in enumerate(zip(day_offsets, feed_texts)):
         raw_events = parse_feed_events(feed_text, day_offset)
         if top_only:
             events = [
@@ -542,6 +808,8 @@ def main() -> int:
                 "events_with_channels": with_channels,
             }
         )
+        if day_stats:
+            day_summaries[-1]["feed_source"] = day_stats[index].get("source")
         all_events.extend(events)
 
     slim_events = to_slim_events(all_events)
@@ -556,6 +824,7 @@ def main() -> int:
             "project_type_id": cfg.project_type_id,
             "lang_web": cfg.lang_web,
             "timezone_hour": cfg.timezone_hour,
+            "source": config_source,
         },
         "summary": {
             "days_requested": args.days,
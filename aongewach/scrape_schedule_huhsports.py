@@ -6,6 +6,7 @@ Scrape HuhSports TV Guide and extract teams, team logos, and TV network names.
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import datetime as dt
 import email.utils
 import json
@@ -13,11 +14,13 @@ import os
 import random
 import re
 import sys
+import threading
 import time
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
+from http_client import NO_RETRIES, PooledHttpClient, TokenBucket
 
 
 DEFAULT_URL = "https://www.huhsports.com/tv-guide"
@@ -31,8 +34,14 @@ DEFAULT_HTTP_MAX_BACKOFF_SECONDS = 90.0
 DEFAULT_MIN_REQUEST_INTERVAL_SECONDS = 1.0
 DEFAULT_MAX_PROBE_REQUESTS = 14
 DEFAULT_STOP_PROBING_AFTER_RATE_LIMITS = 2
-DEFAULT_PROXY_MODE = "round_robin"
+DEFAULT_PROXY_MODE = "health"
 DEFAULT_PROBE_HTTP_RETRIES = 1
+DEFAULT_PROBE_WORKERS = 3
+PROXY_QUARANTINE_AFTER_FAILURES = 2
+PROXY_QUARANTINE_BASE_SECONDS = 30.0
+PROXY_QUARANTINE_MAX_SECONDS = 600.0
+PROXY_PROBATION_TRUST = 0.25
+PROXY_EWMA_ALPHA = 0.3
 
 UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -166,17 +175,144 @@ def proxy_label(proxy_url: str) -> str:
     return host
 
 
-def choose_proxy(session: requests.Session, proxy_pool: List[str], proxy_mode: str) -> Optional[str]:
-    if not proxy_pool:
-        return None
-    mode = normalize_text(proxy_mode).lower()
-    if mode == "random":
-        return random.choice(proxy_pool)
-
-    idx = int(getattr(session, "_proxy_index", 0))
-    selected = proxy_pool[idx % len(proxy_pool)]
-    setattr(session, "_proxy_index", idx + 1)
-    return selected
+class RouteHealth:
+    """Latency/failure bookkeeping and rate limiter for one egress route (a proxy, or direct when None)."""
+
+    def __init__(self, proxy_url: Optional[str], min_interval_seconds: float, clock=time.monotonic):
+        self.proxy_url = proxy_url
+        rate = 1.0 / min_interval_seconds if min_interval_seconds > 0 else 0.0
+        self.bucket = TokenBucket(rate=rate, burst=1.0, clock=clock)
+        self.latency_ewma: Optional[float] = None
+        self.failure_ewma = 0.0
+        self.consecutive_failures = 0
+        self.quarantine_count = 0
+        self.quarantined_until = 0.0
+        self.trust = 1.0
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+
+    @property
+    def label(self) -> str:
+        return proxy_label(self.proxy_url) if self.proxy_url else "direct"
+
+    def score(self) -> float:
+        """Lower is better: expected latency inflated by failure rate, probation and current load."""
+        latency = self.latency_ewma if self.latency_ewma is not None else 1.0
+        return latency * (1.0 + 4.0 * self.failure_ewma) * (1.0 + self.in_flight) / self.trust
+
+
+class ProxyPool:
+    """
+    Thread-safe route picker with health feedback.
+
+    Each proxy is scored by latency and failure-rate EWMAs. Repeated failures,
+    or a 429 carrying Retry-After, quarantine the proxy with a doubling
+    cooldown. A released proxy comes back on probation: low trust and at most
+    one request in flight, regaining full trust over a few successes. With no
+    proxies configured a single direct route is used, so the token bucket and
+    Retry-After handling apply the same way.
+    """
+
+    def __init__(
+        self,
+        proxy_urls: List[str],
+        mode: str = DEFAULT_PROXY_MODE,
+        min_interval_seconds: float = DEFAULT_MIN_REQUEST_INTERVAL_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.mode = normalize_text(mode).lower() or DEFAULT_PROXY_MODE
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.routes = [RouteHealth(url, min_interval_seconds, clock) for url in (proxy_urls or [None])]
+        self.cursor = 0
+
+    def _available(self, now: float) -> List[RouteHealth]:
+        available = []
+        for route in self.routes:
+            if route.quarantined_until > now:
+                continue
+            if route.trust < 1.0 and route.in_flight > 0:
+                continue
+            available.append(route)
+        return available
+
+    def healthy_count(self) -> int:
+        with self.lock:
+            return len(self._available(self.clock()))
+
+    def acquire(self) -> Tuple[RouteHealth, float]:
+        """Pick a route and mark it in flight; returns (route, seconds until its quarantine ends)."""
+        with self.lock:
+            now = self.clock()
+            candidates = self._available(now)
+            if not candidates:
+                # Everything is cooling down: take the route released soonest.
+                route = min(self.routes, key=lambda item: (item.quarantined_until, item.in_flight))
+            elif self.mode == "random":
+                route = random.choice(candidates)
+            elif self.mode == "round_robin":
+                route = candidates[self.cursor % len(candidates)]
+                self.cursor += 1
+            else:
+                route = min(candidates, key=lambda item: (item.score(), self.routes.index(item)))
+            route.in_flight += 1
+            return route, max(0.0, route.quarantined_until - now)
+
+    def release(self, route: RouteHealth) -> None:
+        with self.lock:
+            route.in_flight = max(0, route.in_flight - 1)
+
+    def record_success(self, route: RouteHealth, latency_seconds: float) -> None:
+        with self.lock:
+            route.successes += 1
+            route.consecutive_failures = 0
+            if route.latency_ewma is None:
+                route.latency_ewma = latency_seconds
+            else:
+                route.latency_ewma += PROXY_EWMA_ALPHA * (latency_seconds - route.latency_ewma)
+            route.failure_ewma *= 1.0 - PROXY_EWMA_ALPHA
+            route.trust = min(1.0, route.trust + PROXY_PROBATION_TRUST)
+            if route.trust >= 1.0:
+                route.quarantine_count = 0
+
+    def record_failure(self, route: RouteHealth, retry_after: Optional[float] = None) -> None:
+        with self.lock:
+            route.failures += 1
+            route.consecutive_failures += 1
+            route.failure_ewma += PROXY_EWMA_ALPHA * (1.0 - route.failure_ewma)
+            if retry_after is not None:
+                route.bucket.defer(retry_after)
+            if len(self.routes) == 1:
+                # The direct route cannot be swapped out; only its bucket slows down.
+                return
+            if retry_after is None and route.consecutive_failures < PROXY_QUARANTINE_AFTER_FAILURES:
+                return
+            cooldown = min(
+                PROXY_QUARANTINE_MAX_SECONDS,
+                PROXY_QUARANTINE_BASE_SECONDS * (2 ** route.quarantine_count),
+            )
+            route.quarantined_until = self.clock() + max(cooldown, retry_after or 0.0)
+            route.quarantine_count += 1
+            route.consecutive_failures = 0
+            route.trust = PROXY_PROBATION_TRUST
+
+    def report(self) -> List[Dict[str, object]]:
+        with self.lock:
+            now = self.clock()
+            return [
+                {
+                    "route": route.label,
+                    "successes": route.successes,
+                    "failures": route.failures,
+                    "latency_ewma_seconds": round(route.latency_ewma, 3) if route.latency_ewma is not None else None,
+                    "failure_ewma": round(route.failure_ewma, 3),
+                    "trust": round(route.trust, 2),
+                    "quarantined_seconds_left": round(max(0.0, route.quarantined_until - now), 1),
+                    "limiter": route.bucket.snapshot(),
+                }
+                for route in self.routes
+            ]
 
 
 def parse_start_date(raw: Optional[str]) -> dt.date:
@@ -587,90 +723,87 @@ def parse_retry_after_seconds(value: object) -> Optional[float]:
     return max(0.0, delay)
 
 
-def _enforce_request_spacing(session: requests.Session, min_interval_seconds: float) -> None:
-    if min_interval_seconds <= 0:
-        return
-    last_ts = float(getattr(session, "_last_request_monotonic", 0.0))
-    now = time.monotonic()
-    wait_for = (last_ts + min_interval_seconds) - now
-    if wait_for > 0:
-        time.sleep(wait_for)
-
-
-def _mark_request_time(session: requests.Session) -> None:
-    setattr(session, "_last_request_monotonic", time.monotonic())
-
-
 def fetch_url(
-    session: requests.Session,
+    session: PooledHttpClient,
     url: str,
     timeout: int,
     retries: int,
     backoff_seconds: float,
     max_backoff_seconds: float,
-    min_interval_seconds: float,
-    proxy_pool: List[str],
-    proxy_mode: str,
+    proxies: ProxyPool,
 ) -> requests.Response:
     max_attempts = max(1, int(retries))
 
     for attempt in range(1, max_attempts + 1):
-        _enforce_request_spacing(session, min_interval_seconds)
-        proxy_url = choose_proxy(session, proxy_pool, proxy_mode)
-        request_kwargs = {}
-        if proxy_url:
-            request_kwargs["proxies"] = {"http": proxy_url, "https": proxy_url}
-
+        route, quarantine_wait = proxies.acquire()
         try:
-            response = session.get(url, timeout=max(1, timeout), **request_kwargs)
-        except requests.RequestException as exc:
-            _mark_request_time(session)
-            if attempt >= max_attempts:
-                raise FetchError(f"Request error for {url}: {sanitize_error_text(exc)}") from exc
-            delay = min(max_backoff_seconds, backoff_seconds * (2 ** (attempt - 1))) + random.uniform(0.15, 0.85)
-            proxy_suffix = f" via {proxy_label(proxy_url)}" if proxy_url else ""
-            print(
-                f"[HuhSports] request error on attempt {attempt}/{max_attempts} for {url}{proxy_suffix}; retrying in {delay:.1f}s...",
-                flush=True,
-            )
-            time.sleep(delay)
-            continue
-
-        _mark_request_time(session)
-        status = int(response.status_code)
-        if 200 <= status < 300:
-            return response
+            if quarantine_wait > 0:
+                time.sleep(min(max_backoff_seconds, quarantine_wait))
+            route.bucket.acquire()
+            request_kwargs = {}
+            if route.proxy_url:
+                request_kwargs["proxies"] = {"http": route.proxy_url, "https": route.proxy_url}
+            proxy_suffix = f" via {route.label}" if route.proxy_url else ""
+
+            started = time.monotonic()
+            try:
+                response = session.get(url, timeout=max(1, timeout), **request_kwargs)
+            except requests.RequestException as exc:
+                proxies.record_failure(route)
+                if attempt >= max_attempts:
+                    raise FetchError(f"Request error for {url}: {sanitize_error_text(exc)}") from exc
+                delay = min(max_backoff_seconds, backoff_seconds * (2 ** (attempt - 1))) + random.uniform(0.15, 0.85)
+                print(
+                    f"[HuhSports] request error on attempt {attempt}/{max_attempts} for {url}{proxy_suffix}; retrying in {delay:.1f}s...",
+                    flush=True,
+                )
+                time.sleep(delay)
+                continue
 
-        retryable = status in {429, 500, 502, 503, 504}
-        if retryable and attempt < max_attempts:
-            retry_after = parse_retry_after_seconds(response.headers.get("Retry-After"))
+            status = int(response.status_code)
+            if 200 <= status < 300:
+                proxies.record_success(route, time.monotonic() - started)
+                return response
+
+            retryable = status in {429, 500, 502, 503, 504}
+            if not retryable and status != 403:
+                # The route delivered an answer; a 404 or similar says nothing about proxy health.
+                proxies.record_success(route, time.monotonic() - started)
+                raise FetchError(f"HTTP {status} for {url}", status_code=status)
+            retry_after = parse_retry_after_seconds(response.headers.get("Retry-After")) if retryable else None
             if retry_after is not None:
-                delay = min(max_backoff_seconds, retry_after)
-            else:
-                delay = min(max_backoff_seconds, backoff_seconds * (2 ** (attempt - 1))) + random.uniform(0.15, 0.85)
-            proxy_suffix = f" via {proxy_label(proxy_url)}" if proxy_url else ""
-            print(
-                f"[HuhSports] HTTP {status} on attempt {attempt}/{max_attempts} for {url}{proxy_suffix}; retrying in {delay:.1f}s...",
-                flush=True,
-            )
-            time.sleep(delay)
-            continue
+                retry_after = min(max_backoff_seconds, retry_after)
+            # Retry-After defers the route's bucket, so the next attempt waits there (or moves to another proxy).
+            proxies.record_failure(route, retry_after=retry_after)
+            if retryable and attempt < max_attempts:
+                if retry_after is not None:
+                    delay_text = f"Retry-After {retry_after:.1f}s"
+                else:
+                    delay = min(max_backoff_seconds, backoff_seconds * (2 ** (attempt - 1))) + random.uniform(0.15, 0.85)
+                    delay_text = f"{delay:.1f}s"
+                print(
+                    f"[HuhSports] HTTP {status} on attempt {attempt}/{max_attempts} for {url}{proxy_suffix}; retrying after {delay_text}...",
+                    flush=True,
+                )
+                if retry_after is None:
+                    time.sleep(delay)
+                continue
 
-        raise FetchError(f"HTTP {status} for {url}", status_code=status)
+            raise FetchError(f"HTTP {status} for {url}", status_code=status)
+        finally:
+            proxies.release(route)
 
     raise FetchError(f"Exhausted retries for {url}")
 
 
 def scrape_page(
-    session: requests.Session,
+    session: PooledHttpClient,
     url: str,
     timeout: int,
     retries: int,
     backoff_seconds: float,
     max_backoff_seconds: float,
-    min_interval_seconds: float,
-    proxy_pool: List[str],
-    proxy_mode: str,
+    proxies: ProxyPool,
 ) -> Tuple[List[Dict], List[Dict], str]:
     response = fetch_url(
         session=session,
@@ -679,9 +812,7 @@ def scrape_page(
         retries=retries,
         backoff_seconds=backoff_seconds,
         max_backoff_seconds=max_backoff_seconds,
-        min_interval_seconds=min_interval_seconds,
-        proxy_pool=proxy_pool,
-        proxy_mode=proxy_mode,
+        proxies=proxies,
     )
     html = response.text
 
@@ -698,6 +829,108 @@ def scrape_page(
     return leagues, matches, response.url
 
 
+def probe_requested_dates(
+    session: PooledHttpClient,
+    url: str,
+    requested_dates: List[dt.date],
+    timeout: int,
+    retries: int,
+    backoff_seconds: float,
+    max_backoff_seconds: float,
+    proxies: ProxyPool,
+    max_probe_requests: int,
+    stop_probing_after_rate_limits: int,
+    workers: int = DEFAULT_PROBE_WORKERS,
+) -> Dict[str, object]:
+    """
+    Try the date-specific URLs for every requested date, `workers` dates at a
+    time. Within a date the probe URLs are still tried in order until one
+    returns that date. The request budget and the 429 stop rule are shared by
+    all workers; matches and attempted URLs are returned in date order.
+    """
+    lock = threading.Lock()
+    state = {"requests_used": 0, "rate_limit_hits": 0, "stop": False}
+
+    def reserve_request() -> bool:
+        with lock:
+            if state["stop"]:
+                return False
+            if state["requests_used"] >= max_probe_requests:
+                state["stop"] = True
+                return False
+            state["requests_used"] += 1
+            return True
+
+    def probe_date(target_date: dt.date) -> Tuple[List[str], List[Dict], Optional[str]]:
+        target_iso = target_date.isoformat()
+        attempted: List[str] = []
+        matches: List[Dict] = []
+        for probe_url in build_probe_urls_for_date(url, target_date):
+            if probe_url == url:
+                continue
+            if not reserve_request():
+                break
+            attempted.append(probe_url)
+            try:
+                _, probe_matches, _ = scrape_page(
+                    session=session,
+                    url=probe_url,
+                    timeout=timeout,
+                    retries=retries,
+                    backoff_seconds=backoff_seconds,
+                    max_backoff_seconds=max_backoff_seconds,
+                    proxies=proxies,
+                )
+            except Exception as exc:
+                if getattr(exc, "status_code", None) == 429:
+                    with lock:
+                        state["rate_limit_hits"] += 1
+                        limit_reached = (
+                            stop_probing_after_rate_limits > 0
+                            and state["rate_limit_hits"] >= stop_probing_after_rate_limits
+                        )
+                        newly_stopped = limit_reached and not state["stop"]
+                        if limit_reached:
+                            state["stop"] = True
+                    if newly_stopped:
+                        print(
+                            "[HuhSports] probe rate-limited repeatedly; stopping extra probe requests for this run.",
+                            flush=True,
+                        )
+                    if limit_reached:
+                        break
+                continue
+
+            matches.extend(probe_matches)
+            if target_iso in extract_match_dates(probe_matches):
+                return attempted, matches, probe_url
+        return attempted, matches, None
+
+    workers = max(1, min(int(workers or 1), len(requested_dates) or 1))
+    if workers == 1:
+        results = [probe_date(target_date) for target_date in requested_dates]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(probe_date, requested_dates))
+
+    attempted_urls: List[str] = []
+    combined: List[Dict] = []
+    hits: Dict[str, Optional[str]] = {}
+    for target_date, (attempted, matches, hit_url) in zip(requested_dates, results):
+        attempted_urls.extend(attempted)
+        combined.extend(matches)
+        hits[target_date.isoformat()] = hit_url
+
+    return {
+        "matches": combined,
+        "attempted_urls": attempted_urls,
+        "hits": hits,
+        "requests_used": state["requests_used"],
+        "rate_limit_hits": state["rate_limit_hits"],
+        "truncated": state["stop"],
+    }
+
+
 def build_payload(
     url: str,
     matches: List[Dict],
@@ -832,9 +1065,12 @@ def parse_cli_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--proxy-mode",
-        choices=["round_robin", "random"],
+        choices=["health", "round_robin", "random"],
         default=os.getenv("HUHSPORTS_PROXY_MODE", DEFAULT_PROXY_MODE),
-        help="Proxy rotation strategy when multiple proxies are supplied.",
+        help=(
+            "Proxy selection when multiple proxies are supplied. `health` prefers the lowest latency/failure "
+            "score; every mode skips quarantined proxies."
+        ),
     )
     parser.add_argument(
         "--fallback-file",
@@ -875,7 +1111,13 @@ def parse_cli_args() -> argparse.Namespace:
         "--min-request-interval-seconds",
         type=float,
         default=env_float("HUHSPORTS_MIN_REQUEST_INTERVAL_SECONDS", DEFAULT_MIN_REQUEST_INTERVAL_SECONDS),
-        help="Minimum spacing between HTTP requests to reduce rate-limit pressure.",
+        help="Token-bucket spacing between requests on each route (direct or per proxy).",
+    )
+    parser.add_argument(
+        "--probe-workers",
+        type=int,
+        default=env_int("HUHSPORTS_PROBE_WORKERS", DEFAULT_PROBE_WORKERS),
+        help="Requested dates probed at once across healthy proxies.",
     )
     parser.add_argument(
         "--max-probe-requests",
@@ -928,6 +1170,7 @@ def run(
     min_request_interval_seconds: float,
     max_probe_requests: int,
     stop_probing_after_rate_limits: int,
+    probe_workers: int = DEFAULT_PROBE_WORKERS,
 ) -> int:
     days = max(1, int(days))
     http_retries = max(1, int(http_retries))
@@ -939,22 +1182,24 @@ def run(
     stop_probing_after_rate_limits = max(0, int(stop_probing_after_rate_limits))
     proxy_mode = normalize_text(proxy_mode).lower() or DEFAULT_PROXY_MODE
 
-    session = requests.Session()
-    session.headers.update(
-        {
-            "User-Agent": UA,
+    # Retries stay in fetch_url so each attempt can move to another proxy.
+    session = PooledHttpClient(
+        user_agent=UA,
+        timeout=timeout,
+        retry_policy=NO_RETRIES,
+        headers={
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9",
             "Cache-Control": "no-cache",
             "Pragma": "no-cache",
-            "Connection": "keep-alive",
-        }
+        },
     )
 
     fallback_path = normalize_text(fallback_file) or output
     proxy_pool = load_proxy_pool(proxy_file=proxy_file, proxy_list=proxy_list)
     if proxy_pool:
         print(f"[HuhSports] Using {len(proxy_pool)} proxies (mode={proxy_mode}).", flush=True)
+    proxies = ProxyPool(proxy_pool, mode=proxy_mode, min_interval_seconds=min_request_interval_seconds)
 
     try:
         base_leagues, base_matches, final_base_url = scrape_page(
@@ -964,9 +1209,7 @@ def run(
             retries=http_retries,
             backoff_seconds=http_backoff_seconds,
             max_backoff_seconds=http_max_backoff_seconds,
-            min_interval_seconds=min_request_interval_seconds,
-            proxy_pool=proxy_pool,
-            proxy_mode=proxy_mode,
+            proxies=proxies,
         )
     except Exception as exc:
         # Fail-open for transient fetch/rate-limit issues so the wider pipeline can proceed.
@@ -1015,63 +1258,25 @@ def run(
     requested_dates = [start_date + dt.timedelta(days=offset) for offset in range(days)]
     requested_date_set = {date.isoformat() for date in requested_dates}
 
-    attempted_urls: List[str] = [url]
-    attempted_url_set: Set[str] = {url}
-    probe_hits: Dict[str, Optional[str]] = {}
-    probe_requests_used = 0
-    probe_rate_limit_hits = 0
-    stop_probing = False
-
-    for target_date in requested_dates:
-        target_iso = target_date.isoformat()
-        hit_url: Optional[str] = None
-
-        if stop_probing:
-            probe_hits[target_iso] = None
-            continue
-
-        for probe_url in build_probe_urls_for_date(url, target_date):
-            if probe_requests_used >= max_probe_requests:
-                stop_probing = True
-                break
-            if probe_url in attempted_url_set:
-                continue
-            attempted_url_set.add(probe_url)
-            attempted_urls.append(probe_url)
-            probe_requests_used += 1
-
-            try:
-                _, probe_matches, _ = scrape_page(
-                    session=session,
-                    url=probe_url,
-                    timeout=timeout,
-                    retries=probe_http_retries,
-                    backoff_seconds=http_backoff_seconds,
-                    max_backoff_seconds=http_max_backoff_seconds,
-                    min_interval_seconds=min_request_interval_seconds,
-                    proxy_pool=proxy_pool,
-                    proxy_mode=proxy_mode,
-                )
-            except Exception as exc:
-                status_code = getattr(exc, "status_code", None)
-                if status_code == 429:
-                    probe_rate_limit_hits += 1
-                    if stop_probing_after_rate_limits > 0 and probe_rate_limit_hits >= stop_probing_after_rate_limits:
-                        print(
-                            "[HuhSports] probe rate-limited repeatedly; stopping extra probe requests for this run.",
-                            flush=True,
-                        )
-                        stop_probing = True
-                        break
-                continue
-
-            combined_matches.extend(probe_matches)
-            probe_dates = extract_match_dates(probe_matches)
-            if target_iso in probe_dates:
-                hit_url = probe_url
-                break
-
-        probe_hits[target_iso] = hit_url
+    probe = probe_requested_dates(
+        session=session,
+        url=url,
+        requested_dates=requested_dates,
+        timeout=timeout,
+        retries=probe_http_retries,
+        backoff_seconds=http_backoff_seconds,
+        max_backoff_seconds=http_max_backoff_seconds,
+        proxies=proxies,
+        max_probe_requests=max_probe_requests,
+        stop_probing_after_rate_limits=stop_probing_after_rate_limits,
+        workers=probe_workers,
+    )
+    combined_matches.extend(probe["matches"])
+    attempted_urls: List[str] = [url] + probe["attempted_urls"]
+    probe_hits: Dict[str, Optional[str]] = probe["hits"]
+    probe_requests_used = probe["requests_used"]
+    probe_rate_limit_hits = probe["rate_limit_hits"]
+    stop_probing = probe["truncated"]
 
     merged_matches = sort_matches(merge_match_list(combined_matches))
     merged_dates = extract_match_dates(merged_matches)
@@ -1099,7 +1304,9 @@ def run(
     probe_meta["probe_requests_used"] = probe_requests_used
     probe_meta["probe_rate_limit_hits"] = probe_rate_limit_hits
     probe_meta["probe_truncated"] = stop_probing
+    probe_meta["probe_workers"] = probe_workers
     probe_meta["fallback_used"] = False
+    payload["routes"] = proxies.report()
 
     persist_payload(output, payload)
 
@@ -1114,6 +1321,7 @@ def run(
     print(f"Total matches returned: {len(final_matches)}")
     print(f"Unique teams: {unique_team_count} | Unique TV names: {unique_tv_count}")
     print(f"Wrote output to: {output}")
+    session.log_timing_report("[HuhSports]")
 
     if sample > 0 and final_matches:
         print("\nSample matches:")
@@ -1151,6 +1359,7 @@ def main() -> int:
             min_request_interval_seconds=max(0.0, float(args.min_request_interval_seconds)),
             max_probe_requests=max(0, int(args.max_probe_requests)),
             stop_probing_after_rate_limits=max(0, int(args.stop_probing_after_rate_limits)),
+            probe_workers=max(1, int(args.probe_workers)),
         )
     except ValueError as exc:
         print(f"Invalid argument: {exc}", file=sys.stderr)
@@ -30,6 +30,8 @@ import sys
 import threading
 import time
 from dataclasses import dataclass
+from html import escape as html_escape
+from html.parser import HTMLParser
 from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import quote, unquote, urljoin, urlparse
 
@@ -42,6 +44,8 @@ from channel_selection import (
     build_channel_candidates,
     merge_channel_candidates,
 )
+from http_client import RETRY_STATUS_CODES, HostRateLimiter, PooledHttpClient, RetryPolicy
+from response_cache import ResponseCache, fetch_with_cache
 
 try:
     from zoneinfo import ZoneInfo
@@ -70,6 +74,22 @@ CHANNEL_TEXT_SPLIT_RE = re.compile(r"\s*,\s*")
 
 _PARSER = "lxml"
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MATCH_PAGE_CACHE_DIR = os.path.join(SCRIPT_DIR, ".scrape_cache", "livesporttv_match_pages")
+MATCH_PAGE_CACHE_MAX_MB = 256
+# Bump when the match-page extraction changes so cached payloads are re-parsed.
+MATCH_PAGE_PARSER_VERSION = 1
+# (hours until kickoff, seconds a cached match-page payload stays fresh), checked in order.
+MATCH_PAGE_TTL_STEPS = (
+    (2.0, 0),
+    (12.0, 3600),
+    (48.0, 4 * 3600),
+    (96.0, 12 * 3600),
+)
+MATCH_PAGE_FAR_TTL_SECONDS = 24 * 3600
+MATCH_PAGE_UNKNOWN_KICKOFF_TTL_SECONDS = 6 * 3600
+# Broadcaster lists are settled once a match is over.
+MATCH_PAGE_SETTLED_AFTER_HOURS = 4.0
+MATCH_PAGE_SETTLED_TTL_SECONDS = 7 * 24 * 3600
 
 
 def parse_html(html: str) -> BeautifulSoup:
@@ -81,6 +101,178 @@ def parse_html(html: str) -> BeautifulSoup:
         return BeautifulSoup(html, _PARSER)
 
 
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+
+def _class_set(attrs: Dict[str, Optional[str]]) -> set:
+    return set((attrs.get("class") or "").split())
+
+
+def _clone_tag(tag: str, attrs: Dict[str, Optional[str]]) -> str:
+    rendered = "".join(
+        f" {name}" if value is None else f' {name}="{html_escape(value, quote=True)}"'
+        for name, value in attrs.items()
+    )
+    if tag in VOID_TAGS:
+        return f"<{tag}{rendered}>"
+    return f"<{tag}{rendered}></{tag}>"
+
+
+class _SubtreeExtractor(HTMLParser):
+    """
+    Streams a page once and keeps only the source of the subtrees `classify`
+    selects (outermost only), plus attribute-only clones from `clone`. The
+    kept markup is re-parsed by parse_html, so the existing selectors run on
+    a document a few percent the size of the page.
+    """
+
+    def __init__(self, html: str) -> None:
+        super().__init__(convert_charrefs=True)
+        self.html = html
+        self.line_starts = [0] + [match.end() for match in re.finditer("\n", html)]
+        self.stack: List[Tuple[str, int, Optional[str], set]] = []
+        self.open_scopes: Dict[str, int] = {}
+        self.capture_depth = 0
+        self.fragments: List[Tuple[str, str]] = []
+
+    def classify(self, tag: str, attrs: Dict[str, Optional[str]]) -> Optional[str]:
+        return None
+
+    def clone(self, tag: str, attrs: Dict[str, Optional[str]]) -> Optional[Tuple[str, str]]:
+        return None
+
+    def scopes(self, tag: str, attrs: Dict[str, Optional[str]]) -> set:
+        return set()
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        attributes: Dict[str, Optional[str]] = {}
+        for name, value in attrs:
+            attributes.setdefault(name, value)
+        group = None
+        if self.capture_depth == 0:
+            group = self.classify(tag, attributes)
+            if group is None:
+                cloned = self.clone(tag, attributes)
+                if cloned is not None:
+                    self.fragments.append(cloned)
+        if tag in VOID_TAGS:
+            if group is not None:
+                self.fragments.append((group, self.get_starttag_text() or ""))
+            return
+        scopes = self.scopes(tag, attributes)
+        for scope in scopes:
+            self.open_scopes[scope] = self.open_scopes.get(scope, 0) + 1
+        # Source offsets are only needed where a kept subtree starts.
+        self.stack.append((tag, self._offset() if group is not None else -1, group, scopes))
+        if group is not None:
+            self.capture_depth += 1
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        # HTML ignores the self-closing slash on non-void elements.
+        self.handle_starttag(tag, attrs)
+
+    def _pop(self, end: int, closed: bool, unclosed: List[str]) -> None:
+        tag, start, group, scopes = self.stack.pop()
+        for scope in scopes:
+            self.open_scopes[scope] -= 1
+        if not closed and self.capture_depth > 0:
+            unclosed.append(tag)
+        if group is not None:
+            self.capture_depth -= 1
+            # Close whatever the page left open so the kept markup cannot swallow later fragments.
+            closing = "" if closed else "".join(f"</{name}>" for name in unclosed)
+            self.fragments.append((group, self.html[start:end] + closing))
+            unclosed.clear()
+
+    def handle_endtag(self, tag: str) -> None:
+        if not any(entry[0] == tag for entry in self.stack):
+            return
+        end_tag_start = end_tag_end = -1
+        if self.capture_depth > 0:
+            end_tag_start = self._offset()
+            end_tag_end = self.html.find(">", end_tag_start) + 1 or len(self.html)
+        unclosed: List[str] = []
+        while self.stack:
+            closes = self.stack[-1][0] == tag
+            # Elements left open by this end tag end where it starts.
+            self._pop(end_tag_end if closes else end_tag_start, closes, unclosed)
+            if closes:
+                break
+
+    def extract(self) -> List[Tuple[str, str]]:
+        self.feed(self.html)
+        self.close()
+        unclosed: List[str] = []
+        while self.stack:
+            self._pop(len(self.html), False, unclosed)
+        return self.fragments
+
+
+class ScheduleFragmentExtractor(_SubtreeExtractor):
+    """Match rows (`[data-match]`) plus sport-map, comp_ignore and tournament attributes."""
+
+    def classify(self, tag: str, attrs: Dict[str, Optional[str]]) -> Optional[str]:
+        return "match" if "data-match" in attrs else None
+
+    def clone(self, tag: str, attrs: Dict[str, Optional[str]]) -> Optional[Tuple[str, str]]:
+        if tag == "div" and (attrs.get("id") or "").startswith("list-sport-") and "data-multisite_sport" in attrs:
+            return "sport", _clone_tag(tag, attrs)
+        if tag == "input" and "comp_ignore" in _class_set(attrs):
+            return "comp_ignore", _clone_tag(tag, attrs)
+        if tag == "li" and all(
+            name in attrs
+            for name in ("data-request_id", "data-create_time", "data-expire_time", "data-order_by", "data-time_zone")
+        ):
+            return "tournament", _clone_tag(tag, attrs)
+        return None
+
+
+class MatchPageFragmentExtractor(_SubtreeExtractor):
+    """International rows under `.inter_nation` and channel boxes under `.live_time`."""
+
+    def scopes(self, tag: str, attrs: Dict[str, Optional[str]]) -> set:
+        return _class_set(attrs) & {"inter_nation", "live_time"}
+
+    def classify(self, tag: str, attrs: Dict[str, Optional[str]]) -> Optional[str]:
+        classes = _class_set(attrs)
+        if "list-tv-international" in classes and self.open_scopes.get("inter_nation"):
+            return "inter_nation"
+        if "live-tv-list-box" in classes and self.open_scopes.get("live_time"):
+            return "live_time"
+        return None
+
+
+def parse_schedule_html(html: str, fast: bool = False) -> BeautifulSoup:
+    """
+    Soup holding what the schedule selectors read: the full page, or with
+    `fast` (--fast-html, opt-in) the page reduced to those nodes before the
+    soup is built.
+    """
+    if not fast:
+        return parse_html(html)
+    fragments = ScheduleFragmentExtractor(html).extract()
+    return parse_html("".join(markup for _, markup in fragments))
+
+
+def parse_match_page_html(html: str, fast: bool = False) -> BeautifulSoup:
+    """Soup holding the match page's channel rows; the full page when `fast` is off."""
+    if not fast:
+        return parse_html(html)
+    fragments = MatchPageFragmentExtractor(html).extract()
+    parts = []
+    for scope in ("inter_nation", "live_time"):
+        rows = "".join(markup for group, markup in fragments if group == scope)
+        parts.append(f'<div class="{scope}">{rows}</div>')
+    return parse_html("".join(parts))
+
+
 @dataclass(frozen=True)
 class TournamentRequest:
     request_id: str
@@ -104,30 +296,69 @@ class TournamentRequest:
         return payload
 
 
+def _create_scraper_session():
+    return cloudscraper.create_scraper(browser={"browser": "chrome", "platform": "windows", "mobile": False})
+
+
 class LiveSportTVClient:
-    def __init__(self, timeout: int = 45, retries: int = 4, backoff_seconds: float = 1.75):
+    def __init__(
+        self,
+        timeout: int = 45,
+        retries: int = 4,
+        backoff_seconds: float = 1.75,
+        limiter: Optional[HostRateLimiter] = None,
+        http: Optional[PooledHttpClient] = None,
+    ):
         self.timeout = timeout
         self.retries = max(1, retries)
         self.backoff_seconds = max(0.0, backoff_seconds)
-        self.session = cloudscraper.create_scraper(
-            browser={"browser": "chrome", "platform": "windows", "mobile": False}
+        self.limiter = limiter
+        # 429/5xx are retried by urllib3; 403 is retried in _get_response, above
+        # CloudScraper.request(), so cloudscraper's challenge handling sees it first.
+        self.http = http or PooledHttpClient(
+            user_agent=None,
+            timeout=timeout,
+            retry_policy=RetryPolicy(
+                total=self.retries - 1,
+                backoff_factor=self.backoff_seconds,
+                status_forcelist=RETRY_STATUS_CODES,
+            ),
+            limiter=limiter,
+            session_factory=_create_scraper_session,
+        )
+        self.session = self.http.session
+
+    def clone(self) -> "LiveSportTVClient":
+        """Fresh session with the same settings; the rate limiter and timing metrics stay shared."""
+        return LiveSportTVClient(
+            timeout=self.timeout,
+            retries=self.retries,
+            backoff_seconds=self.backoff_seconds,
+            limiter=self.limiter,
+            http=self.http.clone(),
         )
 
-    def _get_text(self, url: str, params: Optional[Dict[str, str]] = None) -> str:
-        last_exc: Optional[Exception] = None
+    def _get_response(
+        self,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
         for attempt in range(1, self.retries + 1):
             try:
-                response = self.session.get(url, params=params, timeout=self.timeout)
+                response = self.http.get(url, params=params, headers=headers, timeout=self.timeout)
+                # Cloudflare answers a stale clearance with 403; a new request re-runs the challenge.
+                if response.status_code == 403 and attempt < self.retries:
+                    time.sleep(self.backoff_seconds * attempt)
+                    continue
                 response.raise_for_status()
-                return response.text
             except Exception as exc:
-                last_exc = exc
-                if attempt >= self.retries:
-                    break
-                time.sleep(self.backoff_seconds * attempt)
-        if last_exc is None:
-            raise RuntimeError(f"Request failed for {url}")
-        raise RuntimeError(f"Request failed for {url}: {last_exc}") from last_exc
+                raise RuntimeError(f"Request failed for {url}: {exc}") from exc
+            return response
+        raise RuntimeError(f"Request failed for {url}")
+
+    def _get_text(self, url: str, params: Optional[Dict[str, str]] = None) -> str:
+        return self._get_response(url, params=params).text
 
     def get_schedule_html(
         self, target_date: dt.date, extra_params: Optional[Dict[str, str]] = None
@@ -154,6 +385,50 @@ class LiveSportTVClient:
         return payload
 
 
+def thread_client(client: LiveSportTVClient) -> LiveSportTVClient:
+    """Per-thread clone of `client` (cloudscraper sessions are not shared across worker threads)."""
+    thread_state = threading.current_thread()
+    local_client = getattr(thread_state, "_livesporttv_client", None)
+    if local_client is None or local_client.limiter is not client.limiter:
+        local_client = client.clone()
+        setattr(thread_state, "_livesporttv_client", local_client)
+    return local_client
+
+
+def fetch_ordered(
+    client: LiveSportTVClient,
+    fetch,
+    items: List,
+    workers: int,
+) -> List[Tuple[Optional[object], Optional[Exception]]]:
+    """
+    Run `fetch(client, item)` for every item and return (result, error) pairs
+    in input order. With more than one worker each thread uses its own
+    client clone; callers merge the results sequentially, so output does not
+    depend on completion order.
+    """
+    results: List[Tuple[Optional[object], Optional[Exception]]] = [(None, None)] * len(items)
+    if workers <= 1 or len(items) <= 1:
+        for index, item in enumerate(items):
+            try:
+                results[index] = (fetch(client, item), None)
+            except Exception as exc:
+                results[index] = (None, exc)
+        return results
+
+    def _run(item):
+        return fetch(thread_client(client), item)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        futures = {pool.submit(_run, item): index for index, item in enumerate(items)}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                results[futures[future]] = (future.result(), None)
+            except Exception as exc:
+                results[futures[future]] = (None, exc)
+    return results
+
+
 def get_timezone(name: str) -> dt.tzinfo:
     if ZoneInfo is not None:
         try:
@@ -1076,8 +1351,9 @@ def _extract_match_country_channel_payload(
     include_live_tab: bool,
     target_countries: List[str],
     include_all_international: bool,
+    fast: bool = False,
 ) -> Dict[str, object]:
-    soup = parse_html(html)
+    soup = parse_match_page_html(html, fast=fast)
     country_rows = _parse_match_international_channels(
         soup,
         keep_noisy_channels=keep_noisy_channels,
@@ -1097,11 +1373,45 @@ def _extract_match_country_channel_payload(
     }
 
 
+def _parse_iso_utc(value: object) -> Optional[dt.datetime]:
+    text = normalize_whitespace(value)
+    if not text:
+        return None
+    try:
+        parsed = dt.datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    return parsed
+
+
+def match_page_ttl_seconds(kickoff_iso: object, now: dt.datetime) -> int:
+    """
+    How long a cached match-page payload is trusted without asking the site.
+    Broadcaster lists move most near kickoff, so the TTL shrinks to zero
+    (always revalidate) in the last hours and grows again once the match is over.
+    """
+    kickoff = _parse_iso_utc(kickoff_iso)
+    if kickoff is None:
+        return MATCH_PAGE_UNKNOWN_KICKOFF_TTL_SECONDS
+    hours_until = (kickoff - now).total_seconds() / 3600.0
+    if hours_until < -MATCH_PAGE_SETTLED_AFTER_HOURS:
+        return MATCH_PAGE_SETTLED_TTL_SECONDS
+    for max_hours, ttl_seconds in MATCH_PAGE_TTL_STEPS:
+        if hours_until <= max_hours:
+            return ttl_seconds
+    return MATCH_PAGE_FAR_TTL_SECONDS
+
+
 def enrich_events_with_match_country_channels(
     client: LiveSportTVClient,
     events: List[Dict],
     keep_noisy_channels: bool,
     workers: int = 1,
+    page_cache: Optional[ResponseCache] = None,
+    now: Optional[dt.datetime] = None,
+    fast_html: bool = False,
 ) -> Dict[str, int]:
     started_at = time.perf_counter()
     cfg = _match_country_enrichment_config()
@@ -1111,6 +1421,9 @@ def enrich_events_with_match_country_channels(
             "eligible_events": 0,
             "fetched_pages": 0,
             "fetch_failed": 0,
+            "cache_fresh": 0,
+            "cache_not_modified": 0,
+            "cache_unchanged": 0,
             "channels_added": 0,
             "events_enriched": 0,
             "workers_used": 0,
@@ -1118,6 +1431,7 @@ def enrich_events_with_match_country_channels(
         }
 
     url_to_indices: Dict[str, List[int]] = {}
+    kickoff_by_url: Dict[str, str] = {}
     for idx, event in enumerate(events):
         if not _is_soccer_event(event):
             continue
@@ -1125,6 +1439,9 @@ def enrich_events_with_match_country_channels(
         if not match_url:
             continue
         url_to_indices.setdefault(match_url, []).append(idx)
+        kickoff = normalize_whitespace(event.get("start_time_iso"))
+        if kickoff and (match_url not in kickoff_by_url or kickoff < kickoff_by_url[match_url]):
+            kickoff_by_url[match_url] = kickoff
 
     unique_urls = list(url_to_indices.keys())
     max_events = int(cfg.get("max_events_per_day") or 0)
@@ -1141,34 +1458,67 @@ def enrich_events_with_match_country_channels(
     include_all_international = bool(cfg.get("include_all_international"))
 
     payload_by_url: Dict[str, Dict[str, object]] = {}
+    cache_status_by_url: Dict[str, str] = {}
     requested_workers = max(1, int(workers))
     workers_used = 1
-
-    def _fetch_match_payload(match_url: str) -> Dict[str, object]:
-        thread_state = threading.current_thread()
-        local_client = getattr(thread_state, "_livesporttv_client", None)
-        if local_client is None:
-            local_client = LiveSportTVClient(
-                timeout=client.timeout,
-                retries=client.retries,
-                backoff_seconds=client.backoff_seconds,
-            )
-            setattr(thread_state, "_livesporttv_client", local_client)
-
-        html = local_client._get_text(match_url)
+    now = now or dt.datetime.now(dt.timezone.utc)
+    # Cached payloads are only reused when they were extracted with the same options.
+    parse_signature = [
+        MATCH_PAGE_PARSER_VERSION,
+        bool(keep_noisy_channels),
+        include_live_tab,
+        sorted(str(country) for country in target_countries),
+        include_all_international,
+    ]
+
+    def _extract(html: str) -> Dict[str, object]:
         return _extract_match_country_channel_payload(
             html,
             keep_noisy_channels=keep_noisy_channels,
             include_live_tab=include_live_tab,
             target_countries=target_countries,
             include_all_international=include_all_international,
+            fast=fast_html,
+        )
+
+    def _parse_body(body: bytes) -> Dict[str, object]:
+        return {"signature": parse_signature, "payload": _extract(body.decode("utf-8", errors="replace"))}
+
+    def _fetch_match_payload(match_url: str) -> Tuple[Dict[str, object], str]:
+        local_client = thread_client(client)
+        if page_cache is None:
+            return _extract(local_client._get_text(match_url)), "fetched"
+
+        entry = page_cache.lookup(match_url)
+        age = page_cache.age_seconds(match_url, now=now.timestamp())
+        if entry and age is not None and age < match_page_ttl_seconds(kickoff_by_url.get(match_url), now):
+            cached = page_cache.load_parsed(match_url, str(entry.get("content_hash") or ""))
+            if isinstance(cached, dict) and cached.get("signature") == parse_signature:
+                page_cache.touch(match_url)
+                return cached["payload"], "fresh"
+
+        parsed, status = fetch_with_cache(
+            match_url,
+            parse=_parse_body,
+            cache=page_cache,
+            http_get=lambda url, timeout=None, headers=None: local_client._get_response(url, headers=headers),
+            timeout=local_client.timeout,
         )
+        if not isinstance(parsed, dict) or parsed.get("signature") != parse_signature:
+            # Body unchanged but cached under other options: re-parse the stored copy.
+            body = page_cache.load_body(match_url)
+            entry = page_cache.lookup(match_url) or {}
+            if body is None:
+                return _extract(local_client._get_text(match_url)), "fetched"
+            parsed = _parse_body(body)
+            page_cache.store_parsed(match_url, str(entry.get("content_hash") or ""), parsed)
+        return parsed["payload"], status
 
     if len(unique_urls) <= 1 or requested_workers == 1:
         workers_used = 1
         for match_url in unique_urls:
             try:
-                payload_by_url[match_url] = _fetch_match_payload(match_url)
+                payload_by_url[match_url], cache_status_by_url[match_url] = _fetch_match_payload(match_url)
                 fetched_pages += 1
             except Exception:
                 fetch_failed += 1
@@ -1179,10 +1529,11 @@ def enrich_events_with_match_country_channels(
             for future in concurrent.futures.as_completed(futures):
                 match_url = futures[future]
                 try:
-                    payload_by_url[match_url] = future.result()
+                    payload_by_url[match_url], cache_status_by_url[match_url] = future.result()
                     fetched_pages += 1
                 except Exception:
                     fetch_failed += 1
+    cache_statuses = list(cache_status_by_url.values())
 
     for match_url in unique_urls:
         payload = payload_by_url.get(match_url)
@@ -1223,6 +1574,9 @@ def enrich_events_with_match_country_channels(
         "eligible_events": len(url_to_indices),
         "fetched_pages": fetched_pages,
         "fetch_failed": fetch_failed,
+        "cache_fresh": cache_statuses.count("fresh"),
+        "cache_not_modified": cache_statuses.count("not-modified"),
+        "cache_unchanged": cache_statuses.count("unchanged"),
         "channels_added": channels_added,
         "events_enriched": events_enriched,
         "workers_used": workers_used,
@@ -1284,14 +1638,14 @@ def merge_tournaments(dest: Dict[str, TournamentRequest], src: Dict[str, Tournam
 
 
 def parse_data_today_tournaments(
-    payload: Dict[str, List[str]], default_iso_code: str
+    payload: Dict[str, List[str]], default_iso_code: str, fast: bool = False
 ) -> Dict[str, TournamentRequest]:
     tournaments: Dict[str, TournamentRequest] = {}
     for sport_key, chunks in payload.items():
         if not chunks:
             continue
         html = "".join(chunks)
-        soup = parse_html(html)
+        soup = parse_schedule_html(html, fast=fast)
         parsed = extract_tournaments_from_soup(
             soup, default_iso_code=default_iso_code, source_sport_key=sport_key
         )
@@ -1385,6 +1739,9 @@ def scrape_one_date(
     match_country_workers: int,
     enable_geo_profiles: bool,
     html_override: Optional[str] = None,
+    tournament_workers: int = 1,
+    page_cache: Optional[ResponseCache] = None,
+    fast_html: bool = False,
 ) -> Tuple[List[Dict], Dict[str, object]]:
     day_started_at = time.perf_counter()
     stage_times_ms = {
@@ -1406,7 +1763,7 @@ def scrape_one_date(
         if html_override is not None
         else client.get_schedule_html(target_date, extra_params=primary_schedule_params)
     )
-    soup = parse_html(html)
+    soup = parse_schedule_html(html, fast=fast_html)
 
     config = extract_script_config(html)
     sport_by_id = extract_sport_map(soup)
@@ -1431,8 +1788,8 @@ def scrape_one_date(
 
     if include_data_today and html_override is None:
         data_today_started = time.perf_counter()
-        for page in range(1, max(1, max_pages) + 1):
-            params = {
+        page_params = [
+            {
                 "date_today": target_date.isoformat(),
                 "locale": config["locale"],
                 "version": config["version"],
@@ -1441,10 +1798,20 @@ def scrape_one_date(
                 "comp_ignore": comp_ignore,
                 "page": str(page),
             }
-            payload = client.get_data_today(params)
+            for page in range(1, max(1, max_pages) + 1)
+        ]
+        page_results = fetch_ordered(
+            client,
+            lambda page_client, params: page_client.get_data_today(params),
+            page_params,
+            workers=tournament_workers,
+        )
+        for payload, error in page_results:
+            if error is not None:
+                raise error
             if not payload:
                 continue
-            parsed = parse_data_today_tournaments(payload, default_iso_code=config["iso_code"])
+            parsed = parse_data_today_tournaments(payload, default_iso_code=config["iso_code"], fast=fast_html)
             merge_tournaments(tournaments, parsed)
         stage_times_ms["data_today"] = int((time.perf_counter() - data_today_started) * 1000)
 
@@ -1458,10 +1825,14 @@ def scrape_one_date(
         if max_tournaments is not None and max_tournaments > 0:
             tournament_items = tournament_items[:max_tournaments]
 
-        for tournament in tournament_items:
-            try:
-                payload = client.get_tournament(tournament)
-            except Exception:
+        tournament_results = fetch_ordered(
+            client,
+            lambda tournament_client, tournament: tournament_client.get_tournament(tournament),
+            tournament_items,
+            workers=tournament_workers,
+        )
+        for tournament, (payload, error) in zip(tournament_items, tournament_results):
+            if error is not None:
                 failed += 1
                 continue
 
@@ -1564,7 +1935,7 @@ def scrape_one_date(
                 )
                 continue
 
-            profile_soup = parse_html(profile_html)
+            profile_soup = parse_schedule_html(profile_html, fast=fast_html)
             profile_comp_ignore_ids = extract_comp_ignore_ids(profile_soup)
             profile_comp_ignore = ",".join(profile_comp_ignore_ids) if profile_comp_ignore_ids else "[]"
 
@@ -1588,7 +1959,7 @@ def scrape_one_date(
                 if not payload:
                     continue
                 parsed = parse_data_today_tournaments(
-                    payload, default_iso_code=profile_config.get("iso_code", "")
+                    payload, default_iso_code=profile_config.get("iso_code", ""), fast=fast_html
                 )
                 merge_tournaments(profile_tournaments, parsed)
 
@@ -1659,6 +2030,8 @@ def scrape_one_date(
         events=events,
         keep_noisy_channels=keep_noisy_channels,
         workers=match_country_workers,
+        page_cache=page_cache,
+        fast_html=fast_html,
     )
     stage_times_ms["match_country_enrichment"] = int((time.perf_counter() - match_country_started) * 1000)
     events = sort_events(events)
@@ -1682,6 +2055,58 @@ def scrape_one_date(
     }
 
 
+def scrape_dates(
+    client: LiveSportTVClient,
+    target_dates: List[dt.date],
+    day_workers: int,
+    include_data_today: bool,
+    max_pages: int,
+    max_tournaments: Optional[int],
+    keep_noisy_channels: bool,
+    match_country_workers: int,
+    tournament_workers: int,
+    html_override: Optional[str] = None,
+    page_cache: Optional[ResponseCache] = None,
+    fast_html: bool = False,
+) -> List[Tuple[Optional[Tuple[List[Dict], Dict[str, object]]], Optional[Exception]]]:
+    """
+    Scrape every date (up to `day_workers` at once) and return
+    ((events, stats), error) pairs in date order. Day threads use their own
+    client clones; every clone shares the client's HostRateLimiter, so the
+    per-host request budget is global across days. `html_override` only
+    applies to the first date.
+    """
+
+    def _scrape(day_client: LiveSportTVClient, target_date: dt.date) -> Tuple[List[Dict], Dict[str, object]]:
+        print(f"[LiveSportTV] Scraping {target_date.isoformat()} ...")
+        return scrape_one_date(
+            client=day_client,
+            target_date=target_date,
+            include_data_today=include_data_today,
+            max_pages=max_pages,
+            max_tournaments=max_tournaments,
+            keep_noisy_channels=keep_noisy_channels,
+            match_country_workers=match_country_workers,
+            enable_geo_profiles=False,
+            html_override=html_override if target_dates and target_date == target_dates[0] else None,
+            tournament_workers=tournament_workers,
+            page_cache=page_cache,
+            fast_html=fast_html,
+        )
+
+    if day_workers <= 1:
+        # Sequential runs keep the historical stop-at-first-failure behaviour.
+        results: List[Tuple[Optional[Tuple[List[Dict], Dict[str, object]]], Optional[Exception]]] = []
+        for target_date in target_dates:
+            try:
+                results.append((_scrape(client, target_date), None))
+            except Exception as exc:
+                results.append((None, exc))
+                break
+        return results
+    return fetch_ordered(client, _scrape, target_dates, workers=day_workers)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Scrape daily or multi-day TV guide from LiveSportTV.")
     parser.add_argument(
@@ -1756,6 +2181,51 @@ def parse_args() -> argparse.Namespace:
         default=6,
         help="Parallel workers for per-match country-channel page enrichment (default: 6).",
     )
+    parser.add_argument(
+        "--fast-html",
+        action="store_true",
+        help="Stream out only match rows and channel rows before building BeautifulSoup trees (opt-in).",
+    )
+    parser.add_argument(
+        "--match-cache-dir",
+        default=MATCH_PAGE_CACHE_DIR,
+        help="Persistent match-page payload cache shared across days and runs.",
+    )
+    parser.add_argument(
+        "--match-cache-max-mb",
+        type=int,
+        default=MATCH_PAGE_CACHE_MAX_MB,
+        help=f"LRU size bound for the match-page cache (default: {MATCH_PAGE_CACHE_MAX_MB}).",
+    )
+    parser.add_argument(
+        "--no-match-cache",
+        action="store_true",
+        help="Fetch every match page even if a fresh cached payload exists.",
+    )
+    parser.add_argument(
+        "--day-workers",
+        type=int,
+        default=1,
+        help="Dates scraped concurrently; all days share the host request budget (default: 1).",
+    )
+    parser.add_argument(
+        "--tournament-workers",
+        type=int,
+        default=1,
+        help="Parallel workers for /data-today pages and tournament API calls per day (default: 1, sequential).",
+    )
+    parser.add_argument(
+        "--max-host-concurrency",
+        type=int,
+        default=0,
+        help="Max in-flight LiveSportTV requests across all workers (default: 0 = unlimited).",
+    )
+    parser.add_argument(
+        "--min-request-interval",
+        type=float,
+        default=0.0,
+        help="Minimum seconds between LiveSportTV request starts across all workers (default: 0 = no spacing).",
+    )
     parser.add_argument(
         "--enable-geo-profiles",
         action="store_true",
@@ -1802,7 +2272,20 @@ def main() -> int:
     geo_profiles = [{"name": "default"}]
     primary_profile_name = "default"
 
-    client = LiveSportTVClient(timeout=args.timeout, retries=args.retries, backoff_seconds=args.backoff)
+    limiter = HostRateLimiter(
+        max_concurrent=args.max_host_concurrency,
+        min_interval=args.min_request_interval,
+    )
+    client = LiveSportTVClient(
+        timeout=args.timeout,
+        retries=args.retries,
+        backoff_seconds=args.backoff,
+        limiter=limiter,
+    )
+
+    page_cache: Optional[ResponseCache] = None
+    if not args.no_match_cache and args.match_cache_dir:
+        page_cache = ResponseCache(args.match_cache_dir, max_bytes=args.match_cache_max_mb * 1024 * 1024)
 
     schedule: List[Dict] = []
     aggregate_stats = {
@@ -1825,29 +2308,40 @@ def main() -> int:
         "eligible_events": 0,
         "fetched_pages": 0,
         "fetch_failed": 0,
+        "cache_fresh": 0,
+        "cache_not_modified": 0,
+        "cache_unchanged": 0,
         "channels_added": 0,
         "events_enriched": 0,
     }
     aggregate_profile_stats: Dict[str, Dict[str, int]] = {}
 
-    for offset in range(args.days):
-        target_date = start_date + dt.timedelta(days=offset)
-        print(f"[LiveSportTV] Scraping {target_date.isoformat()} ...")
+    target_dates = [start_date + dt.timedelta(days=offset) for offset in range(args.days)]
+    day_results = scrape_dates(
+        client,
+        target_dates,
+        day_workers=args.day_workers,
+        include_data_today=not args.no_data_today,
+        max_pages=args.max_pages,
+        max_tournaments=args.max_tournaments,
+        keep_noisy_channels=args.keep_noisy_channels,
+        match_country_workers=args.match_country_workers,
+        tournament_workers=max(1, args.tournament_workers),
+        html_override=html_override,
+        page_cache=page_cache,
+        fast_html=args.fast_html,
+    )
+    if page_cache is not None:
         try:
-            events, stats = scrape_one_date(
-                client=client,
-                target_date=target_date,
-                include_data_today=not args.no_data_today,
-                max_pages=args.max_pages,
-                max_tournaments=args.max_tournaments,
-                keep_noisy_channels=args.keep_noisy_channels,
-                match_country_workers=args.match_country_workers,
-                enable_geo_profiles=False,
-                html_override=html_override if offset == 0 else None,
-            )
-        except Exception as exc:
-            print(f"[LiveSportTV] Failed on {target_date.isoformat()}: {exc}", file=sys.stderr)
+            page_cache.save()
+        except OSError as exc:
+            print(f"[LiveSportTV][WARN] Failed to save match-page cache: {exc}", file=sys.stderr)
+
+    for target_date, (day_result, error) in zip(target_dates, day_results):
+        if error is not None:
+            print(f"[LiveSportTV] Failed on {target_date.isoformat()}: {error}", file=sys.stderr)
             return 1
+        events, stats = day_result
 
         for key in aggregate_stats:
             aggregate_stats[key] += int(stats.get(key, 0))
@@ -1874,6 +2368,9 @@ def main() -> int:
             "eligible_events",
             "fetched_pages",
             "fetch_failed",
+            "cache_fresh",
+            "cache_not_modified",
+            "cache_unchanged",
             "channels_added",
             "events_enriched",
         ):
@@ -1948,6 +2445,8 @@ def main() -> int:
                 f"[LiveSportTV]   match-country pages={int(day_match_country_stats.get('fetched_pages', 0))}/"
                 f"{int(day_match_country_stats.get('eligible_events', 0))} "
                 f"failed={int(day_match_country_stats.get('fetch_failed', 0))} "
+                f"cached={int(day_match_country_stats.get('cache_fresh', 0))}"
+                f"+{int(day_match_country_stats.get('cache_not_modified', 0))} "
                 f"channels_added={int(day_match_country_stats.get('channels_added', 0))} "
                 f"workers={int(day_match_country_stats.get('workers_used', 0))} "
                 f"t={int(day_match_country_stats.get('elapsed_ms', 0)) / 1000:.1f}s"
@@ -2005,6 +2504,7 @@ def main() -> int:
         print(f"Failed to save output to '{args.output}': {exc}", file=sys.stderr)
         return 1
 
+    client.http.log_timing_report("[LiveSportTV]")
     print(f"[LiveSportTV] Wrote {args.output}")
     return 0
 
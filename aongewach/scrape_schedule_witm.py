@@ -8,12 +8,15 @@ Default behavior is non-soccer only (soccer/football excluded).
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import datetime as dt
 import json
+import os
 import re
 import sys
+import time
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
@@ -22,6 +25,9 @@ from channel_filters import (
     normalize_channel_name,
 )
 from channel_name_placeholders import is_placeholder_channel_name
+from day_store import stale_after_seconds
+from http_client import PooledHttpClient
+from response_cache import ResponseCache
 
 
 BASE_URL = "https://www.wheresthematch.com"
@@ -48,6 +54,11 @@ UA = (
 )
 BROADCAST_EVENT_ITEMTYPE_RE = re.compile(r"schema\.org/BroadcastEvent", re.IGNORECASE)
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HTML_CACHE_DIR = os.path.join(SCRIPT_DIR, ".scrape_cache", "witm")
+HTML_CACHE_MAX_MB = 64
+DEFAULT_DAY_WORKERS = 4
+
 
 def parse_start_date(raw: Optional[str]) -> dt.date:
     if not raw:
@@ -211,19 +222,55 @@ def extract_event(row, non_soccer_only: bool = True) -> Optional[Dict]:
     }
 
 
-def scrape_date(target_date: dt.date, non_soccer_only: bool = True) -> List[Dict]:
-    date_key = target_date.strftime("%Y%m%d")
-    url = SCHEDULE_URL_TEMPLATE.format(date=date_key)
-    print(f"  > WITM scraping {target_date.isoformat()}...", flush=True)
+def html_ttl_seconds(target_date: dt.date, today: dt.date) -> int:
+    """Pages follow the shared per-day staleness policy (see day_store)."""
+    return stale_after_seconds(target_date, today)
+
+
+def fetch_schedule_html(
+    url: str,
+    client: PooledHttpClient,
+    cache: Optional[ResponseCache] = None,
+    ttl_seconds: int = 0,
+) -> Tuple[str, str]:
+    """
+    Return (html, source) where source is "cache" (fresh entry, no request),
+    "not-modified" (304 revalidation) or "fetched".
+    """
+    if cache is not None and ttl_seconds > 0:
+        age = cache.age_seconds(url)
+        if age is not None and age < ttl_seconds:
+            body = cache.load_body(url)
+            if body is not None:
+                cache.touch(url)
+                return body.decode("utf-8"), "cache"
+
+    headers = {"User-Agent": UA}
+    if cache is not None:
+        headers.update(cache.conditional_headers(url))
+    response = client.get(url, headers=headers, timeout=30)
+    if response.status_code == 304 and cache is not None:
+        body = cache.load_body(url)
+        if body is not None:
+            cache.touch(url)
+            cache.mark_validated(url)
+            return body.decode("utf-8"), "not-modified"
+        response = client.get(url, headers={"User-Agent": UA}, timeout=30)
+    response.raise_for_status()
+    html = response.text
+    if cache is not None:
+        # Stored as the decoded text so cached and live pages parse identically.
+        cache.store(
+            url,
+            html.encode("utf-8"),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+    return html, "fetched"
 
-    try:
-        response = requests.get(url, headers={"User-Agent": UA}, timeout=30)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        print(f"    x WITM error {target_date.isoformat()}: {exc}", flush=True)
-        return []
 
-    soup = BeautifulSoup(response.text, "html.parser")
+def parse_schedule_html(html: str, non_soccer_only: bool = True) -> List[Dict]:
+    soup = BeautifulSoup(html, "html.parser")
     rows = []
     for row in soup.find_all("tr"):
         if "itemscope" not in row.attrs:
@@ -238,16 +285,78 @@ def scrape_date(target_date: dt.date, non_soccer_only: bool = True) -> List[Dict
         event = extract_event(row, non_soccer_only=non_soccer_only)
         if event:
             events.append(event)
+    return events
+
+
+def scrape_day(
+    target_date: dt.date,
+    non_soccer_only: bool = True,
+    client: Optional[PooledHttpClient] = None,
+    cache: Optional[ResponseCache] = None,
+    today: Optional[dt.date] = None,
+) -> Tuple[List[Dict], Dict[str, object]]:
+    """Scrape one date and return (events, stats) with fetch/parse timings."""
+    date_key = target_date.strftime("%Y%m%d")
+    url = SCHEDULE_URL_TEMPLATE.format(date=date_key)
+    client = client or PooledHttpClient(retries=2, timeout=30)
+    today = today or dt.datetime.now(dt.timezone.utc).date()
+    stats: Dict[str, object] = {"date": target_date.isoformat(), "source": "error", "fetch_ms": 0, "parse_ms": 0, "events": 0}
+    print(f"  > WITM scraping {target_date.isoformat()}...", flush=True)
 
-    print(f"    v WITM kept {len(events)} events.", flush=True)
+    fetch_started = time.perf_counter()
+    try:
+        html, source = fetch_schedule_html(url, client, cache=cache, ttl_seconds=html_ttl_seconds(target_date, today))
+    except requests.RequestException as exc:
+        stats["fetch_ms"] = int((time.perf_counter() - fetch_started) * 1000)
+        print(f"    x WITM error {target_date.isoformat()}: {exc}", flush=True)
+        return [], stats
+    stats["source"] = source
+    stats["fetch_ms"] = int((time.perf_counter() - fetch_started) * 1000)
+    if cache is not None:
+        client.timings.record_cache(urlparse(url).hostname or "", source)
+
+    parse_started = time.perf_counter()
+    events = parse_schedule_html(html, non_soccer_only=non_soccer_only)
+    stats["parse_ms"] = int((time.perf_counter() - parse_started) * 1000)
+    stats["events"] = len(events)
+
+    print(
+        f"    v WITM kept {len(events)} events ({target_date.isoformat()}, {source}, "
+        f"fetch={stats['fetch_ms']}ms parse={stats['parse_ms']}ms).",
+        flush=True,
+    )
+    return events, stats
+
+
+def scrape_date(target_date: dt.date, non_soccer_only: bool = True) -> List[Dict]:
+    events, _ = scrape_day(target_date, non_soccer_only=non_soccer_only)
     return events
 
 
-def scrape_range(start_date: dt.date, days: int, non_soccer_only: bool = True) -> Dict:
+def scrape_range(
+    start_date: dt.date,
+    days: int,
+    non_soccer_only: bool = True,
+    client: Optional[PooledHttpClient] = None,
+    cache: Optional[ResponseCache] = None,
+    day_workers: int = 1,
+    today: Optional[dt.date] = None,
+) -> Dict:
+    client = client or PooledHttpClient(retries=2, timeout=30)
+    dates = [start_date + dt.timedelta(days=offset) for offset in range(days)]
+
+    def _scrape(current_date: dt.date) -> Tuple[List[Dict], Dict[str, object]]:
+        return scrape_day(current_date, non_soccer_only=non_soccer_only, client=client, cache=cache, today=today)
+
+    if day_workers <= 1 or len(dates) <= 1:
+        results = [_scrape(current_date) for current_date in dates]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(day_workers, len(dates))) as pool:
+            results = list(pool.map(_scrape, dates))
+
     schedule: List[Dict] = []
-    for offset in range(days):
-        current_date = start_date + dt.timedelta(days=offset)
-        events = scrape_date(current_date, non_soccer_only=non_soccer_only)
+    day_stats: List[Dict[str, object]] = []
+    for current_date, (events, stats) in zip(dates, results):
         schedule.append(
             {
                 "date": current_date.isoformat(),
@@ -255,11 +364,13 @@ def scrape_range(start_date: dt.date, days: int, non_soccer_only: bool = True) -
                 "events": events,
             }
         )
+        day_stats.append(stats)
 
     return {
         "generated_at": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
         "source": "wheresthematch.com",
         "schedule": schedule,
+        "extraction": {"day_stats": day_stats},
     }
 
 
@@ -268,6 +379,14 @@ def parse_cli_args() -> argparse.Namespace:
     parser.add_argument("--date", type=str, default=None, help="Start date in YYYY-MM-DD format. Default: today UTC.")
     parser.add_argument("--days", type=int, default=7, help="Number of days to scrape (default: 7).")
     parser.add_argument("--output", type=str, default="weekly_schedule_witm.json", help="Output JSON path.")
+    parser.add_argument(
+        "--day-workers",
+        type=int,
+        default=DEFAULT_DAY_WORKERS,
+        help=f"Days fetched concurrently on one pooled session (default: {DEFAULT_DAY_WORKERS}).",
+    )
+    parser.add_argument("--cache-dir", type=str, default=HTML_CACHE_DIR, help="On-disk schedule page cache.")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch every day's page.")
     parser.add_argument(
         "--include-soccer",
         action="store_true",
@@ -288,11 +407,28 @@ def main() -> int:
         print(f"Invalid --date value: {args.date!r}. Expected YYYY-MM-DD.", file=sys.stderr)
         return 2
 
-    payload = scrape_range(
-        start_date=start_date,
-        days=args.days,
-        non_soccer_only=not args.include_soccer,
-    )
+    day_workers = max(1, args.day_workers)
+    client = PooledHttpClient(retries=2, timeout=30, pool_maxsize=max(10, day_workers))
+    cache = None
+    if not args.no_cache and args.cache_dir:
+        cache = ResponseCache(args.cache_dir, max_bytes=HTML_CACHE_MAX_MB * 1024 * 1024)
+    try:
+        payload = scrape_range(
+            start_date=start_date,
+            days=args.days,
+            non_soccer_only=not args.include_soccer,
+            client=client,
+            cache=cache,
+            day_workers=day_workers,
+        )
+    finally:
+        client.log_timing_report("[WITM]")
+        client.close()
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as exc:
+            print(f"[WITM] Failed to save page cache: {exc}", file=sys.stderr)
 
     with open(args.output, "w", encoding="utf-8") as handle:
         json.dump(payload, handle, indent=2, ensure_ascii=False)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Persisted per-playlist yield history used to order and skip scan servers."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from playlist_snapshots import compact_hash
+
+EWMA_ALPHA = 0.35
+DEFAULT_ZERO_YIELD_RUNS = 3
+DEFAULT_SKIP_AFTER_FAILURES = 3
+DEFAULT_FAILED_RETRY_DAYS = 7.0
+
+
+class YieldPolicy:
+    """Ordering knobs: demote chronic zero-yield panels, park repeatedly failing ones."""
+
+    def __init__(
+        self,
+        zero_yield_runs: int = DEFAULT_ZERO_YIELD_RUNS,
+        skip_after_failures: int = DEFAULT_SKIP_AFTER_FAILURES,
+        failed_retry_days: float = DEFAULT_FAILED_RETRY_DAYS,
+    ):
+        # 0 disables the corresponding rule.
+        self.zero_yield_runs = max(0, int(zero_yield_runs))
+        self.skip_after_failures = max(0, int(skip_after_failures))
+        self.failed_retry_seconds = max(0.0, float(failed_retry_days)) * 86400
+
+
+def _new_record() -> Dict:
+    return {
+        "runs": 0,
+        "consecutive_failures": 0,
+        "consecutive_zero_yield": 0,
+        "ewma_accepted": 0.0,
+        "ewma_probes": 0.0,
+        "total_accepted": 0,
+        "total_probes": 0,
+        "last_streams": 0,
+        "last_fetch_seconds": None,
+        "last_attempt_at": None,
+        "last_success_at": None,
+    }
+
+
+def yield_score(record: Optional[Dict]) -> float:
+    """Smoothed accepted-streams-per-probe; unseen servers get an optimistic prior so they are explored."""
+    if not record or not record.get("runs"):
+        return 0.5
+    accepted = float(record.get("ewma_accepted") or 0.0)
+    probes = float(record.get("ewma_probes") or 0.0)
+    return (accepted + 1.0) / (probes + 2.0)
+
+
+class ServerYieldStore:
+    """
+    JSON file layout:
+      {"version": 1, "servers": {url_hash: {runs, consecutive_failures, ewma_accepted, ...}}}
+    """
+
+    def __init__(self, path: str, policy: Optional[YieldPolicy] = None):
+        self.path = path
+        self.policy = policy or YieldPolicy()
+        self.lock = threading.Lock()
+        self.servers: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                loaded = json.load(handle)
+        except (OSError, ValueError):
+            return
+        servers = loaded.get("servers") if isinstance(loaded, dict) else None
+        if isinstance(servers, dict):
+            self.servers = {key: node for key, node in servers.items() if isinstance(node, dict)}
+
+    def get(self, server_url: str) -> Optional[Dict]:
+        with self.lock:
+            record = self.servers.get(compact_hash(server_url))
+            return dict(record) if record else None
+
+    def rank(self, servers: List[Dict], now: Optional[float] = None) -> Tuple[List[Dict], List[Dict]]:
+        """Return (ordered_servers, skipped_servers). Sorting is stable, so ties keep configured order."""
+        now = now if now is not None else time.time()
+        runnable: List[Tuple[int, float, int, Dict]] = []
+        skipped: List[Dict] = []
+        for position, server in enumerate(servers):
+            record = self.get(str(server.get("url", "")))
+            if record and self.policy.skip_after_failures:
+                failures = int(record.get("consecutive_failures") or 0)
+                last_attempt = float(record.get("last_attempt_at") or 0)
+                if failures >= self.policy.skip_after_failures and now - last_attempt < self.policy.failed_retry_seconds:
+                    skipped.append(server)
+                    continue
+            demoted = 0
+            if record and self.policy.zero_yield_runs:
+                if int(record.get("consecutive_zero_yield") or 0) >= self.policy.zero_yield_runs:
+                    demoted = 1
+            runnable.append((demoted, -yield_score(record), position, server))
+        runnable.sort(key=lambda item: item[:3])
+        return [item[3] for item in runnable], skipped
+
+    def record(
+        self,
+        server_url: str,
+        fetched: bool,
+        streams: int,
+        accepted: int,
+        probes: int,
+        fetch_seconds: Optional[float] = None,
+    ) -> None:
+        now = int(time.time())
+        with self.lock:
+            key = compact_hash(server_url)
+            record = self.servers.get(key) or _new_record()
+            record["runs"] = int(record.get("runs") or 0) + 1
+            record["last_attempt_at"] = now
+            record["last_streams"] = int(streams)
+            record["last_fetch_seconds"] = round(fetch_seconds, 3) if fetch_seconds is not None else None
+            if not fetched:
+                record["consecutive_failures"] = int(record.get("consecutive_failures") or 0) + 1
+                self.servers[key] = record
+                return
+            record["consecutive_failures"] = 0
+            record["last_success_at"] = now
+            record["total_accepted"] = int(record.get("total_accepted") or 0) + int(accepted)
+            record["total_probes"] = int(record.get("total_probes") or 0) + int(probes)
+            if record["runs"] == 1 or not record.get("ewma_probes"):
+                record["ewma_accepted"] = float(accepted)
+                record["ewma_probes"] = float(probes)
+            else:
+                record["ewma_accepted"] = (1 - EWMA_ALPHA) * float(record["ewma_accepted"]) + EWMA_ALPHA * accepted
+                record["ewma_probes"] = (1 - EWMA_ALPHA) * float(record["ewma_probes"]) + EWMA_ALPHA * probes
+            if accepted > 0:
+                record["consecutive_zero_yield"] = 0
+            elif probes > 0:
+                # Only runs that actually probed something count as zero-yield evidence.
+                record["consecutive_zero_yield"] = int(record.get("consecutive_zero_yield") or 0) + 1
+            self.servers[key] = record
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump({"version": 1, "servers": self.servers}, handle, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
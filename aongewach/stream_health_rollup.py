@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Daily per-URL rollups of stream_health_log.jsonl.
+
+rank_best_streams appends one JSON line per probed URL per run. Compaction
+folds those lines into an indexed SQLite table keyed by (url_hash, UTC day)
+with tested/ok counts, startup-time percentiles and the last successful
+test, moves the raw lines into monthly gzip archives and empties the log.
+Reading a history window is then one indexed aggregate instead of a
+json.loads + ISO parse per line ever written.
+
+Compaction is restartable: the store records the size and sha256 of the
+log prefix it already folded, so a run interrupted before the log was
+truncated does not count those lines twice. Lines are archived only after
+the fold commits, and an archive interrupted after the commit is finished
+by the next run, so each line is archived once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA_VERSION = 1
+DEFAULT_STORE_PATH = "stream_health_rollups.sqlite"
+DEFAULT_ARCHIVE_DIR = "stream_health_archive"
+DEFAULT_RETENTION_DAYS = 120
+PERCENTILES = (50, 90)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS store_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    url_hash TEXT NOT NULL,
+    day TEXT NOT NULL,
+    tested INTEGER NOT NULL,
+    ok INTEGER NOT NULL,
+    startup_samples TEXT NOT NULL,
+    startup_p50_ms INTEGER,
+    startup_p90_ms INTEGER,
+    last_ok_at TEXT,
+    PRIMARY KEY (url_hash, day)
+);
+CREATE INDEX IF NOT EXISTS daily_rollups_day ON daily_rollups(day, url_hash);
+"""
+
+# (url_hash, tested_at, ok, startup_ms)
+HealthEvent = Tuple[str, dt.datetime, bool, Optional[int]]
+
+
+def parse_tested_at(value: object) -> Optional[dt.datetime]:
+    text = " ".join(str(value or "").split())
+    if not text:
+        return None
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        moment = dt.datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=dt.timezone.utc)
+    return moment.astimezone(dt.timezone.utc)
+
+
+def format_tested_at(moment: dt.datetime) -> str:
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def parse_event_line(line: str) -> Optional[HealthEvent]:
+    """One log line -> (url_hash, tested_at, ok, startup_ms), or None when unusable."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(event, dict):
+        return None
+    url_hash = " ".join(str(event.get("url_hash") or "").split())
+    tested_at = parse_tested_at(event.get("tested_at"))
+    if not url_hash or tested_at is None:
+        return None
+    startup_ms = event.get("startup_ms")
+    if isinstance(startup_ms, bool) or not isinstance(startup_ms, (int, float)):
+        startup_ms = None
+    return url_hash, tested_at, bool(event.get("ok")), int(startup_ms) if startup_ms is not None else None
+
+
+def fold_history(
+    events: Iterable[HealthEvent],
+    cutoff: dt.datetime,
+    out: Optional[Dict[str, Dict[str, object]]] = None,
+) -> Dict[str, Dict[str, object]]:
+    """Accumulate tested/ok/last_ok_at per url_hash for events at or after `cutoff`."""
+    out = {} if out is None else out
+    for url_hash, tested_at, ok, _ in events:
+        if tested_at < cutoff:
+            continue
+        node = out.setdefault(url_hash, {"tested": 0, "ok": 0, "last_ok_at": None})
+        node["tested"] = int(node.get("tested", 0)) + 1
+        if ok:
+            node["ok"] = int(node.get("ok", 0)) + 1
+            node["last_ok_at"] = format_tested_at(tested_at)
+    return out
+
+
+def percentile(sorted_values: List[int], pct: int) -> Optional[int]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _archive_month(line: str) -> str:
+    event = parse_event_line(line)
+    moment = event[1] if event else dt.datetime.now(dt.timezone.utc)
+    return moment.strftime("%Y-%m")
+
+
+class HealthRollupStore:
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        # The store file is committed next to the log, so keep it a single file (no -wal sidecar).
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.executescript(SCHEMA)
+        if self._state("schema_version") is None:
+            self._set_state("schema_version", SCHEMA_VERSION)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "HealthRollupStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _state(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM store_state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_state(self, key: str, value) -> None:
+        self.conn.execute(
+            "INSERT INTO store_state(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value, separators=(",", ":"))),
+        )
+
+    # -- rollups -------------------------------------------------------------
+
+    def add_events(self, events: Iterable[HealthEvent]) -> int:
+        """Merge events into their (url_hash, day) rollups. Caller owns the transaction."""
+        grouped: Dict[Tuple[str, str], List[HealthEvent]] = defaultdict(list)
+        for event in events:
+            grouped[(event[0], event[1].strftime("%Y-%m-%d"))].append(event)
+
+        for (url_hash, day), items in grouped.items():
+            row = self.conn.execute(
+                "SELECT tested, ok, startup_samples, last_ok_at FROM daily_rollups WHERE url_hash = ? AND day = ?",
+                (url_hash, day),
+            ).fetchone()
+            tested, ok, samples, last_ok_at = (row[0], row[1], json.loads(row[2]), row[3]) if row else (0, 0, [], None)
+            for _, tested_at, item_ok, startup_ms in items:
+                tested += 1
+                if startup_ms is not None:
+                    samples.append(startup_ms)
+                if item_ok:
+                    ok += 1
+                    stamp = format_tested_at(tested_at)
+                    if last_ok_at is None or stamp > last_ok_at:
+                        last_ok_at = stamp
+            samples.sort()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO daily_rollups"
+                "(url_hash, day, tested, ok, startup_samples, startup_p50_ms, startup_p90_ms, last_ok_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url_hash,
+                    day,
+                    tested,
+                    ok,
+                    json.dumps(samples, separators=(",", ":")),
+                    *(percentile(samples, pct) for pct in PERCENTILES),
+                    last_ok_at,
+                ),
+            )
+        return len(grouped)
+
+    def load_window(self, first_day: str) -> Dict[str, Dict[str, object]]:
+        """url_hash -> {tested, ok, last_ok_at} summed over days >= first_day (YYYY-MM-DD)."""
+        rows = self.conn.execute(
+            "SELECT url_hash, SUM(tested), SUM(ok), MAX(last_ok_at) FROM daily_rollups "
+            "WHERE day >= ? GROUP BY url_hash",
+            (first_day,),
+        )
+        return {
+            url_hash: {"tested": int(tested), "ok": int(ok), "last_ok_at": last_ok_at}
+            for url_hash, tested, ok, last_ok_at in rows
+        }
+
+    def get_rollup(self, url_hash: str, day: str) -> Optional[Dict[str, object]]:
+        row = self.conn.execute(
+            "SELECT tested, ok, startup_p50_ms, startup_p90_ms, last_ok_at FROM daily_rollups "
+            "WHERE url_hash = ? AND day = ?",
+            (url_hash, day),
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ("tested", "ok", "startup_p50_ms", "startup_p90_ms", "last_ok_at")
+        return dict(zip(keys, row))
+
+    def prune_before(self, first_day: str) -> int:
+        return self.conn.execute("DELETE FROM daily_rollups WHERE day < ?", (first_day,)).rowcount
+
+    # -- compaction ----------------------------------------------------------
+
+    def _archive_lines(self, lines: List[str], archive_dir: Optional[str]) -> int:
+        """Append raw log lines to the monthly gzip archives; returns the number written."""
+        if not lines or not archive_dir:
+            return 0
+        by_month: Dict[str, List[str]] = defaultdict(list)
+        for line in lines:
+            if line.strip():
+                by_month[_archive_month(line)].append(line)
+        os.makedirs(archive_dir, exist_ok=True)
+        archived = 0
+        for month, month_lines in sorted(by_month.items()):
+            path = os.path.join(archive_dir, f"stream_health_log-{month}.jsonl.gz")
+            # Appending adds a gzip member; readers see one concatenated stream.
+            with gzip.open(path, "at", encoding="utf-8") as handle:
+                handle.write("\n".join(month_lines) + "\n")
+            archived += len(month_lines)
+        return archived
+
+    def compact_log(
+        self,
+        log_file: str,
+        archive_dir: Optional[str] = DEFAULT_ARCHIVE_DIR,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+    ) -> Dict[str, int]:
+        """
+        Fold every complete line of `log_file` into rollups, archive the raw
+        lines (gzip, one file per month) and leave only an unterminated tail
+        in the log.
+        """
+        stats = {"lines": 0, "events": 0, "rollups": 0, "archived": 0, "pruned": 0}
+        if not log_file or not os.path.exists(log_file):
+            return stats
+        with open(log_file, "rb") as handle:
+            data = handle.read()
+
+        start = 0
+        folded = self._state("folded_prefix")
+        if (
+            isinstance(folded, dict)
+            and folded.get("log") == os.path.abspath(log_file)
+            and 0 < int(folded.get("size", 0)) <= len(data)
+            and hashlib.sha256(data[: int(folded["size"])]).hexdigest() == folded.get("sha256")
+        ):
+            start = int(folded["size"])
+            if folded.get("archived") is False:
+                # The last run committed these lines but stopped before archiving them.
+                previous = data[int(folded.get("archive_from", 0)) : start].decode("utf-8", errors="replace")
+                stats["archived"] += self._archive_lines(previous.splitlines(), archive_dir)
+                self._set_state("folded_prefix", {**folded, "archived": True})
+        end = data.rfind(b"\n") + 1
+        lines = data[start:end].decode("utf-8", errors="replace").splitlines() if end > start else []
+        stats["lines"] = len(lines)
+
+        events = [event for event in map(parse_event_line, lines) if event is not None]
+        stats["events"] = len(events)
+        folded_prefix = {
+            "log": os.path.abspath(log_file),
+            "size": end,
+            "sha256": hashlib.sha256(data[:end]).hexdigest(),
+            "archive_from": start,
+            "archived": False,
+        }
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            stats["rollups"] = self.add_events(events)
+            if retention_days > 0:
+                first_day = (dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=retention_days)).strftime("%Y-%m-%d")
+                stats["pruned"] = self.prune_before(first_day)
+            self._set_state("folded_prefix", folded_prefix)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+        # Archive only after the commit: a rolled-back fold leaves nothing archived, and
+        # "archived": False lets the next run finish an archive interrupted here.
+        stats["archived"] += self._archive_lines(lines, archive_dir)
+        self._set_state("folded_prefix", {**folded_prefix, "archived": True})
+
+        if end:
+            directory = os.path.dirname(os.path.abspath(log_file))
+            fd, tmp_path = tempfile.mkstemp(prefix=".stream_health_log.", dir=directory)
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data[end:])
+            shutil.copymode(log_file, tmp_path)
+            os.replace(tmp_path, log_file)
+        self._set_state("folded_prefix", None)
+        return stats
+
+
+def load_history(
+    log_file: str,
+    days: int,
+    store_path: Optional[str] = None,
+    now: Optional[dt.datetime] = None,
+) -> Dict[str, Dict[str, object]]:
+    """
+    History window for availability scoring: rollups from `store_path`
+    (whole UTC days from the cutoff day on) plus any not-yet-compacted lines
+    in `log_file`, which are filtered to the exact cutoff.
+    """
+    now = now or dt.datetime.now(dt.timezone.utc)
+    cutoff = now - dt.timedelta(days=max(1, days))
+    out: Dict[str, Dict[str, object]] = {}
+    if store_path and os.path.exists(store_path):
+        with HealthRollupStore(store_path) as store:
+            out = store.load_window(cutoff.strftime("%Y-%m-%d"))
+    if log_file and os.path.exists(log_file):
+        with open(log_file, "r", encoding="utf-8") as handle:
+            fold_history(filter(None, map(parse_event_line, handle)), cutoff, out)
+    return out
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fold stream_health_log.jsonl into daily per-URL rollups.")
+    parser.add_argument("--log-file", default="stream_health_log.jsonl", help="append-only stream health JSONL log")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="SQLite rollup store")
+    parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR, help="directory for gzip log archives")
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=DEFAULT_RETENTION_DAYS,
+        help="drop rollups older than this many days (0 keeps everything)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    with HealthRollupStore(args.store) as store:
+        stats = store.compact_log(args.log_file, args.archive_dir, args.retention_days)
+    print(
+        f"[ROLLUP] lines={stats['lines']} events={stats['events']} rollups={stats['rollups']} "
+        f"archived={stats['archived']} pruned={stats['pruned']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,8 +5,6 @@ remove dead URLs from channels.json while preserving channel entries.
 """
 
 import argparse
-import json
-import os
 import shutil
 import subprocess
 import time
@@ -14,6 +12,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
+from channel_store import ChannelStore
+
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -30,18 +30,6 @@ class URLTestResult:
     elapsed_seconds: float
 
 
-def load_json(path: str) -> Dict:
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def save_json(path: str, data: Dict) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-
 def collect_unique_urls(channels: Dict) -> List[str]:
     urls = set()
     for channel_data in channels.values():
@@ -250,13 +238,26 @@ def main() -> int:
     parser.add_argument("--verbose", action="store_true", help="Print every URL result")
     parser.add_argument("--show-failures", type=int, default=20, help="Show up to N failed URLs in summary")
     parser.add_argument("--user-agent", default=DEFAULT_USER_AGENT, help="HTTP User-Agent")
+    parser.add_argument(
+        "--channel-store",
+        default=None,
+        help="SQLite channel store backing channels_file (default: next to it, .sqlite).",
+    )
     args = parser.parse_args()
 
-    db = load_json(args.channels_file)
-    channels = db.get("channels", {}) if isinstance(db, dict) else {}
-    if not channels:
+    with ChannelStore.open_synced(args.channels_file, args.channel_store) as store:
+        return run_stream_tests(args, store)
+
+
+def run_stream_tests(args: argparse.Namespace, store: ChannelStore) -> int:
+    if not store.channel_names():
         print(f"No channels found in {args.channels_file}. Nothing to test.")
         return 0
+    # Only quality URL rows are read; prune_dead_streams builds new quality maps, so the
+    # originals stay intact for deciding which channels to write back.
+    original_qualities = store.get_qualities()
+    channels = {name: {"qualities": qualities} for name, qualities in original_qualities.items()}
+    db = {"channels": channels}
 
     ffprobe_bin = shutil.which(args.ffprobe_bin)
     ffmpeg_bin = shutil.which(args.ffmpeg_bin)
@@ -363,8 +364,7 @@ def main() -> int:
 
     kept, removed, channels_touched, untested_kept = prune_dead_streams(db, url_health)
 
-    metadata = db.setdefault("metadata", {})
-    metadata["stream_tester"] = {
+    stream_tester_meta = {
         "tested_at": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
         "total_urls_tested": total_urls,
         "total_unique_urls_in_file": len(all_urls),
@@ -384,7 +384,12 @@ def main() -> int:
         "workers": workers,
     }
 
-    save_json(args.channels_file, db)
+    with store.transaction():
+        for name, channel_data in channels.items():
+            if channel_data["qualities"] != original_qualities[name]:
+                store.update_channel(name, qualities=channel_data["qualities"])
+        store.set_metadata({"stream_tester": stream_tester_meta})
+    store.export_json(args.channels_file)
 
     elapsed = time.time() - started
     print("\n[OK] Stream validation complete")
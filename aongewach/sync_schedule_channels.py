@@ -18,6 +18,7 @@ import zlib
 from typing import Dict, List, Set
 
 from channel_name_placeholders import is_placeholder_channel_name
+from channel_store import ChannelStore
 
 
 NON_BROADCAST_WORD_RE = re.compile(r"\b(app|website|web\s*site|youtube|radio)\b", re.IGNORECASE)
@@ -45,11 +46,6 @@ def load_json(path: str):
         return {}
 
 
-def save_json(path: str, payload) -> None:
-    with open(path, "w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2, ensure_ascii=False)
-
-
 def is_usable_channel_name(name: str) -> bool:
     cleaned = normalize_text(name)
     if not cleaned:
@@ -89,68 +85,64 @@ def collect_schedule_channels(schedule_payload: Dict) -> List[str]:
     return unique
 
 
-def sync_channels(schedule_payload: Dict, channels_db: Dict) -> Dict:
-    if not isinstance(channels_db, dict):
-        channels_db = {}
-    channels_node = channels_db.get("channels")
-    if not isinstance(channels_node, dict):
-        channels_node = {}
-        channels_db["channels"] = channels_node
+def utc_now_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
 
-    existing_by_lower = {name.casefold(): name for name in channels_node.keys()}
+def sync_channels(schedule_payload: Dict, store: ChannelStore) -> Dict:
+    """Backfill missing IDs/fields and add new schedule channels; only those channel rows are written."""
+    fields_by_name = store.channel_fields()
+    ids = store.channel_ids()
+    existing_by_lower = {name.casefold(): name for name in fields_by_name}
     added = 0
     assigned_missing_ids = 0
 
-    # Backfill IDs for existing channels missing an ID.
-    for display_name, payload in channels_node.items():
-        if not isinstance(payload, dict):
-            channels_node[display_name] = {"id": stable_channel_id(display_name), "logo": None, "qualities": {}}
-            assigned_missing_ids += 1
-            continue
-        if not isinstance(payload.get("id"), int):
-            payload["id"] = stable_channel_id(display_name)
-            assigned_missing_ids += 1
-        if "qualities" not in payload:
-            payload["qualities"] = {}
-        if "logo" not in payload:
-            payload["logo"] = None
-
-    for channel_name in collect_schedule_channels(schedule_payload):
-        key = channel_name.casefold()
-        if key in existing_by_lower:
-            canonical = existing_by_lower[key]
-            node = channels_node.get(canonical)
-            if isinstance(node, dict) and not isinstance(node.get("id"), int):
-                node["id"] = stable_channel_id(canonical)
+    with store.transaction():
+        for display_name, fields in fields_by_name.items():
+            if fields is None:
+                store.put_channel(display_name, {"id": stable_channel_id(display_name), "logo": None, "qualities": {}})
                 assigned_missing_ids += 1
-            continue
-
-        channels_node[channel_name] = {
-            "id": stable_channel_id(channel_name),
-            "logo": None,
-            "qualities": {},
+                continue
+            updates: Dict[str, object] = {}
+            if not isinstance(ids.get(display_name), int):
+                updates["id"] = stable_channel_id(display_name)
+                assigned_missing_ids += 1
+            if "qualities" not in fields:
+                updates["qualities"] = {}
+            if "logo" not in fields:
+                updates["logo"] = None
+            if updates:
+                store.update_channel(display_name, **updates)
+
+        for channel_name in collect_schedule_channels(schedule_payload):
+            key = channel_name.casefold()
+            if key in existing_by_lower:
+                continue
+            store.put_channel(channel_name, {"id": stable_channel_id(channel_name), "logo": None, "qualities": {}})
+            existing_by_lower[key] = channel_name
+            added += 1
+
+        metadata = {
+            "updated_at": utc_now_iso(),
+            "unique_channels": len(store.channel_names()),
+            "schedule_channel_sync": {
+                "added_channels": added,
+                "assigned_missing_ids": assigned_missing_ids,
+            },
         }
-        existing_by_lower[key] = channel_name
-        added += 1
-
-    metadata = channels_db.get("metadata")
-    if not isinstance(metadata, dict):
-        metadata = {}
-        channels_db["metadata"] = metadata
-    metadata["updated_at"] = dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
-    metadata["unique_channels"] = len(channels_node)
-    metadata["schedule_channel_sync"] = {
-        "added_channels": added,
-        "assigned_missing_ids": assigned_missing_ids,
-    }
-
-    return channels_db
+        store.set_metadata(metadata)
+    return metadata
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Sync schedule channels into channels.json with stable IDs.")
     parser.add_argument("--schedule", default="weekly_schedule.json", help="Input schedule file path.")
     parser.add_argument("--channels", default="channels.json", help="Input/output channels file path.")
+    parser.add_argument(
+        "--channel-store",
+        default=None,
+        help="SQLite channel store backing --channels (default: next to it, .sqlite).",
+    )
     return parser.parse_args()
 
 
@@ -161,15 +153,15 @@ def main() -> int:
         print(f"Invalid schedule payload: {args.schedule}")
         return 1
 
-    channels_payload = load_json(args.channels)
-    merged = sync_channels(schedule_payload, channels_payload)
-    save_json(args.channels, merged)
+    with ChannelStore.open_synced(args.channels, args.channel_store) as store:
+        metadata = sync_channels(schedule_payload, store)
+        store.export_json(args.channels)
 
-    sync_meta = merged.get("metadata", {}).get("schedule_channel_sync", {})
+    sync_meta = metadata["schedule_channel_sync"]
     print(
         f"[SYNC] Wrote {args.channels} | added={int(sync_meta.get('added_channels', 0))} "
         f"id_backfilled={int(sync_meta.get('assigned_missing_ids', 0))} "
-        f"total={int(merged.get('metadata', {}).get('unique_channels', 0))}"
+        f"total={int(metadata.get('unique_channels', 0))}"
     )
     return 0
 
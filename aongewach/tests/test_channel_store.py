@@ -0,0 +1,84 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from channel_store import ChannelStore, render_json
+
+PAYLOAD = {
+    "metadata": {"scan_date": "2026-03-14 09:57:54 UTC", "stats": {"servers_total": 3}, "unique_channels": 4},
+    "channels": {
+        "Sky Sports Main Event": {
+            "id": 101,
+            "logo": "https://logo/sky.png",
+            "qualities": {"FHD": ["http://a/1.ts"], "HD": ["http://b/2.ts", "http://c/3.ts"]},
+            "primary": {"url": "http://a/1.ts", "score": 88.45, "fps": 30.0},
+            "backups": [{"url": "http://b/2.ts", "score": 80.0}],
+            "reserve": [],
+            "candidates": [{"url": "http://a/1.ts"}, {"url": "http://b/2.ts"}],
+            "stream_selection": {"policy_version": "best-stream-v1", "primary_score": 88.45},
+        },
+        "TNT Sports 1": {"id": None, "logo": None, "qualities": None},
+        "Ünïcode TV": {"id": 7, "logo": None, "qualities": {"SD": []}, "primary": None},
+        "Odd": {"qualities": {"HD": "not-a-list"}, "id": "x"},
+    },
+}
+
+
+class ChannelStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.json_path = str(Path(self.tmp.name) / "channels.json")
+        self.store_path = str(Path(self.tmp.name) / "channels.sqlite")
+        Path(self.json_path).write_text(render_json(PAYLOAD), encoding="utf-8")
+
+    def test_round_trip_export_is_byte_identical(self):
+        with ChannelStore.open_synced(self.json_path, self.store_path) as store:
+            self.assertEqual(render_json(PAYLOAD), render_json(store.export_payload()))
+            self.assertEqual({"Sky Sports Main Event": 101, "TNT Sports 1": None, "Ünïcode TV": 7, "Odd": None}, store.channel_ids())
+            self.assertEqual(
+                [("Sky Sports Main Event", "FHD", "http://a/1.ts"), ("Sky Sports Main Event", "HD", "http://b/2.ts")],
+                list(store.iter_quality_urls())[:2],
+            )
+
+    def test_partial_update_touches_only_given_fields(self):
+        with ChannelStore.open_synced(self.json_path, self.store_path) as store:
+            store.update_channel("Sky Sports Main Event", qualities={"HD": ["http://c/3.ts"]}, last_checked="T")
+            store.set_metadata({"stream_tester": {"alive_urls": 1}})
+            store.export_json(self.json_path)
+
+        exported = json.loads(Path(self.json_path).read_text(encoding="utf-8"))
+        channel = exported["channels"]["Sky Sports Main Event"]
+        self.assertEqual({"HD": ["http://c/3.ts"]}, channel["qualities"])
+        self.assertEqual(PAYLOAD["channels"]["Sky Sports Main Event"]["primary"], channel["primary"])
+        self.assertEqual("last_checked", list(channel)[-1])
+        self.assertEqual(["scan_date", "stats", "unique_channels", "stream_tester"], list(exported["metadata"]))
+
+    def test_failed_transaction_rolls_back(self):
+        with ChannelStore.open_synced(self.json_path, self.store_path) as store:
+            with self.assertRaises(RuntimeError):
+                with store.transaction():
+                    store.delete_channel("TNT Sports 1")
+                    raise RuntimeError("boom")
+            self.assertIn("TNT Sports 1", store.channel_names())
+
+    def test_external_json_change_is_reimported(self):
+        with ChannelStore.open_synced(self.json_path, self.store_path) as store:
+            store.export_json(self.json_path)
+        edited = json.loads(Path(self.json_path).read_text(encoding="utf-8"))
+        edited["channels"]["New Channel"] = {"id": 5, "logo": None, "qualities": {}}
+        Path(self.json_path).write_text(render_json(edited), encoding="utf-8")
+
+        with ChannelStore.open_synced(self.json_path, self.store_path) as store:
+            self.assertEqual("New Channel", store.channel_names()[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import datetime as dt
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import scrape_schedule_flashscore as flashscore
+from day_store import FAR_STALE_AFTER_SECONDS, DayStore, day_store_path, refresh_days, stale_after_seconds
+from scrape_schedule_fanzo import scrape_range
+
+TODAY = dt.date(2026, 3, 14)
+NOW = dt.datetime(2026, 3, 14, 6, 0, tzinfo=dt.timezone.utc).timestamp()
+HOUR = 3600
+DATES = [TODAY + dt.timedelta(days=offset) for offset in range(7)]
+
+
+class FakeFanzo:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.fetched = []
+
+    def fetch_day(self, target_date, tz):
+        self.fetched.append(target_date)
+        if target_date in self.fail:
+            raise RuntimeError("fixtures unavailable")
+        return [{"id": f"{target_date.isoformat()}-1", "sport": {"name": "Rugby"}, "name": f"A v B {target_date.day}"}]
+
+
+class DayStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = day_store_path("fanzo", self.tmp.name)
+
+    def refresh(self, fetched, now, fail=(), variant="tz=UTC"):
+        store = DayStore(self.path, variant=variant)
+
+        def fetch(target_date):
+            fetched.append(target_date)
+            if target_date in fail:
+                raise RuntimeError("down")
+            return {"day": target_date.isoformat(), "at": now}
+
+        payloads, stats = refresh_days(store, DATES, fetch, TODAY, workers=3, now=now)
+        store.save()
+        return payloads, stats
+
+    def test_staleness_grows_with_distance_from_today(self):
+        self.assertEqual(
+            [0, 0, 0, 20 * HOUR, 20 * HOUR, FAR_STALE_AFTER_SECONDS],
+            [stale_after_seconds(TODAY + dt.timedelta(days=offset), TODAY) for offset in (-1, 0, 1, 2, 3, 4)],
+        )
+
+    def test_only_stale_days_are_refetched(self):
+        fetched = []
+        first, stats = self.refresh(fetched, NOW)
+        self.assertEqual(DATES, fetched)
+        self.assertEqual({"fetched"}, {day["source"] for day in stats})
+
+        # Six hours later: today and tomorrow are refetched, later days come from the store.
+        fetched.clear()
+        payloads, stats = self.refresh(fetched, NOW + 6 * HOUR)
+        self.assertEqual(DATES[:2], fetched)
+        self.assertEqual(["fetched"] * 2 + ["stored"] * 5, [day["source"] for day in stats])
+        self.assertEqual(first[2:], payloads[2:])
+        self.assertEqual(6 * HOUR, stats[4]["age_seconds"])
+
+        # A day later, days 2-3 (20h) are stale again but far days (47h) are not.
+        fetched.clear()
+        self.refresh(fetched, NOW + 24 * HOUR)
+        self.assertEqual(DATES[:4], fetched)
+
+    def test_failed_fetch_falls_back_to_stored_payload(self):
+        first, _ = self.refresh([], NOW)
+        payloads, stats = self.refresh([], NOW + 6 * HOUR, fail={DATES[0]})
+        self.assertEqual(first[0], payloads[0])
+        self.assertEqual(("stored-fallback", "down"), (stats[0]["source"], stats[0]["error"]))
+
+        # Another variant (e.g. timezone) never reuses the stored days.
+        fetched = []
+        payloads, stats = self.refresh(fetched, NOW + 6 * HOUR, fail={DATES[0]}, variant="tz=Europe/London")
+        self.assertEqual(DATES, fetched)
+        self.assertEqual((None, "failed"), (payloads[0], stats[0]["source"]))
+
+    def test_fanzo_incremental_scrape_keeps_output_shape(self):
+        store = DayStore(self.path)
+        client = FakeFanzo()
+        scrape_range(client, TODAY, 4, dt.timezone.utc, day_store=store, today=TODAY)
+        baseline = scrape_range(FakeFanzo(), TODAY, 4, dt.timezone.utc)
+        store.save()
+
+        client = FakeFanzo(fail={TODAY})
+        payload = scrape_range(client, TODAY, 4, dt.timezone.utc, day_store=DayStore(self.path), today=TODAY)
+        self.assertEqual(DATES[:2], client.fetched)
+        self.assertEqual(baseline["schedule"], payload["schedule"])
+        self.assertEqual(
+            ["stored-fallback", "fetched", "stored", "stored"],
+            [day["source"] for day in payload["extraction"]["day_stats"]],
+        )
+
+    def test_flashscore_fetches_only_stale_feeds(self):
+        cfg = flashscore.FlashscoreConfig(
+            host="https://feed.example",
+            feed_sign="sign",
+            project_id=2,
+            project_type_id=1,
+            lang_web="en",
+            timezone_hour=0,
+        )
+        requested = []
+
+        def fake_fetch(session, cfg, day_offsets, timeout, workers=1, refresh_config=None):
+            requested.append(list(day_offsets))
+            return cfg, [f"feed {offset}" for offset in day_offsets], False
+
+        with mock.patch.object(flashscore, "fetch_feeds_with_config_refresh", fake_fetch):
+            for hours in (0, 6):
+                store = DayStore(day_store_path("flashscore", self.tmp.name), variant=flashscore.feed_variant(cfg))
+                _, texts, _, stats = flashscore.fetch_feeds_incremental(
+                    None, cfg, [0, 1, 2, 3], 5, store, now=NOW + hours * HOUR
+                )
+                store.save()
+        self.assertEqual([[0, 1, 2, 3], [0, 1]], requested)
+        self.assertEqual(["feed 0", "feed 1", "feed 2", "feed 3"], texts)
+        self.assertEqual(["fetched", "fetched", "stored", "stored"], [day["source"] for day in stats])
+
+
+if __name__ == "__main__":
+    unittest.main()
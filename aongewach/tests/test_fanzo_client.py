@@ -0,0 +1,93 @@
+import datetime as dt
+import threading
+import time
+import unittest
+from unittest import mock
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from scrape_schedule_fanzo import FanzoClient, scrape_range
+
+
+class _Response:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeFixturesApi:
+    """Serves `total` fixtures per day; the first token it sees is treated as expired."""
+
+    def __init__(self, total):
+        self.total = total
+        self.lock = threading.Lock()
+        self.rejected_token = None
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        token = headers["authorization"]
+        with self.lock:
+            if self.rejected_token is None:
+                self.rejected_token = token
+            self.requests.append(params["offset"])
+        time.sleep(0.005)
+        if token == self.rejected_token:
+            return _Response(401)
+        offset, limit = params["offset"], params["limit"]
+        day = params["localDateUtc"][:10]
+        result = [{"id": f"{day}-{index}"} for index in range(offset, min(offset + limit, self.total))]
+        return _Response(200, {"result": result})
+
+    def close(self):
+        pass
+
+
+class FanzoClientTests(unittest.TestCase):
+    def fetch(self, page_workers, total=250):
+        api = FakeFixturesApi(total)
+        client = FanzoClient(page_workers=page_workers, http_client=api)
+        events = client.fetch_day(dt.date(2026, 3, 14), dt.timezone.utc, limit=50)
+        return events, api, client
+
+    def test_parallel_pages_match_sequential_paging(self):
+        sequential, sequential_api, _ = self.fetch(page_workers=1)
+        parallel, parallel_api, client = self.fetch(page_workers=4)
+        self.assertEqual(250, len(sequential))
+        self.assertEqual(sequential, parallel)
+        # Pages 0..5 are needed (the sixth is empty); at most workers-1 speculative pages follow.
+        self.assertLessEqual(len(set(parallel_api.requests)), 6 + 3)
+
+        exact, _, _ = self.fetch(page_workers=4, total=120)
+        self.assertEqual(120, len(exact))
+
+    def test_concurrent_401s_trigger_a_single_token_refresh(self):
+        _, api, client = self.fetch(page_workers=4)
+        self.assertEqual(2, client.token_refreshes)
+        self.assertNotEqual(api.rejected_token, f"Bearer {client.jwt_token}")
+
+    def test_days_run_concurrently_in_date_order(self):
+        api = FakeFixturesApi(120)
+        client = FanzoClient(page_workers=2, http_client=api)
+        with mock.patch("scrape_schedule_fanzo.transform_event", lambda raw, non_soccer_only=True: raw):
+            payload = scrape_range(client, dt.date(2026, 3, 14), 4, dt.timezone.utc, day_workers=4)
+        self.assertEqual(["2026-03-14", "2026-03-15", "2026-03-16", "2026-03-17"], [day["date"] for day in payload["schedule"]])
+        for day in payload["schedule"]:
+            self.assertEqual(f"{day['date']}-0", day["events"][0]["id"])
+            self.assertEqual(120, len(day["events"]))
+        self.assertEqual(2, client.token_refreshes)
+
+
+if __name__ == "__main__":
+    unittest.main()
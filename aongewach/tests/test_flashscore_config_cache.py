@@ -0,0 +1,132 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import scrape_schedule_flashscore as fs
+
+BASE_PAGE = "https://www.flashscore.com/"
+CORE_URL = "https://www.flashscore.com/res/_fs/build/core_1.js"
+
+
+def core_js(sign):
+    config = {
+        "app": {
+            "project": {"id": 2},
+            "project_type": {"id": 1},
+            "lang": {"web": "en"},
+            "feed_resolver": {"default_url": "https://feed.test"},
+            "feed_sign": sign,
+        }
+    }
+    return "cjs._config = " + json.dumps(config) + ";"
+
+
+def feed(day_offset):
+    sep, idx = fs.CELL_DELIMITER, fs.INDEX_DELIMITER
+    return fs.ROW_DELIMITER.join([
+        f"SA{idx}1{sep}",
+        f"ZA{idx}ENGLAND: Premier League{sep}ZY{idx}England{sep}",
+        f"AA{idx}ev{day_offset}{sep}AD{idx}{1773500000 + day_offset * 86400}{sep}AE{idx}Home{day_offset}{sep}AF{idx}Away{sep}",
+    ])
+
+
+class _Response:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSite:
+    def __init__(self, sign):
+        self.sign = sign
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        with self.lock:
+            self.requests.append(url)
+        if url == BASE_PAGE:
+            return _Response(200, f'<script src="{CORE_URL}"></script><script>default_tz = 1</script>')
+        if url == CORE_URL:
+            return _Response(200, core_js(self.sign))
+        if (headers or {}).get("x-fsign") != self.sign:
+            return _Response(401)
+        day_offset = int(url.rsplit("/f_1_", 1)[1].split("_", 1)[0])
+        return _Response(200, feed(day_offset))
+
+
+class FlashscoreConfigCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_path = str(Path(self.tmp.name) / "flashscore_config.json")
+
+    def test_config_is_reused_until_invalid(self):
+        site = FakeSite("sig-1")
+        cfg, source = fs.load_or_resolve_config(site, BASE_PAGE, 5, self.cache_path)
+        self.assertEqual(("resolved", "sig-1", 1), (source, cfg.feed_sign, cfg.timezone_hour))
+        self.assertEqual([BASE_PAGE, CORE_URL], site.requests)
+
+        cached, source = fs.load_or_resolve_config(site, BASE_PAGE, 5, self.cache_path)
+        self.assertEqual(("cache", cfg), (source, cached))
+        self.assertEqual(2, len(site.requests))
+
+        payload = json.loads(Path(self.cache_path).read_text(encoding="utf-8"))
+        self.assertIsNone(fs.load_cached_config(self.cache_path, "https://www.flashscore.co.uk/"))
+        self.assertIsNone(
+            fs.load_cached_config(self.cache_path, BASE_PAGE, now=payload["resolved_at"] + fs.CONFIG_CACHE_MAX_AGE_SECONDS)
+        )
+        payload["config"]["project_id"] = "2"
+        Path(self.cache_path).write_text(json.dumps(payload), encoding="utf-8")
+        self.assertIsNone(fs.load_cached_config(self.cache_path, BASE_PAGE))
+
+    def test_rejected_signature_refreshes_config_once(self):
+        site = FakeSite("sig-1")
+        fs.load_or_resolve_config(site, BASE_PAGE, 5, self.cache_path)
+        site.sign = "sig-2"
+        site.requests.clear()
+        stale, _ = fs.load_or_resolve_config(site, BASE_PAGE, 5, self.cache_path)
+        refreshes = []
+
+        def refresh():
+            refreshes.append(1)
+            return fs.load_or_resolve_config(site, BASE_PAGE, 5, self.cache_path, force_refresh=True)[0]
+
+        offsets = list(range(-1, 6))
+        cfg, texts, refreshed = fs.fetch_feeds_with_config_refresh(
+            site, stale, offsets, 5, workers=4, refresh_config=refresh
+        )
+        self.assertTrue(refreshed)
+        self.assertEqual([1], refreshes)
+        self.assertEqual("sig-2", cfg.feed_sign)
+        self.assertEqual([feed(offset) for offset in offsets], texts)
+        self.assertEqual("sig-2", fs.load_cached_config(self.cache_path, BASE_PAGE).feed_sign)
+
+        site.requests.clear()
+        _, again, refreshed = fs.fetch_feeds_with_config_refresh(site, cfg, offsets, 5, workers=4, refresh_config=refresh)
+        self.assertEqual((texts, False, len(offsets)), (again, refreshed, len(site.requests)))
+
+    def test_non_feed_body_is_treated_as_signature_mismatch(self):
+        site = FakeSite("sig-1")
+        cfg, _ = fs.load_or_resolve_config(site, BASE_PAGE, 5, None)
+        site.get = lambda url, headers=None, timeout=None: _Response(200, "0")
+        results = fs.fetch_feeds(site, cfg, [0, 1], 5, workers=2)
+        self.assertTrue(all(isinstance(error, fs.FeedAuthError) for _, error in results))
+        with self.assertRaises(fs.FeedAuthError):
+            fs.fetch_feeds_with_config_refresh(site, cfg, [0, 1], 5, refresh_config=None)
+
+
+if __name__ == "__main__":
+    unittest.main()
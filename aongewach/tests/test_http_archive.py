@@ -0,0 +1,117 @@
+import datetime as dt
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+
+import requests
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import benchmark_scrapers
+from http_archive import HttpArchive, ReplayAdapter, request_key, use_archive
+from http_client import NO_RETRIES, PooledHttpClient
+from scrape_schedule_witm import SCHEDULE_URL_TEMPLATE
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.path.startswith("/token"):
+            status, body = (401, b"expired") if type(self).hits == 1 else (200, b'{"ok": true}')
+        else:
+            status, body = 200, f"page {self.path}".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def witm_page(date):
+    return (
+        "<html><body><table>"
+        '<tr itemscope itemtype="http://schema.org/BroadcastEvent">'
+        f'<td><span itemprop="name" content="Leinster v Munster"></span>'
+        f'<span itemprop="startDate" content="{date.isoformat()}T19:45:00Z"></span></td>'
+        '<td class="competition-name"><a>URC</a><img alt="Rugby Union Sport icon" src="/i/rugby.png"></td>'
+        '<td class="channel-details"><img class="channel" title="Premier Sports 1 logo"></td>'
+        "</tr></table></body></html>"
+    )
+
+
+class HttpArchiveTests(unittest.TestCase):
+    def setUp(self):
+        _Handler.hits = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = str(Path(self.tmp.name) / "source.json.gz")
+
+    def test_recorded_responses_replay_offline_in_order(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        archive = HttpArchive(meta={"source": "test"})
+        with use_archive(archive, "record"):
+            client = PooledHttpClient(retry_policy=NO_RETRIES)
+            recorded = [
+                client.get(base + "/token").status_code,
+                client.get(base + "/token").status_code,
+                client.get(base + "/day", params={"b": "2", "a": "1"}).text,
+            ]
+            client.close()
+        archive.save(self.path)
+        server.shutdown()
+        server.server_close()
+
+        replay = HttpArchive.load(self.path)
+        self.assertEqual("test", replay.meta["source"])
+        with use_archive(replay, "replay"):
+            client = PooledHttpClient(retry_policy=NO_RETRIES)
+            replayed = [
+                client.get(base + "/token").status_code,
+                client.get(base + "/token").status_code,
+                # Query order does not matter; headers are not part of the key.
+                client.get(base + "/day?a=1&b=2", headers={"If-None-Match": '"v1"'}).text,
+            ]
+            # Past the recorded responses the last one repeats.
+            self.assertEqual(200, client.get(base + "/token").status_code)
+            self.assertEqual('"v1"', client.get(base + "/token").headers["ETag"])
+            with self.assertRaises(requests.ConnectionError):
+                client.get(base + "/unknown")
+        self.assertEqual([401, 200, "page /day?b=2&a=1"], recorded)
+        self.assertEqual([401, 200, "page /day?b=2&a=1"], replayed)
+        self.assertEqual(["GET " + base + "/unknown"], replay.misses)
+
+        # Outside the block clients use the network again.
+        self.assertNotIsInstance(PooledHttpClient().session.get_adapter(base), ReplayAdapter)
+
+    def test_benchmark_runs_a_scraper_from_its_archive(self):
+        start = dt.date(2026, 3, 14)
+        entries = []
+        for offset in range(2):
+            day = start + dt.timedelta(days=offset)
+            url = SCHEDULE_URL_TEMPLATE.format(date=day.strftime("%Y%m%d"))
+            entries.append({"key": request_key("GET", url), "status": 200, "headers": {}, "text": witm_page(day)})
+        meta = {"source": "witm", "args": benchmark_scrapers.SOURCES["witm"][1](start, 2)}
+        HttpArchive(meta=meta, entries=entries).save(benchmark_scrapers.archive_path(self.tmp.name, "witm"))
+
+        results = benchmark_scrapers.benchmark(self.tmp.name, ["witm", "fanzo"], repeat=2)
+        self.assertEqual(["witm"], list(results))
+        self.assertEqual((0, 0, 2, 2), tuple(results["witm"][key] for key in ("exit", "misses", "requests", "runs")))
+
+
+if __name__ == "__main__":
+    unittest.main()
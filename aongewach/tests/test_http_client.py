@@ -0,0 +1,193 @@
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_client import NO_RETRIES, HostRateLimiter, PooledHttpClient, TokenBucket, format_timing_report
+from response_cache import ResponseCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.path == "/flaky" and type(self).hits == 1:
+            status, body = 503, b"busy"
+        elif self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            status, body = 304, b""
+        else:
+            status, body = 200, b"#EXTM3U\n"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledHttpClientTests(unittest.TestCase):
+    def setUp(self):
+        _Handler.hits = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def test_keep_alive_reuses_one_connection_and_records_timing(self):
+        client = PooledHttpClient(retries=0)
+        self.addCleanup(client.close)
+        for _ in range(3):
+            self.assertEqual(200, client.get(self.base + "/list.m3u").status_code)
+
+        node = client.timing_report()["127.0.0.1"]
+        self.assertEqual(3, node["requests"])
+        self.assertEqual(1, node["new_connections"])
+        self.assertEqual(3 * len(b"#EXTM3U\n"), node["bytes"])
+
+    def test_retries_transient_status_codes(self):
+        client = PooledHttpClient(retries=2, backoff_factor=0)
+        self.addCleanup(client.close)
+        response = client.get(self.base + "/flaky")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, _Handler.hits)
+
+    def test_retry_policy_can_leave_retries_to_the_caller(self):
+        client = PooledHttpClient(retry_policy=NO_RETRIES)
+        self.addCleanup(client.close)
+        self.assertEqual(503, client.get(self.base + "/flaky").status_code)
+        self.assertEqual(1, client.timing_report()["127.0.0.1"]["errors"])
+
+    def test_clones_share_limiter_cache_and_metrics(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        limiter = HostRateLimiter(max_concurrent=1)
+        client = PooledHttpClient(retries=0, limiter=limiter, cache=ResponseCache(tmp.name))
+        clone = client.clone()
+        self.addCleanup(client.close)
+        self.addCleanup(clone.close)
+        self.assertIsNot(client.session, clone.session)
+
+        parse = lambda body: body.decode("utf-8")
+        self.assertEqual(("#EXTM3U\n", "fetched"), client.fetch_cached(self.base + "/etag", parse))
+        self.assertEqual(("#EXTM3U\n", "not-modified"), clone.fetch_cached(self.base + "/etag", parse))
+
+        node = client.timing_report()["127.0.0.1"]
+        self.assertEqual((2, 1, 1), (node["requests"], node["cache_fetched"], node["cache_not_modified"]))
+        self.assertEqual(2, limiter.snapshot()["127.0.0.1"]["requests"])
+        self.assertIn("p95_ms", node)
+        [line] = client.timing_lines()
+        self.assertTrue(line.startswith("127.0.0.1: requests=2 errors=0 new_conns=2 "))
+        self.assertIn("cache[fetched=1 not_modified=1]", line)
+
+    def test_session_factory_adapters_are_kept_and_timed(self):
+        class ProfileAdapter(HTTPAdapter):
+            """Stands in for cloudscraper's CipherSuiteAdapter, which adds pool kwargs in init_poolmanager."""
+
+            def init_poolmanager(self, *args, **kwargs):
+                kwargs["source_address"] = ("127.0.0.1", 0)
+                return super().init_poolmanager(*args, **kwargs)
+
+        def factory():
+            session = requests.Session()
+            session.mount("http://", ProfileAdapter())
+            return session
+
+        client = PooledHttpClient(retries=0, pool_maxsize=3, session_factory=factory)
+        self.addCleanup(client.close)
+        adapter = client.session.get_adapter(self.base)
+        self.assertIsInstance(adapter, ProfileAdapter)
+        self.assertEqual(("127.0.0.1", 0), adapter.poolmanager.connection_pool_kw["source_address"])
+        self.assertEqual(3, adapter.poolmanager.connection_pool_kw["maxsize"])
+        self.assertEqual(200, client.get(self.base + "/list.m3u").status_code)
+        self.assertEqual((1, 1), tuple(client.timing_report()["127.0.0.1"][key] for key in ("requests", "new_connections")))
+
+    def test_format_timing_report_orders_hosts_by_transfer_time(self):
+        report = {
+            "a.example": {"requests": 1, "transfer_seconds": 0.1},
+            "b.example": {"requests": 3, "transfer_seconds": 2.0, "p50_ms": 10.0, "p95_ms": 40.0},
+        }
+        lines = format_timing_report(report, {"b.example": {"wait_seconds": 1.5}})
+        self.assertEqual(["b.example", "a.example"], [line.split(":", 1)[0] for line in lines])
+        self.assertIn("p50=10ms p95=40ms limiter_wait=1.50s", lines[0])
+
+
+class HostRateLimiterTests(unittest.TestCase):
+    def test_caps_in_flight_requests_and_spaces_starts_per_host(self):
+        limiter = HostRateLimiter(max_concurrent=2, min_interval=0.01)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def worker():
+            with limiter.acquire("https://example.com/a"):
+                with lock:
+                    state["active"] += 1
+                    state["peak"] = max(state["peak"], state["active"])
+                time.sleep(0.02)
+                with lock:
+                    state["active"] -= 1
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with limiter.acquire("https://other.example/"):
+            pass
+
+        self.assertEqual(2, state["peak"])
+        self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+        snapshot = limiter.snapshot()
+        self.assertEqual(6, snapshot["example.com"]["requests"])
+        self.assertEqual(1, snapshot["other.example"]["requests"])
+
+
+class TokenBucketTests(unittest.TestCase):
+    def make(self, rate, burst=1.0):
+        clock = {"now": 100.0}
+        waits = []
+        bucket = TokenBucket(rate, burst, clock=lambda: clock["now"], sleep=waits.append)
+        return bucket, clock, waits
+
+    def test_spaces_requests_after_the_burst(self):
+        bucket, clock, waits = self.make(rate=2.0, burst=2.0)
+        self.assertEqual([0.0, 0.0, 0.5, 1.0], [bucket.acquire() for _ in range(4)])
+        self.assertEqual([0.5, 1.0], waits)
+        clock["now"] += 10.0
+        self.assertEqual(0.0, bucket.acquire())
+
+    def test_retry_after_holds_back_every_caller(self):
+        bucket, clock, _ = self.make(rate=1.0, burst=3.0)
+        bucket.defer(5.0)
+        self.assertEqual([5.0, 6.0], [bucket.acquire(), bucket.acquire()])
+        clock["now"] += 7.0
+        self.assertEqual(0.0, bucket.acquire())
+
+        unlimited, clock, _ = self.make(rate=0.0)
+        self.assertEqual(0.0, unlimited.acquire())
+        unlimited.defer(3.0)
+        clock["now"] += 1.0
+        self.assertEqual([2.0, 2.0], [unlimited.acquire(), unlimited.acquire()])
+        self.assertEqual(1, unlimited.snapshot()["deferrals"])
+
+
+if __name__ == "__main__":
+    unittest.main()
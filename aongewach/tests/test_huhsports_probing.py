@@ -0,0 +1,176 @@
+import datetime as dt
+import json
+import random
+import threading
+import time
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import requests
+
+import scrape_schedule_huhsports as huh
+
+BASE_URL = "https://www.huhsports.com/tv-guide"
+START = dt.date(2026, 3, 14)
+PROXIES = ["http://10.0.0.1:8000", "http://10.0.0.2:8000", "http://10.0.0.3:8000"]
+
+
+def page_for(date_iso):
+    leagues = [{
+        "id": 1,
+        "name": "Premier League",
+        "slug": "premier-league",
+        "matches": [{
+            "id": f"m-{date_iso}",
+            "date": date_iso,
+            "time": "15:00",
+            "homeTeam": f"Home {date_iso}",
+            "awayTeam": "Away",
+            "channels": [{"id": 7, "name": "Sky Sports", "country_code": "GB"}],
+        }],
+    }]
+    chunk = json.dumps('{"initialLeagues":' + json.dumps(leagues) + "}")[1:-1]
+    return f'<script>self.__next_f.push([1,"{chunk}"])</script>'
+
+
+class _Response:
+    def __init__(self, url, status_code, text="", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Only `showdatestart` exposes other days; proxy .1 is down and every route is slow-ish."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = []
+        self.threads = set()
+
+    def get(self, url, timeout=None, proxies=None):
+        proxy = (proxies or {}).get("https")
+        with self.lock:
+            self.calls.append((url, proxy))
+            self.threads.add(threading.get_ident())
+            delay = self.rng.random() * 0.01
+        time.sleep(delay)
+        if proxy == PROXIES[0]:
+            raise requests.ConnectionError(f"proxy {proxy} refused")
+        query = dict(parse_qsl(urlsplit(url).query))
+        if "showdatestart" in query:
+            raw = query["showdatestart"]
+            return _Response(url, 200, page_for(f"{raw[:4]}-{raw[4:6]}-{raw[6:]}"))
+        return _Response(url, 200, page_for(START.isoformat()))
+
+
+class ProxyPoolTests(unittest.TestCase):
+    def test_quarantine_and_gradual_readmission(self):
+        clock = {"now": 0.0}
+        pool = huh.ProxyPool(PROXIES[:2], mode="health", min_interval_seconds=0, clock=lambda: clock["now"])
+        bad, good = pool.routes
+        pool.record_success(good, 0.2)
+        pool.record_failure(bad)
+        self.assertEqual(2, pool.healthy_count())
+        pool.record_failure(bad)
+        self.assertEqual(1, pool.healthy_count())
+        for _ in range(3):
+            route, wait = pool.acquire()
+            self.assertEqual((good, 0.0), (route, wait))
+            pool.release(route)
+
+        clock["now"] += huh.PROXY_QUARANTINE_BASE_SECONDS
+        self.assertEqual(2, pool.healthy_count())
+        self.assertEqual(huh.PROXY_PROBATION_TRUST, bad.trust)
+        # While the healthy proxy keeps up, the probation one scores far worse and stays idle.
+        self.assertEqual(good, pool.acquire()[0])
+        pool.release(good)
+        # Even when rotated in, a proxy on probation carries at most one request at a time.
+        pool.mode = "round_robin"
+        held = [pool.acquire()[0] for _ in range(3)]
+        self.assertEqual(1, held.count(bad))
+        for route in held:
+            pool.release(route)
+
+        for _ in range(3):
+            pool.record_success(bad, 0.1)
+        self.assertEqual(1.0, bad.trust)
+        self.assertEqual(0, bad.quarantine_count)
+
+    def test_retry_after_quarantines_for_at_least_that_long_and_defers_the_bucket(self):
+        clock = {"now": 0.0}
+        pool = huh.ProxyPool(PROXIES[:2], min_interval_seconds=0, clock=lambda: clock["now"])
+        limited = pool.routes[0]
+        pool.record_failure(limited, retry_after=120.0)
+        self.assertEqual(120.0, limited.quarantined_until)
+        self.assertEqual(1, limited.bucket.snapshot()["deferrals"])
+
+        direct = huh.ProxyPool([], min_interval_seconds=0, clock=lambda: clock["now"])
+        self.assertEqual("direct", direct.routes[0].label)
+        direct.record_failure(direct.routes[0], retry_after=30.0)
+        self.assertEqual(0.0, direct.routes[0].quarantined_until)
+
+
+class ConcurrentProbeTests(unittest.TestCase):
+    def probe(self, workers, seed):
+        session = FakeSession(seed)
+        proxies = huh.ProxyPool(PROXIES, mode="health", min_interval_seconds=0)
+        dates = [START + dt.timedelta(days=offset) for offset in range(5)]
+        result = huh.probe_requested_dates(
+            session=session,
+            url=BASE_URL,
+            requested_dates=dates,
+            timeout=5,
+            retries=3,
+            backoff_seconds=0.0,
+            max_backoff_seconds=1.0,
+            proxies=proxies,
+            max_probe_requests=20,
+            stop_probing_after_rate_limits=2,
+            workers=workers,
+        )
+        return result, session, proxies
+
+    def test_concurrent_probing_matches_sequential_and_avoids_dead_proxy(self):
+        sequential, _, _ = self.probe(workers=1, seed=1)
+        self.assertEqual(9, sequential["requests_used"])
+        self.assertTrue(all(sequential["hits"].values()))
+        for seed in (2, 3):
+            concurrent, session, proxies = self.probe(workers=4, seed=seed)
+            self.assertEqual(sequential, concurrent)
+            self.assertGreater(len(session.threads), 1)
+            dead = [call for call in session.calls if call[1] == PROXIES[0]]
+            self.assertLessEqual(len(dead), huh.PROXY_QUARANTINE_AFTER_FAILURES + 1)
+            self.assertEqual(0, proxies.routes[1].failures + proxies.routes[2].failures)
+
+    def test_budget_is_shared_across_workers(self):
+        session = FakeSession(0)
+        result = huh.probe_requested_dates(
+            session=session,
+            url=BASE_URL,
+            requested_dates=[START + dt.timedelta(days=offset) for offset in range(5)],
+            timeout=5,
+            retries=1,
+            backoff_seconds=0.0,
+            max_backoff_seconds=1.0,
+            proxies=huh.ProxyPool(PROXIES[1:], min_interval_seconds=0),
+            max_probe_requests=3,
+            stop_probing_after_rate_limits=2,
+            workers=4,
+        )
+        self.assertEqual(3, result["requests_used"])
+        self.assertEqual(3, len(result["attempted_urls"]))
+        self.assertTrue(result["truncated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import json_patch
+from publish_artifacts import minify_json
+
+
+class JsonPatchTests(unittest.TestCase):
+    def test_diff_round_trips_objects_arrays_and_escaped_keys(self):
+        old = {"a/b": [1, 2, {"x": True}], "c~": {"d": 1}, "keep": "same", "flag": 1}
+        new = {"a/b": [1, {"x": 1}, 9], "c~": {}, "keep": "same", "flag": True, "f": None}
+        ops = json_patch.diff(old, new)
+        self.assertEqual(new, json_patch.apply(old, ops))
+        self.assertIn({"op": "remove", "path": "/c~0/d"}, ops)
+        self.assertIn({"op": "replace", "path": "/flag", "value": True}, ops)
+        self.assertNotIn("/keep", [op["path"] for op in ops])
+
+    def test_array_insert_and_delete_touch_only_changed_positions(self):
+        old = {"events": [{"n": i} for i in range(10)]}
+        new = {"events": [{"n": i} for i in range(10) if i != 3]}
+        new["events"].insert(6, {"n": "new"})
+        ops = json_patch.diff(old, new)
+        self.assertEqual(new, json_patch.apply(old, ops))
+        self.assertLessEqual(len(ops), 4)
+        self.assertEqual(old, json_patch.apply(old, json_patch.diff(old, old)))
+
+    def test_type_changes_inside_containers_are_not_equal(self):
+        cases = [
+            ([{"ok": 1}], [{"ok": True}]),
+            ([[1, 2]], [[True, 2]]),
+            ({"list": [1.0]}, {"list": [1]}),
+            ({"a": 1, "b": 2}, {"b": 2, "a": 1}),
+            ({"a": 1, "c": 3}, {"a": 1, "b": 2, "c": 3}),
+        ]
+        for old, new in cases:
+            ops = json_patch.diff(old, new)
+            self.assertNotEqual([], ops)
+            self.assertEqual(minify_json(new), minify_json(json_patch.apply(old, ops)))
+
+    def test_apply_rejects_bad_paths(self):
+        with self.assertRaises(ValueError):
+            json_patch.apply({"a": []}, [{"op": "remove", "path": "/a/0"}])
+        with self.assertRaises(ValueError):
+            json_patch.apply({"a": 1}, [{"op": "replace", "path": "/b", "value": 2}])
+
+
+if __name__ == "__main__":
+    unittest.main()
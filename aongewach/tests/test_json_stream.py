@@ -0,0 +1,57 @@
+import json
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from json_stream import iter_json_array
+from scan_sports_channels import decode_live_stream_chunks
+
+
+def _chunked(raw: bytes, size: int):
+    return (raw[i:i + size] for i in range(0, len(raw), size))
+
+
+class JsonStreamTests(unittest.TestCase):
+    def test_elements_survive_any_chunk_boundary(self):
+        payload = [
+            {"name": "UK: Sky Sports Main Event ᴴᴰ", "stream_id": 1, "tags": [1, {"x": "]"}]},
+            2.5,
+            -17,
+            "s,]",
+            None,
+            True,
+        ]
+        raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        for size in (1, 2, 3, 5, 64):
+            self.assertEqual(payload, list(iter_json_array(_chunked(raw, size))), size)
+
+    def test_non_array_payload_yields_nothing(self):
+        self.assertEqual([], list(iter_json_array([b'{"user_info": {"auth": 0}}'])))
+        self.assertEqual([], list(iter_json_array([b" [ ] "])))
+
+    def test_truncated_array_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[{"name": "a"}, {"name"']))
+
+    def test_live_streams_are_reduced_to_compact_rows(self):
+        raw = json.dumps(
+            [
+                {"num": 1, "name": " TNT Sports 1 HD ", "stream_id": 11, "stream_icon": "", "epg_channel_id": "x"},
+                {"num": 2, "name": "", "stream_id": 12},
+                {"num": 3, "name": "Sky Sports F1", "stream_id": 13, "stream_icon": "https://logo/x.png"},
+            ]
+        ).encode("utf-8")
+        rows = decode_live_stream_chunks(_chunked(raw, 7))
+        self.assertEqual(
+            [("TNT Sports 1 HD", 11, None, "x"), ("Sky Sports F1", 13, "https://logo/x.png", "")],
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import datetime as dt
+import json
+import random
+import threading
+import time
+import unittest
+from pathlib import Path
+from urllib.parse import urlparse
+import sys
+
+import requests
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import scrape_schedule_livesporttv as lstv
+
+TARGET_DATE = dt.date(2026, 3, 14)
+TOURNAMENTS = 12
+
+
+def match_html(token, home, away, hour, channels, comp):
+    anchors = "".join(f'<a href="#">{name}</a>' for name in channels)
+    return (
+        f'<div data-match="{token}" data-time="2026-03-14 {hour:02d}:00:00" data-sport="1" data-comp="{comp}">'
+        f'<div class="matches-status"><a class="link_matchs_pjax" href="/soccer/{comp.lower()}/{token}">FT</a></div>'
+        f'<span class="match__home__name">{home}</span><span class="match__away__name">{away}</span>'
+        f'<div class="match__channels">{anchors}</div></div>'
+    )
+
+
+def tournament_li(index):
+    return (
+        f'<li data-request_id="t{index}" data-create_time="1" data-expire_time="2" '
+        f'data-order_by="{index}" data-time_zone="UTC"></li>'
+    )
+
+
+def build_site():
+    schedule = (
+        '<html lang="en"><script>version: \'9\', time_zone: \'UTC\', iso_code: \'GB\'</script>'
+        '<div id="list-sport-1" data-multisite_sport="1" data-sport_name="Soccer"></div>'
+        + "".join(tournament_li(index) for index in range(4))
+        + "<ul><li>"
+        + match_html("ssAAAA", "Alpha", "Beta", 12, ["Sky Sports Main Event"], "LeagueA")
+        + "</li></ul></html>"
+    )
+    pages = {
+        "1": {"soccer": ["".join(tournament_li(index) for index in range(2, 8))]},
+        "2": {"soccer": ["".join(tournament_li(index) for index in range(8, TOURNAMENTS))]},
+    }
+    tournaments = {}
+    for index in range(TOURNAMENTS):
+        matches = []
+        for offset in range(3):
+            # Overlapping tokens across tournaments make merge order observable.
+            token = f"mm{(index + offset) % (TOURNAMENTS + 2):04d}"
+            matches.append({
+                "html": match_html(
+                    token,
+                    f"Home{token}",
+                    f"Away{token}",
+                    10 + (index + offset) % 10,
+                    [f"Channel {index}", f"Channel {offset} HD"],
+                    f"League{index % 3}",
+                )
+            })
+        tournaments[f"t{index}"] = {"matches": matches}
+    tournaments["t5"] = "broken"
+    return schedule, pages, tournaments
+
+
+class FakeClient(lstv.LiveSportTVClient):
+    def __init__(self, site, limiter=None, seed=0):
+        super().__init__(timeout=1, retries=1, backoff_seconds=0, limiter=limiter)
+        self.site = site
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.threads = site.setdefault("threads", set())
+
+    def clone(self):
+        return FakeClient(self.site, limiter=self.limiter, seed=self.rng.random())
+
+    def _get_text(self, url, params=None):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.rng.random() * 0.01)
+        schedule, pages, tournaments = self.site["data"]
+        path = urlparse(url).path
+        if path.startswith("/schedules/"):
+            return schedule
+        if path == "/data-today":
+            return json.dumps(pages.get(params["page"], {}))
+        if path.startswith("/api/collapsible/tournament"):
+            payload = tournaments[params["request_id"]]
+            if payload == "broken":
+                raise RuntimeError("tournament failed")
+            return json.dumps(payload)
+        return (
+            '<div class="inter_nation"><div class="list-tv-international">'
+            f'<span class="list-tv-country">Kenya</span><span class="list-tv-name"><a>{path.rsplit("/", 1)[-1]} TV</a></span>'
+            "</div></div>"
+        )
+
+
+class LiveSportTVConcurrencyTests(unittest.TestCase):
+    def scrape(self, workers, seed):
+        site = {"data": build_site()}
+        client = FakeClient(site, limiter=lstv.HostRateLimiter(max_concurrent=4), seed=seed)
+        events, stats = lstv.scrape_one_date(
+            client,
+            TARGET_DATE,
+            include_data_today=True,
+            max_pages=3,
+            max_tournaments=None,
+            keep_noisy_channels=False,
+            match_country_workers=workers,
+            enable_geo_profiles=False,
+            tournament_workers=workers,
+        )
+        stats = {key: value for key, value in stats.items() if key not in ("stage_times_ms", "elapsed_ms")}
+        for node in stats["profiles"].values():
+            node.pop("elapsed_ms", None)
+        for key in ("elapsed_ms", "workers_used"):
+            stats["match_country_enrichment"].pop(key, None)
+        return json.dumps(events, sort_keys=False), stats, site["threads"]
+
+    def test_concurrent_fetch_output_is_identical_to_sequential(self):
+        sequential, sequential_stats, _ = self.scrape(workers=1, seed=1)
+        self.assertEqual((TOURNAMENTS, 1), (sequential_stats["tournaments_total"], sequential_stats["tournaments_failed"]))
+        for seed in (2, 3, 4):
+            concurrent, concurrent_stats, threads = self.scrape(workers=6, seed=seed)
+            self.assertEqual(sequential, concurrent)
+            self.assertEqual(sequential_stats, concurrent_stats)
+            self.assertGreater(len(threads), 1)
+
+    def test_parallel_days_return_results_in_date_order(self):
+        dates = [TARGET_DATE + dt.timedelta(days=offset) for offset in range(4)]
+        runs = []
+        for day_workers in (1, 3):
+            client = FakeClient({"data": build_site()}, limiter=lstv.HostRateLimiter(max_concurrent=3), seed=day_workers)
+            results = lstv.scrape_dates(
+                client,
+                dates,
+                day_workers=day_workers,
+                include_data_today=True,
+                max_pages=2,
+                max_tournaments=None,
+                keep_noisy_channels=False,
+                match_country_workers=2,
+                tournament_workers=2,
+            )
+            self.assertEqual([None] * len(dates), [error for _, error in results])
+            runs.append(json.dumps([events for (events, _), _ in results]))
+            self.assertEqual(
+                [TOURNAMENTS] * len(dates),
+                [stats["tournaments_total"] for (_, stats), _ in results],
+            )
+        self.assertEqual(runs[0], runs[1])
+
+    def test_stale_clearance_403_is_retried_above_cloudscraper(self):
+        class Http:
+            def __init__(self):
+                self.statuses = [403, 403, 200]
+                self.calls = 0
+                self.session = None
+
+            def get(self, url, params=None, headers=None, timeout=None):
+                self.calls += 1
+                status = self.statuses.pop(0)
+                response = requests.Response()
+                response.status_code = status
+                response._content = b"ok"
+                return response
+
+        http = Http()
+        client = lstv.LiveSportTVClient(timeout=1, retries=3, backoff_seconds=0, http=http)
+        self.assertEqual("ok", client._get_text("https://www.livesporttv.com/"))
+        self.assertEqual(3, http.calls)
+
+        http.statuses = [403, 403, 403]
+        with self.assertRaises(RuntimeError):
+            client._get_text("https://www.livesporttv.com/")
+
+    def test_fetch_ordered_keeps_input_order_and_errors(self):
+        client = FakeClient({"data": build_site()})
+
+        def fetch(_client, item):
+            time.sleep((5 - item) * 0.002)
+            if item == 3:
+                raise ValueError(item)
+            return item * 10
+
+        results = lstv.fetch_ordered(client, fetch, list(range(6)), workers=4)
+        self.assertEqual([0, 10, 20, None, 40, 50], [result for result, _ in results])
+        self.assertIsInstance(results[3][1], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
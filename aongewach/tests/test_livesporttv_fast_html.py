@@ -0,0 +1,121 @@
+import gzip
+import json
+import os
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import benchmark_scrapers
+import scrape_schedule_livesporttv as lstv
+from http_archive import HttpArchive
+
+FIXTURES_DIR = TESTS_DIR / "fixtures" / "livesporttv"
+# Written by `benchmark_scrapers.py record --sources livesporttv` (live pages, not committed).
+RECORDED_ARCHIVE = benchmark_scrapers.archive_path(benchmark_scrapers.DEFAULT_ARCHIVE_DIR, "livesporttv")
+
+
+def read_fixture(path):
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return handle.read()
+
+
+def schedule_extraction(html, fast):
+    soup = lstv.parse_schedule_html(html, fast=fast)
+    config = lstv.extract_script_config(html)
+    sport_by_id = lstv.extract_sport_map(soup)
+    return {
+        "sport_by_id": sport_by_id,
+        "comp_ignore": lstv.extract_comp_ignore_ids(soup),
+        "tournaments": [vars(item) for item in lstv.extract_tournaments_from_soup(soup, config["iso_code"]).values()],
+        "events": [
+            lstv.parse_li_match_event(li, default_tz=config["time_zone"], sport_by_id=sport_by_id)
+            for li in lstv.iter_unique_match_nodes(soup)
+        ],
+    }
+
+
+def match_page_extraction(html, fast):
+    return lstv._extract_match_country_channel_payload(
+        html,
+        keep_noisy_channels=False,
+        include_live_tab=True,
+        target_countries=[],
+        include_all_international=True,
+        fast=fast,
+    )
+
+
+class FastHtmlExtractionTests(unittest.TestCase):
+    def test_schedule_fixtures_match_full_soup(self):
+        paths = sorted(FIXTURES_DIR.glob("schedule_*.html.gz"))
+        self.assertTrue(paths)
+        for path in paths:
+            html = read_fixture(path)
+            expected = schedule_extraction(html, fast=False)
+            self.assertTrue(expected["events"] and expected["tournaments"])
+            self.assertEqual(expected, schedule_extraction(html, fast=True), path.name)
+
+    def test_data_today_fixtures_match_full_soup(self):
+        for path in sorted(FIXTURES_DIR.glob("data_today_*.json.gz")):
+            payload = json.loads(read_fixture(path))
+            results = []
+            for fast in (False, True):
+                parsed = lstv.parse_data_today_tournaments(payload, default_iso_code="GB", fast=fast)
+                results.append({key: vars(value) for key, value in parsed.items()})
+            self.assertTrue(results[0])
+            self.assertEqual(results[0], results[1], path.name)
+
+    def test_match_page_fixtures_match_full_soup(self):
+        paths = sorted(FIXTURES_DIR.glob("match_*.html.gz"))
+        self.assertTrue(paths)
+        for path in paths:
+            html = read_fixture(path)
+            expected = match_page_extraction(html, fast=False)
+            self.assertGreater(expected["countries_found"], 0)
+            self.assertEqual(expected, match_page_extraction(html, fast=True), path.name)
+
+    def test_unclosed_rows_do_not_swallow_later_fragments(self):
+        html = (
+            '<ul><li data-match="a1"><span class="match__home__name">A<li data-match="a2"></ul>'
+            '<div><li data-match="b1"><span class="match__home__name">B</span></li></div>'
+            '<div class="list-tv-international">outside scope</div>'
+        )
+        fragments = lstv.ScheduleFragmentExtractor(html).extract()
+        self.assertEqual(
+            [
+                ("match", '<li data-match="a1"><span class="match__home__name">A<li data-match="a2"></li></span></li>'),
+                ("match", '<li data-match="b1"><span class="match__home__name">B</span></li>'),
+            ],
+            fragments,
+        )
+        self.assertEqual([], lstv.MatchPageFragmentExtractor(html).extract())
+
+    @unittest.skipUnless(os.path.exists(RECORDED_ARCHIVE), "no recorded LiveSportTV archive")
+    def test_recorded_live_pages_match_full_soup(self):
+        checked = 0
+        for entry in HttpArchive.load(RECORDED_ARCHIVE).entries:
+            url = entry["key"].split(" ", 1)[1]
+            if entry.get("status") != 200 or "text" not in entry or url.startswith(lstv.TOURNAMENT_ENDPOINT):
+                continue
+            if url.startswith(lstv.BASE_URL + "/schedules/"):
+                full, fast = (schedule_extraction(entry["text"], fast) for fast in (False, True))
+            elif url.startswith(lstv.DATA_TODAY_ENDPOINT):
+                payload = json.loads(entry["text"])
+                full, fast = (
+                    {key: vars(value) for key, value in lstv.parse_data_today_tournaments(payload, "GB", fast=fast).items()}
+                    for fast in (False, True)
+                )
+            else:
+                full, fast = (match_page_extraction(entry["text"], fast) for fast in (False, True))
+            self.assertEqual(full, fast, url)
+            checked += 1
+        self.assertTrue(checked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import datetime as dt
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import scrape_schedule_livesporttv as lstv
+from response_cache import ResponseCache
+
+NOW = dt.datetime(2026, 3, 14, 12, 0, tzinfo=dt.timezone.utc)
+MATCH_PAGE = (
+    '<div class="inter_nation"><div class="list-tv-international">'
+    '<span class="list-tv-country">Kenya</span><span class="list-tv-name"><a>SuperSport Football</a></span>'
+    "</div></div>"
+)
+
+
+class _Response:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.text = body.decode("utf-8")
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class PageClient(lstv.LiveSportTVClient):
+    def __init__(self, requests_seen):
+        super().__init__(timeout=1, retries=1, backoff_seconds=0)
+        self.requests_seen = requests_seen
+
+    def clone(self):
+        return PageClient(self.requests_seen)
+
+    def _get_response(self, url, params=None, headers=None):
+        self.requests_seen.append((url, dict(headers or {})))
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return _Response(304)
+        return _Response(200, MATCH_PAGE.encode("utf-8"), {"ETag": '"v1"'})
+
+
+def events_for(kickoff):
+    return [{
+        "name": "Alpha vs Beta",
+        "sport": "Soccer",
+        "start_time_iso": kickoff,
+        "channels": ["Sky Sports Main Event"],
+        "channel_candidates": [],
+        "match_url": "https://www.livesporttv.com/soccer/league/AbCd1234",
+    }]
+
+
+class MatchPageCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.requests_seen = []
+
+    def enrich(self, kickoff, now, cache_dir=None):
+        cache = ResponseCache(cache_dir or self.tmp.name)
+        events = events_for(kickoff)
+        stats = lstv.enrich_events_with_match_country_channels(
+            PageClient(self.requests_seen),
+            events,
+            keep_noisy_channels=False,
+            page_cache=cache,
+            now=now,
+        )
+        cache.save()
+        return events, stats
+
+    def test_ttl_shrinks_towards_kickoff(self):
+        def ttl(hours):
+            return lstv.match_page_ttl_seconds((NOW + dt.timedelta(hours=hours)).isoformat(), NOW)
+
+        self.assertEqual(
+            [lstv.MATCH_PAGE_FAR_TTL_SECONDS, 12 * 3600, 4 * 3600, 3600, 0, 0, lstv.MATCH_PAGE_SETTLED_TTL_SECONDS],
+            [ttl(120), ttl(72), ttl(30), ttl(6), ttl(1), ttl(-2), ttl(-6)],
+        )
+        self.assertEqual(lstv.MATCH_PAGE_UNKNOWN_KICKOFF_TTL_SECONDS, lstv.match_page_ttl_seconds(None, NOW))
+
+    def test_cached_payload_is_reused_then_revalidated(self):
+        kickoff = "2026-03-17T19:45:00Z"
+        first_events, first = self.enrich(kickoff, NOW)
+        self.assertEqual((1, 0), (first["fetched_pages"], first["cache_fresh"]))
+        self.assertIn("SuperSport Football", first_events[0]["channels"])
+        self.assertEqual(1, len(self.requests_seen))
+
+        # Next run, same day: still inside the 12h TTL for a kickoff three days out.
+        events, stats = self.enrich(kickoff, NOW + dt.timedelta(hours=6))
+        self.assertEqual(1, stats["cache_fresh"])
+        self.assertEqual(1, len(self.requests_seen))
+        self.assertEqual(first_events, events)
+
+        # Close to kickoff the TTL is zero: a conditional request is sent and 304 reuses the payload.
+        events, stats = self.enrich(kickoff, dt.datetime(2026, 3, 17, 19, 0, tzinfo=dt.timezone.utc))
+        self.assertEqual((0, 1), (stats["cache_fresh"], stats["cache_not_modified"]))
+        self.assertEqual({"If-None-Match": '"v1"'}, self.requests_seen[-1][1])
+        self.assertEqual(first_events, events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import json_patch
+from publish_artifacts import (
+    content_hash,
+    load_manifest,
+    minify_json,
+    publish_json,
+    publish_shards,
+    republish_shards,
+    schedule_channel_ids,
+)
+
+PAYLOAD = {"generated_at": "2026-03-14T06:00:00Z", "schedule": [{"date": "2026-03-14", "events": [{"name": "Ä v B"}]}]}
+
+
+class PublishArtifactsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = Path(self.tmp.name) / "schedule.json"
+        self.publish_dir = Path(self.tmp.name) / "published"
+
+    def test_writes_minified_and_compressed_copies_with_manifest(self):
+        entry = publish_json(str(self.source), PAYLOAD, compress=True)
+
+        body = (self.publish_dir / "schedule.min.json").read_bytes()
+        self.assertEqual(minify_json(PAYLOAD), body)
+        self.assertEqual(PAYLOAD, json.loads(body))
+        self.assertEqual(body, gzip.decompress((self.publish_dir / "schedule.min.json.gz").read_bytes()))
+        self.assertEqual(content_hash(body), entry["sha256"])
+
+        manifest = load_manifest(str(self.publish_dir))
+        self.assertEqual(entry, manifest["artifacts"]["schedule.json"])
+        sizes = [rep["bytes"] for rep in entry["representations"]]
+        self.assertEqual(sorted(sizes), sizes)
+        for rep in entry["representations"]:
+            self.assertEqual(rep["bytes"], (self.publish_dir / rep["path"]).stat().st_size)
+
+    def test_unchanged_payload_is_not_republished(self):
+        first = publish_json(str(self.source), PAYLOAD, compress=True)
+        gz_path = self.publish_dir / "schedule.min.json.gz"
+        gz_bytes = gz_path.read_bytes()
+        gz_path.touch()
+        mtime = gz_path.stat().st_mtime_ns
+
+        self.assertEqual(first, publish_json(str(self.source), json.loads(json.dumps(PAYLOAD)), compress=True))
+        self.assertEqual(mtime, gz_path.stat().st_mtime_ns)
+
+        changed = publish_json(str(self.source), {**PAYLOAD, "generated_at": "2026-03-15T06:00:00Z"}, compress=True)
+        self.assertNotEqual(first["sha256"], changed["sha256"])
+        self.assertNotEqual(gz_bytes, gz_path.read_bytes())
+
+    def test_compressed_siblings_are_opt_in(self):
+        publish_json(str(self.source), PAYLOAD, compress=True)
+        self.assertTrue((self.publish_dir / "schedule.min.json.gz").exists())
+
+        # Same content without compression: the manifest drops the siblings and so does the directory.
+        entry = publish_json(str(self.source), PAYLOAD)
+        self.assertEqual(["identity"], [rep["encoding"] for rep in entry["representations"]])
+        self.assertEqual(1, entry["version"])
+        self.assertEqual(["manifest.json", "schedule.min.json"], sorted(path.name for path in self.publish_dir.iterdir()))
+
+    def test_changes_publish_a_patch_chain(self):
+        first = publish_json(str(self.source), PAYLOAD)
+        self.assertEqual((1, []), (first["version"], first["deltas"]))
+        second_payload = json.loads(json.dumps(PAYLOAD))
+        second_payload["schedule"][0]["events"].append({"name": "C v D"})
+        second = publish_json(str(self.source), second_payload)
+        third_payload = {**second_payload, "generated_at": "2026-03-15T06:00:00Z"}
+        third = publish_json(str(self.source), third_payload)
+
+        self.assertEqual(3, third["version"])
+        self.assertEqual([2, 3], [delta["version"] for delta in third["deltas"]])
+        self.assertEqual(first["sha256"], third["deltas"][0]["from_sha256"])
+        self.assertEqual(second["sha256"], third["deltas"][1]["from_sha256"])
+        document = PAYLOAD
+        for delta in third["deltas"]:
+            ops = json.loads((self.publish_dir / delta["path"]).read_text(encoding="utf-8"))
+            document = json_patch.apply(document, ops)
+        self.assertEqual(third_payload, document)
+
+        # A patch no smaller than the document restarts the chain and drops old patch files.
+        fourth = publish_json(str(self.source), {"replaced": True})
+        self.assertEqual((4, []), (fourth["version"], fourth["deltas"]))
+        self.assertEqual([], list((self.publish_dir / "deltas" / "schedule").iterdir()))
+
+    def test_sharded_export_writes_day_and_channel_shards_with_index(self):
+        schedule = {
+            "generated_at": "2026-03-14T06:00:00Z",
+            "sport_assets": {"sports": {}},
+            "schedule": [
+                {"date": "2026-03-14", "day": "Saturday", "events": [{"name": "A v B", "channels": ["Sky, 1", "TNT, 2"]}]},
+                {"date": "2026-03-15", "day": "Sunday", "events": [{"name": "C v D", "channels": ["TNT, 2"]}]},
+            ],
+        }
+        channels = {
+            1: ("Sky", {"id": 1, "qualities": {"HD": ["http://a"]}, "candidates": [{"url": "http://a"}]}),
+            2: ("TNT", {"id": 2, "qualities": {"HD": ["http://b"]}}),
+        }
+        self.assertEqual([1, 2], schedule_channel_ids(schedule))
+
+        index = publish_shards(str(self.publish_dir), schedule, channels)
+        self.assertEqual(["2026-03-14", "2026-03-15"], [day["date"] for day in index["dates"]])
+        self.assertEqual([1, 2], index["dates"][0]["channel_ids"])
+
+        day = json.loads((self.publish_dir / "schedule" / "2026-03-15.json").read_text(encoding="utf-8"))
+        self.assertEqual(["C v D"], [event["name"] for event in day["events"]])
+        self.assertEqual({"2": {"name": "TNT", "channel": channels[2][1]}}, day["channels"])
+        first_day = json.loads((self.publish_dir / "schedule" / "2026-03-14.json").read_text(encoding="utf-8"))
+        self.assertNotIn("candidates", first_day["channels"]["1"]["channel"])
+        sky = json.loads((self.publish_dir / "channels" / "1.json").read_text(encoding="utf-8"))
+        self.assertEqual(channels[1][1], sky["channel"])
+        for rel_path, info in index["files"].items():
+            self.assertEqual(info["sha256"], content_hash((self.publish_dir / rel_path).read_bytes()))
+
+        schedule["schedule"] = schedule["schedule"][1:]
+        index = publish_shards(str(self.publish_dir), schedule, {2: channels[2]})
+        self.assertEqual(2, index["stats"]["removed"])
+        self.assertEqual(0, index["stats"]["written"])
+        self.assertFalse((self.publish_dir / "channels" / "1.json").exists())
+
+    def test_republishing_channels_rebuilds_day_and_channel_shards(self):
+        schedule = {
+            "generated_at": "2026-03-14T06:00:00Z",
+            "schedule": [{"date": "2026-03-14", "day": "Saturday", "events": [{"name": "A v B", "channels": ["Sky, 1"]}]}],
+        }
+        schedule_path = Path(self.tmp.name) / "mapped.json"
+        schedule_path.write_text(json.dumps(schedule), encoding="utf-8")
+        channels_path = str(Path(self.tmp.name) / "channels.json")
+        self.assertIsNone(republish_shards(channels_path, {"channels": {}}))
+
+        sky = {"id": 1, "qualities": {"HD": ["http://old"]}}
+        publish_shards(str(self.publish_dir), schedule, {1: ("Sky", sky)}, schedule_path=str(schedule_path))
+
+        # A stream test prunes the old URL and rewrites channels.json.
+        fresh = {"channels": {"Sky": {"id": 1, "qualities": {"HD": ["http://new"]}}, "TNT": {"id": 2}}}
+        index = republish_shards(channels_path, fresh)
+        self.assertEqual((2, 0), (index["stats"]["written"], index["stats"]["removed"]))
+        day = json.loads((self.publish_dir / "schedule" / "2026-03-14.json").read_text(encoding="utf-8"))
+        self.assertEqual(["http://new"], day["channels"]["1"]["channel"]["qualities"]["HD"])
+        channel = json.loads((self.publish_dir / "channels" / "1.json").read_text(encoding="utf-8"))
+        self.assertEqual(fresh["channels"]["Sky"], channel["channel"])
+        self.assertFalse((self.publish_dir / "channels" / "2.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from response_cache import ResponseCache, fetch_with_cache, url_cache_key
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeServer:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.parse_calls = 0
+
+    def _parse(self, body):
+        self.parse_calls += 1
+        return body.decode("utf-8").split(",")
+
+    def test_not_modified_reuses_parsed_payload(self):
+        cache = ResponseCache(self.tmp.name)
+        server = FakeServer(
+            [
+                FakeResponse(200, b"a,b", {"ETag": '"v1"', "Last-Modified": "Mon, 02 Mar 2026 00:00:00 GMT"}),
+                FakeResponse(304),
+            ]
+        )
+        first, status = fetch_with_cache("https://x.test/list.m3u", self._parse, cache, server.get)
+        self.assertEqual((["a", "b"], "fetched"), (first, status))
+
+        cache.save()
+        reloaded = ResponseCache(self.tmp.name)
+        second, status = fetch_with_cache("https://x.test/list.m3u", self._parse, reloaded, server.get)
+        self.assertEqual((["a", "b"], "not-modified"), (second, status))
+        self.assertEqual('"v1"', server.requests[1].get("If-None-Match"))
+        self.assertEqual(1, self.parse_calls)
+
+    def test_identical_body_without_validators_skips_parse(self):
+        cache = ResponseCache(self.tmp.name)
+        server = FakeServer([FakeResponse(200, b"a,b"), FakeResponse(200, b"a,b"), FakeResponse(200, b"a,c")])
+        fetch_with_cache("https://x.test/p", self._parse, cache, server.get)
+        _, status = fetch_with_cache("https://x.test/p", self._parse, cache, server.get)
+        self.assertEqual("unchanged", status)
+        self.assertEqual({}, server.requests[1])
+        changed, status = fetch_with_cache("https://x.test/p", self._parse, cache, server.get)
+        self.assertEqual((["a", "c"], "fetched"), (changed, status))
+        self.assertEqual(2, self.parse_calls)
+
+    def test_lru_eviction_keeps_recently_used_entries(self):
+        cache = ResponseCache(self.tmp.name, max_bytes=0)  # fill without eviction first
+        for stamp, name in enumerate(("a", "b", "c")):
+            cache.store(f"https://x.test/{name}", name.encode("utf-8") * 4096)
+            cache.entries[url_cache_key(f"https://x.test/{name}")]["last_access"] = float(stamp)
+        cache.entries[url_cache_key("https://x.test/a")]["last_access"] = 10.0
+        cache.max_bytes = max(entry["body_bytes"] for entry in cache.entries.values()) * 2
+        cache.store("https://x.test/c", b"c" * 4096)  # triggers eviction
+
+        self.assertIsNotNone(cache.lookup("https://x.test/a"))
+        self.assertIsNotNone(cache.lookup("https://x.test/c"))
+        self.assertIsNone(cache.lookup("https://x.test/b"))
+        self.assertEqual(1, cache.stats["evicted"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,13 +10,16 @@ PROJECT_DIR = TESTS_DIR.parent
 if str(PROJECT_DIR) not in sys.path:
     sys.path.insert(0, str(PROJECT_DIR))
 
+from playlist_snapshots import FreshnessPolicy, PlaylistSnapshotStore
 from scan_sports_channels import (
+    CategoryFilter,
     ChannelNormalizer,
     SportsScanner,
     infer_server_type,
     is_non_live_m3u_entry,
     is_probable_live_stream_url,
     load_target_channels,
+    XtreamAPI,
 )
 
 
@@ -107,6 +110,135 @@ class ScanChannelGuardrailsTests(unittest.TestCase):
         self.assertNotIn("https://c.example/live/4.ts", kept_urls)
         self.assertNotIn("https://a.example/live/5.ts", kept_urls)
 
+    @mock.patch("scan_sports_channels.shutil.which", return_value="ffprobe")
+    def test_snapshot_diff_only_fully_tests_new_or_changed_entries(self, _which):
+        streams = [
+            {"name": "Sky Sports Main Event HD", "url": "https://a.example/live/1.ts"},
+            {"name": "TNT Sports 1 HD", "url": "https://b.example/live/2.ts"},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot_path = str(Path(tmp) / "snapshots.json.gz")
+
+            def run_scan(batch, policy):
+                store = PlaylistSnapshotStore(snapshot_path, policy=policy)
+                scanner = SportsScanner(
+                    target_channels=["Sky Sports Main Event", "TNT Sports 1"],
+                    allow_ffmpeg_fallback=False,
+                    snapshot_store=store,
+                )
+                with mock.patch.object(scanner, "_validate_stream_url", return_value=True) as validate:
+                    added = scanner.process_streams(
+                        batch, api_instance=None, source_label="unit", snapshot_key="https://p.example/list.m3u"
+                    )
+                store.save()
+                return added, validate, scanner
+
+            added, validate, _ = run_scan(streams, FreshnessPolicy())
+            self.assertEqual(2, added)
+            self.assertEqual(2, validate.call_count)
+
+            changed = [streams[0], {"name": "TNT Sports 1 FHD", "url": "https://b.example/live/2.ts"}]
+            added, validate, scanner = run_scan(changed, FreshnessPolicy(trust_hours=6))
+            self.assertEqual(2, added)
+            self.assertEqual(1, validate.call_count)
+            self.assertEqual("TNT Sports 1 FHD", validate.call_args.kwargs["stream_name"])
+            self.assertEqual(1, scanner.stats["snapshot_trusted"])
+
+            added, validate, scanner = run_scan(changed, FreshnessPolicy(trust_hours=0, revalidate_hours=48))
+            self.assertEqual(2, validate.call_count)
+            self.assertTrue(all(call.kwargs["quick"] for call in validate.call_args_list))
+            self.assertEqual(2, scanner.stats["snapshot_revalidated"])
+
+    @mock.patch("scan_sports_channels.shutil.which", return_value="ffprobe")
+    def test_epg_confirmed_candidates_are_joined_by_epg_channel_id(self, _which):
+        streams = [
+            ["UK: Sky Sports Main Event HD", 1, None, ""],
+            ["UK: Sky Sports Main Event FHD", 2, None, "SkySpMainEv.uk"],
+            ["Sky Sports Main Event (backup)", 3, None, "SkySpMainEv.uk"],
+        ]
+        api = mock.Mock()
+        api.get_stream_url.side_effect = lambda ref: f"https://a{ref}.example/live/{ref}.ts"
+        guide = mock.Mock()
+        guide.confirms.side_effect = lambda name, target, epg_channel_id="": epg_channel_id == "SkySpMainEv.uk"
+        loader = mock.Mock(return_value=guide)
+        scanner = SportsScanner(target_channels=["Sky Sports Main Event"], allow_ffmpeg_fallback=False)
+
+        with mock.patch.object(scanner, "_validate_stream_url", return_value=True):
+            scanner.process_streams(streams, api_instance=api, source_label="unit", epg_loader=loader)
+        loader.assert_called_once_with({"", "SkySpMainEv.uk"})
+        guide.confirms.assert_any_call("UK: Sky Sports Main Event FHD", "sky sports main event", "SkySpMainEv.uk")
+        self.assertEqual(2, scanner.stats["epg_candidates_confirmed"])
+
+    @mock.patch("scan_sports_channels.shutil.which", return_value="ffprobe")
+    def test_process_pool_matching_matches_inline_results(self, _which):
+        targets = ["Sky Sports Main Event", "TNT Sports 1", "beIN Sports 1"]
+        streams = [
+            ["UK: Sky Sports Main Event FHD", 1, None],
+            ["Sky Sports News", 2, None],
+            ["TNT Sports 1 HD", 3, "https://logo/tnt.png"],
+            ["", 4, None],
+            ["AR: beIN Sports 1 4K", 5, None],
+            ["TNT Sports 10", 6, None],
+        ]
+        inline = SportsScanner(target_channels=targets, allow_ffmpeg_fallback=False, match_workers=1)
+        pooled = SportsScanner(
+            target_channels=targets, allow_ffmpeg_fallback=False, match_workers=2, parallel_match_threshold=2
+        )
+        self.addCleanup(pooled.close_match_pool)
+
+        expected = list(inline._iter_matched_streams(streams, by_stream_id=True))
+        self.assertEqual([1, 3, 5], [row[1] for row in expected])
+        self.assertEqual(expected, list(pooled._iter_matched_streams(streams, by_stream_id=True)))
+        self.assertIsNotNone(pooled._match_pool)
+
+    def test_category_filter_keyword_rules(self):
+        categories = [
+            {"category_id": "1", "category_name": "UK | SPORTS"},
+            {"category_id": "2", "category_name": "Ukraine"},
+            {"category_id": "3", "category_name": "beINSports MENA"},
+            {"category_id": "4", "category_name": "Sports VOD"},
+            {"category_id": "5", "category_name": "Kids"},
+            {"category_id": "1", "category_name": "UK | SPORTS"},
+        ]
+        self.assertEqual(["1", "3"], CategoryFilter().select(categories))
+        self.assertEqual(["5"], CategoryFilter(include=["kids"], exclude=[]).select(categories))
+
+    @mock.patch("scan_sports_channels.shutil.which", return_value="ffprobe")
+    def test_category_filtered_fetch_falls_back_to_full_list(self, _which):
+        calls = []
+
+        def fake_api_call(api, action, stream_parse=None, **params):
+            calls.append((action, params.get("category_id")))
+            if action == "get_live_categories":
+                return [{"category_id": "7", "category_name": "UK Sports"}, {"category_id": "8", "category_name": "Sport+"}], None
+            if params.get("category_id") == "7":
+                return [("Sky Sports Main Event HD", 1, None), ("TNT Sports 1", 2, None)], "fetched"
+            if params.get("category_id") == "8":
+                return [("TNT Sports 1", 2, None)], "not-modified"
+            return [("TNT Sports 1 HD", 3, None)], "fetched"
+
+        server = {"name": "panel", "url": "http://panel.example/get.php?username=u&password=p"}
+        scanner = SportsScanner(
+            target_channels=["Sky Sports Main Event", "TNT Sports 1"],
+            allow_ffmpeg_fallback=False,
+            category_filter=CategoryFilter(),
+        )
+        with mock.patch.object(XtreamAPI, "_api_call_with_status", autospec=True, side_effect=fake_api_call), \
+                mock.patch.object(scanner, "process_streams", return_value=0) as process:
+            result = scanner.scan_server(server)
+        self.assertEqual(2, result["streams"])
+        self.assertEqual([("Sky Sports Main Event HD", 1, None), ("TNT Sports 1", 2, None)], process.call_args.args[0])
+        self.assertNotIn(("get_live_streams", None), calls)
+
+        scanner.category_filter = CategoryFilter(include=["news"])
+        calls.clear()
+        with mock.patch.object(XtreamAPI, "_api_call_with_status", autospec=True, side_effect=fake_api_call), \
+                mock.patch.object(scanner, "process_streams", return_value=0) as process:
+            result = scanner.scan_server(server)
+        self.assertEqual(1, result["streams"])
+        self.assertIn(("get_live_streams", None), calls)
+        self.assertEqual(1, scanner.stats["servers_category_fallback_full"])
+
     def test_min_target_length_guard(self):
         payload = {
             "schedule": [
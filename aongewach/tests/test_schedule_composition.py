@@ -7,7 +7,15 @@ PROJECT_DIR = os.path.dirname(TEST_DIR)
 if PROJECT_DIR not in sys.path:
     sys.path.insert(0, PROJECT_DIR)
 
-from compose_weekly_schedule import compose_payload
+from compose_weekly_schedule import (
+    build_huh_match_index,
+    compose_payload,
+    event_match_features,
+    find_best_huh_match,
+    huh_match_candidates,
+    is_acceptable_match,
+    normalize_event,
+)
 from merge_fanzo_witm import merge_payloads
 
 
@@ -744,6 +752,63 @@ class ScheduleCompositionTests(unittest.TestCase):
         self.assertEqual(1, stats["matched_events"])
         self.assertEqual(1, stats["channels_added"])
 
+    def test_blocked_huh_matching_agrees_with_scoring_every_pair(self):
+        day = "2026-03-07"
+
+        def football(home, away, hhmm, name=None):
+            raw = {
+                "name": name or f"{home} v {away}",
+                "sport": "Football",
+                "start_time_iso": f"{day}T{hhmm}:00Z" if hhmm else None,
+                "channels": ["Sky Sports Main Event"],
+                "home_team": home,
+                "away_team": away,
+            }
+            return normalize_event(raw, source="test", allow_empty_channels=True)
+
+        secondary = [
+            football("Newcastle", "Manchester City", "20:00"),
+            football("Arsenal", "Chelsea", "12:30"),
+            football("Paris Saint Germain", "Lyon", "20:45"),
+            football("Arsenal", "Chelsea", "17:30"),
+            football("Real Madrid", "Sevilla", "15:00"),
+            football("TBC", "TBC", "15:00", name="Cup Final"),
+        ]
+        primary = [
+            football("Newcastle", "Man City", "20:00"),
+            football("PSG", "Lyon", "20:40"),
+            football("Arsenal", "Chelsea", "17:35"),
+            football("Real Madrid", "Sevilla", "11:00"),
+            football("TBC", "TBC", "15:05", name="Cup Final"),
+            football("Everton", "Fulham", None),
+        ]
+
+        def brute_force(event, used):
+            best = None
+            for index, candidate in enumerate(secondary):
+                if index in used:
+                    continue
+                features = event_match_features(day, event, candidate)
+                if best is None or features["confidence"] > best[1]["confidence"]:
+                    best = (index, features)
+            if best is None or not is_acceptable_match(best[1], event):
+                return None
+            return best[0]
+
+        match_index = build_huh_match_index(day, secondary)
+        used = set()
+        matched = []
+        for event in primary:
+            expected = brute_force(event, used)
+            index, _ = find_best_huh_match(day, event, secondary, used, match_index=match_index)
+            self.assertEqual(expected, index)
+            if index is not None:
+                used.add(index)
+            matched.append(index)
+        self.assertEqual([0, 2, 3, None, None, None], matched)
+        # Only plausible pairs are scored: same-hour kickoffs or shared team keys.
+        self.assertEqual([0, 2], huh_match_candidates(match_index, day, primary[0]))
+
 
 if __name__ == "__main__":
     unittest.main()
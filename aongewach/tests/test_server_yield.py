@@ -0,0 +1,56 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from server_yield import ServerYieldStore, YieldPolicy
+
+
+def _server(name):
+    return {"name": name, "url": f"https://{name}.example/get.php?username=u&password=p"}
+
+
+class ServerYieldTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = str(Path(self.tmp.name) / "server_yield.json")
+
+    def test_rank_orders_by_yield_and_demotes_zero_yield(self):
+        store = ServerYieldStore(self.path, policy=YieldPolicy(zero_yield_runs=2))
+        low, high, dud, fresh = (_server(n) for n in ("low", "high", "dud", "fresh"))
+        store.record(low["url"], fetched=True, streams=900, accepted=1, probes=20)
+        store.record(high["url"], fetched=True, streams=900, accepted=8, probes=10)
+        for _ in range(2):
+            store.record(dud["url"], fetched=True, streams=900, accepted=0, probes=5)
+        store.save()
+
+        ordered, skipped = ServerYieldStore(self.path, policy=YieldPolicy(zero_yield_runs=2)).rank(
+            [low, dud, fresh, high]
+        )
+        self.assertEqual(["high", "fresh", "low", "dud"], [server["name"] for server in ordered])
+        self.assertEqual([], skipped)
+
+    def test_repeatedly_failing_server_is_skipped_until_retry_window(self):
+        store = ServerYieldStore(self.path, policy=YieldPolicy(skip_after_failures=2, failed_retry_days=1))
+        broken, ok = _server("broken"), _server("ok")
+        for _ in range(2):
+            store.record(broken["url"], fetched=False, streams=0, accepted=0, probes=0)
+
+        ordered, skipped = store.rank([broken, ok])
+        self.assertEqual(["ok"], [server["name"] for server in ordered])
+        self.assertEqual(["broken"], [server["name"] for server in skipped])
+
+        ordered, skipped = store.rank([broken, ok], now=time.time() + 2 * 86400)
+        self.assertEqual({"ok", "broken"}, {server["name"] for server in ordered})
+        self.assertEqual([], skipped)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import datetime as dt
+import gzip
+import hashlib
+import json
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from stream_health_rollup import HealthRollupStore, load_history
+
+NOW = dt.datetime(2026, 3, 14, 12, 0, tzinfo=dt.timezone.utc)
+
+
+def log_line(url_hash, tested_at, ok, startup_ms=None):
+    return json.dumps({"url_hash": url_hash, "tested_at": tested_at, "ok": ok, "startup_ms": startup_ms}) + "\n"
+
+
+class StreamHealthRollupTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        self.log = root / "stream_health_log.jsonl"
+        self.store_path = str(root / "rollups.sqlite")
+        self.archive = root / "archive"
+        self.lines = [
+            log_line("a", "2026-03-10T08:00:00Z", True, 900),
+            log_line("a", "2026-03-10T20:00:00Z", False),
+            log_line("a", "2026-03-12T09:30:00Z", True, 2100),
+            log_line("b", "2026-02-27T10:00:00Z", True, 500),
+            "not json\n",
+            log_line("b", "2026-03-13T11:00:00Z", True, 700),
+        ]
+        self.log.write_text("".join(self.lines), encoding="utf-8")
+
+    def compact(self, **kwargs):
+        with HealthRollupStore(self.store_path) as store:
+            return store.compact_log(str(self.log), str(self.archive), retention_days=0, **kwargs)
+
+    def test_rollups_match_raw_log_history(self):
+        raw = load_history(str(self.log), 5, now=NOW)
+        stats = self.compact()
+
+        self.assertEqual(5, stats["events"])
+        self.assertEqual("", self.log.read_text(encoding="utf-8"))
+        self.assertEqual(raw, load_history(str(self.log), 5, store_path=self.store_path, now=NOW))
+        self.assertEqual({"tested": 3, "ok": 2, "last_ok_at": "2026-03-12T09:30:00Z"}, raw["a"])
+
+        with HealthRollupStore(self.store_path) as store:
+            day = store.get_rollup("a", "2026-03-10")
+        self.assertEqual((2, 1, 900, 900), (day["tested"], day["ok"], day["startup_p50_ms"], day["startup_p90_ms"]))
+
+        with gzip.open(self.archive / "stream_health_log-2026-03.jsonl.gz", "rt", encoding="utf-8") as handle:
+            self.assertEqual(4, len(handle.readlines()))
+        self.assertTrue((self.archive / "stream_health_log-2026-02.jsonl.gz").exists())
+
+    def test_new_lines_merge_and_uncompacted_tail_is_read(self):
+        self.compact()
+        with self.log.open("a", encoding="utf-8") as handle:
+            handle.write(log_line("a", "2026-03-12T18:00:00Z", True, 300))
+        history = load_history(str(self.log), 5, store_path=self.store_path, now=NOW)
+        self.assertEqual({"tested": 4, "ok": 3, "last_ok_at": "2026-03-12T18:00:00Z"}, history["a"])
+
+        self.compact()
+        with HealthRollupStore(self.store_path) as store:
+            day = store.get_rollup("a", "2026-03-12")
+        self.assertEqual((2, 300, 2100), (day["tested"], day["startup_p50_ms"], day["startup_p90_ms"]))
+
+    def test_interrupted_compaction_does_not_double_count(self):
+        original = self.log.read_bytes()
+        self.compact()
+        # Simulate a crash after the rollups committed but before the log was emptied.
+        with HealthRollupStore(self.store_path) as store:
+            store._set_state(
+                "folded_prefix",
+                {"log": str(self.log.resolve()), "size": len(original), "sha256": hashlib.sha256(original).hexdigest()},
+            )
+        self.log.write_bytes(original + log_line("c", "2026-03-13T00:00:00Z", False).encode("utf-8"))
+
+        stats = self.compact()
+        self.assertEqual(1, stats["events"])
+        history = load_history(str(self.log), 5, store_path=self.store_path, now=NOW)
+        self.assertEqual(3, history["a"]["tested"])
+        self.assertEqual({"tested": 1, "ok": 0, "last_ok_at": None}, history["c"])
+
+    def archived_lines(self):
+        lines = []
+        for path in sorted(self.archive.glob("*.jsonl.gz")):
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                lines.extend(handle.readlines())
+        return lines
+
+    def test_failed_fold_archives_nothing_and_lines_are_archived_once(self):
+        with mock.patch.object(HealthRollupStore, "add_events", side_effect=RuntimeError("disk full")):
+            with self.assertRaises(RuntimeError):
+                self.compact()
+        self.assertEqual([], self.archived_lines())
+
+        # Stopping between the commit and the archive write: the next run archives those lines.
+        with mock.patch.object(HealthRollupStore, "_archive_lines", side_effect=OSError("killed")):
+            with self.assertRaises(OSError):
+                self.compact()
+        self.assertEqual([], self.archived_lines())
+        stats = self.compact()
+        self.assertEqual((0, 6), (stats["events"], stats["archived"]))
+        self.assertEqual(sorted(self.lines), sorted(self.archived_lines()))
+
+        self.compact()
+        self.assertEqual(len(self.lines), len(self.archived_lines()))
+
+
+if __name__ == "__main__":
+    unittest.main()
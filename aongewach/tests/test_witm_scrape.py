@@ -0,0 +1,90 @@
+import datetime as dt
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from http_client import HostTimings
+from response_cache import ResponseCache
+from scrape_schedule_witm import html_ttl_seconds, scrape_range
+
+TODAY = dt.date(2026, 3, 14)
+
+
+def schedule_page(date_key):
+    return (
+        "<html><body><table>"
+        '<tr itemscope itemtype="http://schema.org/BroadcastEvent">'
+        f'<td><span itemprop="name" content="Leinster v Munster {date_key}"></span>'
+        f'<span itemprop="startDate" content="{date_key[:4]}-{date_key[4:6]}-{date_key[6:]}T19:45:00Z"></span></td>'
+        '<td class="competition-name"><a>URC</a><img alt="Rugby Union Sport icon" src="/i/rugby.png"></td>'
+        '<td class="channel-details"><img class="channel" title="Premier Sports 1 logo"></td>'
+        "</tr></table></body></html>"
+    )
+
+
+class _Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeWitm:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+        self.timings = HostTimings()
+
+    def get(self, url, headers=None, timeout=None):
+        date_key = url.rsplit("=", 1)[-1]
+        with self.lock:
+            self.requests.append((date_key, dict(headers or {})))
+        if (headers or {}).get("If-None-Match") == f'"{date_key}"':
+            return _Response(304)
+        return _Response(200, schedule_page(date_key), {"ETag": f'"{date_key}"'})
+
+
+class WitmScrapeTests(unittest.TestCase):
+    def test_ttl_grows_with_distance_from_today(self):
+        ttls = [html_ttl_seconds(TODAY + dt.timedelta(days=offset), TODAY) for offset in range(7)]
+        self.assertEqual([0, 0], ttls[:2])
+        self.assertEqual(sorted(ttls), ttls)
+        self.assertGreater(ttls[-1], 24 * 3600)
+
+    def test_concurrent_days_with_page_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            api = FakeWitm()
+            cache = ResponseCache(tmp)
+            first = scrape_range(TODAY, 6, client=api, cache=cache, day_workers=3, today=TODAY)
+            cache.save()
+            self.assertEqual(6, len(api.requests))
+            self.assertEqual(
+                [(TODAY + dt.timedelta(days=offset)).isoformat() for offset in range(6)],
+                [day["date"] for day in first["schedule"]],
+            )
+            self.assertEqual(["Premier Sports 1"], first["schedule"][3]["events"][0]["channels"])
+            self.assertEqual({"fetched"}, {stats["source"] for stats in first["extraction"]["day_stats"]})
+
+            api.requests.clear()
+            second = scrape_range(TODAY, 6, client=api, cache=ResponseCache(tmp), day_workers=3, today=TODAY)
+            sources = [stats["source"] for stats in second["extraction"]["day_stats"]]
+            self.assertEqual(["not-modified", "not-modified", "cache", "cache", "cache", "cache"], sources)
+            self.assertEqual(["20260314", "20260315"], sorted(date_key for date_key, _ in api.requests))
+            self.assertEqual(first["schedule"], second["schedule"])
+            [node] = api.timings.snapshot().values()
+            self.assertEqual((6, 2, 4), (node["cache_fetched"], node["cache_not_modified"], node["cache_fresh"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
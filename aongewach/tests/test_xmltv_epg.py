@@ -0,0 +1,101 @@
+import unittest
+from pathlib import Path
+import sys
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = TESTS_DIR.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from xmltv_epg import EpgGuide, load_schedule_fixtures, parse_xmltv_time
+
+KICKOFF = parse_xmltv_time("20260314193000 +0000")
+
+XMLTV = """<?xml version="1.0" encoding="UTF-8"?>
+<tv generator-info-name="panel">
+  <channel id="sky.me"><display-name>UK: Sky Sports Main Event HD</display-name></channel>
+  <channel id="sky.me.2"><display-name>UK: Sky Sports Main Event FHD</display-name></channel>
+  <channel id="kids"><display-name>Cartoon Network</display-name></channel>
+  <programme start="20260314200000 +0100" stop="20260314220000 +0100" channel="sky.me">
+    <title>Live: Arsenal v Chelsea</title>
+  </programme>
+  <programme start="20260314190000 +0000" stop="20260314210000 +0000" channel="sky.me.2">
+    <title>Premier League Classics</title>
+  </programme>
+  <programme start="20260314190000 +0000" stop="20260314210000 +0000" channel="kids">
+    <title>Arsenal v Chelsea</title>
+  </programme>
+  <programme start="20260320190000 +0000" stop="20260320210000 +0000" channel="sky.me.2">
+    <title>Arsenal v Chelsea</title>
+  </programme>
+</tv>
+""".encode("utf-8")
+
+
+class XmltvEpgTests(unittest.TestCase):
+    def test_parse_xmltv_time_applies_offset(self):
+        self.assertEqual(KICKOFF, parse_xmltv_time("20260314203000 +0100"))
+        self.assertEqual(KICKOFF, parse_xmltv_time("20260314193000"))
+        self.assertIsNone(parse_xmltv_time("not-a-time"))
+
+    def test_guide_confirms_only_channels_showing_fixture_at_kickoff(self):
+        schedule = {
+            "schedule": [
+                {
+                    "events": [
+                        {
+                            "start_time_iso": "2026-03-14T19:30:00Z",
+                            "home_team": "Arsenal",
+                            "away_team": "Chelsea",
+                            "channels": ["Sky Sports Main Event"],
+                        },
+                        {
+                            "start_time_iso": "2026-04-01T19:30:00Z",
+                            "home_team": "Out Of",
+                            "away_team": "Window",
+                            "channels": ["Sky Sports Main Event"],
+                        },
+                    ]
+                }
+            ]
+        }
+        fixtures = load_schedule_fixtures(schedule, window_start=KICKOFF - 3600, window_end=KICKOFF + 3600)
+        self.assertEqual({"sky sports main event": [(KICKOFF, ("arsenal", "chelsea"))]}, fixtures)
+
+        chunks = [XMLTV[i:i + 17] for i in range(0, len(XMLTV), 17)]
+        guide = EpgGuide(fixtures).ingest_chunks(chunks, is_relevant_channel=lambda name: "sky sports" in name.lower())
+        self.assertEqual(2, guide.stats["channels_kept"])
+        self.assertEqual(2, guide.stats["programmes_kept"])
+        self.assertTrue(guide.confirms("UK: Sky Sports Main Event HD", "sky sports main event"))
+        self.assertFalse(guide.confirms("UK: Sky Sports Main Event FHD", "sky sports main event"))
+        self.assertFalse(guide.confirms("Cartoon Network", "sky sports main event"))
+
+    def test_streams_join_the_guide_by_epg_channel_id(self):
+        # Provider display-names rarely equal panel stream names; the stream's epg_channel_id is the link.
+        xmltv = b"""<?xml version="1.0" encoding="UTF-8"?>
+<tv>
+  <channel id="SkySpMainEvHD.uk"><display-name>Sky Sp Main Ev</display-name></channel>
+  <channel id="kids.uk"><display-name>Cartoon Network</display-name></channel>
+  <programme start="20260314190000 +0000" stop="20260314210000 +0000" channel="SkySpMainEvHD.uk">
+    <title>Arsenal v Chelsea</title>
+  </programme>
+  <programme start="20260314190000 +0000" stop="20260314210000 +0000" channel="kids.uk">
+    <title>Arsenal v Chelsea</title>
+  </programme>
+</tv>
+"""
+        fixtures = {"sky sports main event": [(KICKOFF, ("arsenal", "chelsea"))]}
+        guide = EpgGuide(fixtures).ingest_chunks(
+            [xmltv],
+            is_relevant_channel=lambda name: "sky sports" in name.lower(),
+            channel_ids={"SkySpMainEvHD.uk", ""},
+        )
+        self.assertEqual(1, guide.stats["channels_kept"])
+        for variant in ("UK: Sky Sports Main Event HD", "UK: Sky Sports Main Event FHD", "Sky Sports ME (backup)"):
+            self.assertTrue(guide.confirms(variant, "sky sports main event", "SkySpMainEvHD.uk"), variant)
+        self.assertFalse(guide.confirms("UK: Sky Sports Main Event HD", "sky sports main event"))
+        self.assertFalse(guide.confirms("UK: Sky Sports Main Event HD", "sky sports main event", "kids.uk"))
+
+
+if __name__ == "__main__":
+    unittest.main()
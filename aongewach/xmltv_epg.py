@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Streaming XMLTV ingestion and fixture cross-referencing for panel EPGs."""
+
+from __future__ import annotations
+
+import datetime as dt
+import io
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Programme must cover kickoff within this slack (EPG slots often start a bit early/late).
+KICKOFF_SLACK_SECONDS = 20 * 60
+DEFAULT_EPG_HORIZON_HOURS = 36.0
+MIN_PHRASE_LENGTH = 3
+
+# (kickoff_ts, normalized phrases identifying the fixture in a programme title)
+Fixture = Tuple[int, Tuple[str, ...]]
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+XMLTV_TIME_RE = re.compile(r"^(\d{14})(?:\s*([+-])(\d{2}):?(\d{2}))?")
+
+
+def normalize_key(value: object) -> str:
+    text = unicodedata.normalize("NFKD", str(value or ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return " ".join(NON_ALNUM_RE.sub(" ", text).split())
+
+
+def parse_xmltv_time(value: Optional[str]) -> Optional[int]:
+    """Parse `YYYYmmddHHMMSS +HHMM` into a UTC timestamp (no offset means UTC)."""
+    match = XMLTV_TIME_RE.match((value or "").strip())
+    if not match:
+        return None
+    try:
+        moment = dt.datetime.strptime(match.group(1), "%Y%m%d%H%M%S").replace(tzinfo=dt.timezone.utc)
+    except ValueError:
+        return None
+    if match.group(2):
+        offset = dt.timedelta(hours=int(match.group(3)), minutes=int(match.group(4)))
+        moment = moment - offset if match.group(2) == "+" else moment + offset
+    return int(moment.timestamp())
+
+
+def _parse_iso(value: object) -> Optional[int]:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        moment = dt.datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=dt.timezone.utc)
+    return int(moment.timestamp())
+
+
+def load_schedule_fixtures(
+    schedule: Dict,
+    window_start: float,
+    window_end: float,
+) -> Dict[str, List[Fixture]]:
+    """Map lowercased channel name -> fixtures kicking off inside [window_start, window_end]."""
+    fixtures: Dict[str, List[Fixture]] = defaultdict(list)
+    for day in schedule.get("schedule", []) if isinstance(schedule, dict) else []:
+        for event in day.get("events", []) if isinstance(day, dict) else []:
+            if not isinstance(event, dict):
+                continue
+            kickoff = _parse_iso(event.get("start_time_iso"))
+            if kickoff is None or not window_start <= kickoff <= window_end:
+                continue
+            phrases = []
+            for field in ("home_team", "away_team"):
+                phrase = normalize_key(event.get(field))
+                if len(phrase) >= MIN_PHRASE_LENGTH and phrase not in phrases:
+                    phrases.append(phrase)
+            if not phrases:
+                phrase = normalize_key(event.get("name"))
+                if len(phrase) >= MIN_PHRASE_LENGTH:
+                    phrases.append(phrase)
+            if not phrases:
+                continue
+            for channel in event.get("channels", []) or []:
+                key = str(channel or "").strip().lower()
+                if key:
+                    fixtures[key].append((kickoff, tuple(phrases)))
+    return dict(fixtures)
+
+
+class _ChunkReader(io.RawIOBase):
+    """File-like view over an iterator of byte chunks, so iterparse can read an HTTP body as it arrives."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def iter_xmltv(source: IO[bytes]) -> Iterator[Tuple]:
+    """
+    Yield ("channel", id, display_names) and ("programme", channel_id, start, stop, title).
+
+    Uses iterparse and clears each finished element (and the root's children)
+    so memory stays flat on multi-hundred-MB panel guides.
+    """
+    context = ET.iterparse(source, events=("start", "end"))
+    root = None
+    for event, elem in context:
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag == "channel":
+            names = [
+                (node.text or "").strip()
+                for node in elem.findall("display-name")
+                if (node.text or "").strip()
+            ]
+            yield "channel", elem.get("id") or "", names
+        elif elem.tag == "programme":
+            title_node = elem.find("title")
+            yield (
+                "programme",
+                elem.get("channel") or "",
+                parse_xmltv_time(elem.get("start")),
+                parse_xmltv_time(elem.get("stop")),
+                (title_node.text or "") if title_node is not None else "",
+            )
+        else:
+            continue
+        elem.clear()
+        if root is not None:
+            root.clear()
+
+
+class EpgGuide:
+    """
+    One panel's EPG, reduced to what the scan needs: programmes on target
+    channels that overlap a scheduled kickoff.
+
+    Streams are joined to the guide by their Xtream `epg_channel_id` (the
+    `<channel id>` in xmltv.php, shared by HD/FHD/backup variants); the
+    display-name is only a fallback for streams without one.
+    """
+
+    def __init__(self, fixtures: Dict[str, List[Fixture]], slack_seconds: int = KICKOFF_SLACK_SECONDS):
+        self.fixtures = fixtures
+        self.slack_seconds = max(0, int(slack_seconds))
+        kickoffs = [kickoff for items in fixtures.values() for kickoff, _ in items]
+        self.window = (min(kickoffs) - self.slack_seconds, max(kickoffs) + self.slack_seconds) if kickoffs else None
+        self.channel_ids_by_name: Dict[str, Set[str]] = defaultdict(set)
+        self.programmes: Dict[str, List[Tuple[int, int, str]]] = defaultdict(list)
+        self.stats = {"channels": 0, "channels_kept": 0, "programmes": 0, "programmes_kept": 0}
+
+    def ingest(
+        self,
+        source: IO[bytes],
+        is_relevant_channel: Callable[[str], bool],
+        channel_ids: Iterable[str] = (),
+    ) -> "EpgGuide":
+        """
+        Read an XMLTV document; keep programmes inside the fixture window on
+        `channel_ids` (the candidate streams' epg_channel_id values) and on
+        channels whose display-name is relevant.
+        """
+        if self.window is None:
+            return self
+        window_start, window_end = self.window
+        kept_ids: Set[str] = {channel_id for channel_id in channel_ids if channel_id}
+        for item in iter_xmltv(source):
+            if item[0] == "channel":
+                _, channel_id, names = item
+                self.stats["channels"] += 1
+                relevant = [name for name in names if is_relevant_channel(name)]
+                if not channel_id or not (relevant or channel_id in kept_ids):
+                    continue
+                kept_ids.add(channel_id)
+                self.stats["channels_kept"] += 1
+                for name in relevant:
+                    self.channel_ids_by_name[normalize_key(name)].add(channel_id)
+                continue
+
+            _, channel_id, start, stop, title = item
+            self.stats["programmes"] += 1
+            if channel_id not in kept_ids or start is None:
+                continue
+            stop = stop if stop is not None else start
+            if stop < window_start or start > window_end:
+                continue
+            normalized = normalize_key(title)
+            if normalized:
+                self.programmes[channel_id].append((start, stop, f" {normalized} "))
+                self.stats["programmes_kept"] += 1
+        return self
+
+    def ingest_chunks(
+        self,
+        chunks: Iterable[bytes],
+        is_relevant_channel: Callable[[str], bool],
+        channel_ids: Iterable[str] = (),
+    ) -> "EpgGuide":
+        return self.ingest(io.BufferedReader(_ChunkReader(chunks)), is_relevant_channel, channel_ids)
+
+    def confirms(self, stream_name: str, target_lower: str, epg_channel_id: str = "") -> bool:
+        """True when the stream's EPG shows one of the target channel's fixtures at its kickoff."""
+        fixtures = self.fixtures.get(target_lower)
+        if not fixtures:
+            return False
+        if epg_channel_id:
+            channel_ids: Optional[Set[str]] = {epg_channel_id}
+        else:
+            channel_ids = self.channel_ids_by_name.get(normalize_key(stream_name))
+        if not channel_ids:
+            return False
+        for channel_id in channel_ids:
+            for start, stop, title in self.programmes.get(channel_id, ()):
+                for kickoff, phrases in fixtures:
+                    if start - self.slack_seconds > kickoff or stop + self.slack_seconds < kickoff:
+                        continue
+                    if any(f" {phrase} " in title for phrase in phrases):
+                        return True
+        return False